@@ -0,0 +1,20 @@
+"""Where the app keeps per-user state (journals, progress, reports)."""
+import os
+
+STATE_DIR = os.environ.get(
+    'LEARN_COMPUTER_HOME',
+    os.path.join(os.path.expanduser('~'), '.learn_computer')
+)
+
+
+def state_path(*parts):
+    """Path inside the state directory, creating parent directories as needed"""
+    path = os.path.join(STATE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def state_dir():
+    """The state directory, created on first use"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    return STATE_DIR
@@ -0,0 +1,68 @@
+"""Load test the classroom server with many simulated seats.
+
+Starts a server in-process on free ports and connects CLIENTS asyncio
+clients, each sending BATCHES batches of events as fast as it can. Reports
+how fast events are ingested and how long SQLite takes to catch up.
+
+    python benchmarks/bench_classroom.py [CLIENTS] [BATCHES]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classroom_server import ClassroomServer  # noqa: E402
+
+EVENTS_PER_BATCH = 10
+
+
+def batch_line(learner, n):
+    events = [{'type': 'lesson', 'key': f'lesson_{(n + i) % 50}', 'count': 1, 'at': time.time()}
+              for i in range(EVENTS_PER_BATCH - 1)]
+    events.append({'type': 'step', 'scenario': 'file_handling', 'step': n % 5 + 1,
+                   'at': time.time()})
+    return (json.dumps({'learner': learner, 'events': events}) + '\n').encode('utf-8')
+
+
+async def client(port, learner, batches):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for n in range(batches):
+        writer.write(batch_line(learner, n))
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(clients, batches, db_path):
+    server = ClassroomServer(db_path)
+    port, _ = await server.start('127.0.0.1', 0, 0)
+    expected = clients * batches * EVENTS_PER_BATCH
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, f'seat-{i}', batches) for i in range(clients)))
+    while server.events_received < expected:
+        await asyncio.sleep(0.01)
+    ingested = time.perf_counter() - start
+    while server.events_written + len(server.pending) < expected or server.pending:
+        await asyncio.sleep(0.01)
+    stored = time.perf_counter() - start
+    await server.stop()
+
+    print(f"{clients} clients x {batches} batches = {expected} events")
+    print(f"  ingested in {ingested:.2f}s ({expected / ingested:,.0f} events/s)")
+    print(f"  stored in SQLite after {stored:.2f}s ({expected / stored:,.0f} events/s)")
+
+
+def main(argv):
+    clients = int(argv[0]) if argv else 300
+    batches = int(argv[1]) if len(argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(clients, batches, os.path.join(tmp, 'bench.sqlite3')))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
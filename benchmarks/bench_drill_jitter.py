@@ -0,0 +1,98 @@
+"""Characterize event loop jitter for the shortcut drill.
+
+Runs the drill's LoopMonitor heartbeat on a Tcl event loop (no display
+needed) next to a simulated UI workload: short callbacks of up to a few
+milliseconds plus occasional long stalls. Simulated key presses are queued
+as timers at random moments. For each one, the true dispatch delay is
+known, and we record whether the monitor would have accepted it.
+
+The drill's guarantee holds if no accepted press was dispatched later than
+JITTER_BOUND_MS.
+
+    python benchmarks/bench_drill_jitter.py [SECONDS]
+"""
+import os
+import random
+import sys
+import time
+import tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shortcut_drill import JITTER_BOUND_MS, LoopMonitor  # noqa: E402
+
+
+class RecordingMonitor(LoopMonitor):
+    def __init__(self, root):
+        super().__init__(root)
+        self.samples = []
+
+    def _beat(self):
+        super()._beat()
+        self.samples.append(self.last_lateness)
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[int(p / 100 * (len(samples) - 1))]
+
+
+def main(argv):
+    seconds = float(argv[0]) if argv else 5.0
+    rng = random.Random(0)
+    root = tkinter.Tcl()
+    monitor = RecordingMonitor(root)
+    presses = []
+
+    def work():
+        # Mostly light callbacks, now and then a long stall such as a big redraw
+        busy(rng.uniform(0, 3) if rng.random() < 0.98 else rng.uniform(15, 60))
+        root.after(rng.randint(1, 15), work)
+
+    def press(due):
+        now = time.perf_counter_ns()
+        presses.append(((now - due) / 1e6, monitor.on_time(now)))
+
+    def schedule_press():
+        delay = rng.randint(5, 40)
+        due = time.perf_counter_ns() + delay * 1_000_000
+        root.after(delay, press, due)
+        root.after(rng.randint(10, 60), schedule_press)
+
+    monitor.start()
+    root.after(1, work)
+    root.after(1, schedule_press)
+    # Without Tk there are no windows to keep mainloop() running
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.tk.dooneevent()
+    monitor.stop()
+
+    late = [ns / 1e6 for ns in monitor.samples]
+    accepted = [delay for delay, ok in presses if ok]
+    rejected = [delay for delay, ok in presses if not ok]
+    print(f"{monitor.beats} heartbeats over {seconds:.0f}s, bound {JITTER_BOUND_MS} ms")
+    print(f"  heartbeat lateness: median {percentile(late, 50):.2f} ms, "
+          f"p99 {percentile(late, 99):.2f} ms, worst {monitor.worst_ns / 1e6:.1f} ms, "
+          f"{monitor.late_beats} over the bound")
+    print(f"  {len(presses)} simulated presses: {len(accepted)} accepted, "
+          f"{len(rejected)} discarded")
+    if accepted:
+        print(f"  accepted dispatch delay: median {percentile(accepted, 50):.2f} ms, "
+              f"worst {max(accepted):.2f} ms")
+    if rejected:
+        print(f"  discarded dispatch delay: median {percentile(rejected, 50):.2f} ms, "
+              f"worst {max(rejected):.2f} ms")
+    ok = not accepted or max(accepted) <= JITTER_BOUND_MS
+    print("  bound holds" if ok else "  BOUND VIOLATED")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
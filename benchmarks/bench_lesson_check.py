@@ -0,0 +1,70 @@
+"""Time validating a large lesson repository.
+
+Writes COUNT lesson sources, copies of the built-in lessons in collections
+of 1000, each made unique so no result can be shared. Then it validates
+them three times: with one process and no cache, with the process pool and
+no cache, and again with the cache the pool run filled in.
+
+    python benchmarks/bench_lesson_check.py [COUNT] [JOBS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lesson_check import ResultCache, lesson_files, validate  # noqa: E402
+from lesson_pack import BUILTIN_SOURCE, source_files  # noqa: E402
+
+PER_COLLECTION = 1000
+
+
+def write_repository(root, count):
+    sources = []
+    for path in source_files(BUILTIN_SOURCE):
+        with open(path, encoding='utf-8') as f:
+            sources.append((os.path.basename(path).partition('_')[2], f.read()))
+    for i in range(count):
+        folder = os.path.join(root, f"collection_{i // PER_COLLECTION:03d}")
+        os.makedirs(folder, exist_ok=True)
+        name, content = sources[i % len(sources)]
+        header, _, text = content.partition('\n\n')
+        with open(os.path.join(folder, f"{i:05d}_{name}"), 'w', encoding='utf-8') as f:
+            f.write(f"{header}\n\n{text}\nCopy {i}\n")
+
+
+def run(paths, jobs, cache):
+    start = time.perf_counter()
+    results, stats = validate(paths, jobs=jobs, cache=cache)
+    seconds = time.perf_counter() - start
+    issues = sum(len(result['issues']) for result in results.values())
+    print(f"  {stats['jobs']} process(es), {stats['checked']} checked, "
+          f"{stats['cached']} cached: {seconds:.2f}s ({issues} issues)")
+    return seconds
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 10000
+    jobs = int(argv[1]) if len(argv) > 1 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_repository(os.path.join(tmp, 'lessons'), count)
+        paths = list(lesson_files([os.path.join(tmp, 'lessons')]))
+        cache = ResultCache(os.path.join(tmp, 'cache.json'))
+
+        print(f"{len(paths)} lessons, {os.cpu_count()} CPUs")
+        run(paths, 1, None)
+        run(paths, jobs, cache)
+        start = time.perf_counter()
+        cache.save()
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        cache = ResultCache(cache.path)
+        loaded = time.perf_counter() - start
+        print(f"  cache: saved in {saved:.2f}s, loaded in {loaded:.2f}s, "
+              f"{os.path.getsize(cache.path) / 1e6:.1f} MB")
+        run(paths, jobs, cache)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+"""Benchmark lesson pack cold start and per-lesson open time.
+
+Builds synthetic catalogs of growing size from the built-in lessons and
+measures how long it takes to open the pack (what the app does at startup)
+and to open a lesson the first time and again from the cache.
+
+    python benchmarks/bench_lesson_pack.py [SIZES...]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lesson_pack import (BUILTIN_SOURCE, LessonPack, parse_source,  # noqa: E402
+                         source_files, write_pack)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+def synthetic_catalog(count):
+    base = [parse_source(p) for p in source_files(BUILTIN_SOURCE)]
+    for i in range(count):
+        key, title, topic, text = base[i % len(base)]
+        yield f"{key}_{i}", f"{title} #{i}", topic, f"Copy {i}\n\n{text}"
+
+
+def ms(seconds):
+    return seconds * 1000
+
+
+def bench(count, tmp_dir, samples=200):
+    path = os.path.join(tmp_dir, f"catalog_{count}.lpk")
+    write_pack(path, synthetic_catalog(count))
+    size_kb = os.path.getsize(path) / 1024
+
+    start = time.perf_counter()
+    pack = LessonPack(path)
+    open_time = time.perf_counter() - start
+
+    keys = [entry.key for entry in pack]
+    picks = random.sample(keys, min(samples, len(keys)))
+
+    cold = []
+    for key in picks:
+        start = time.perf_counter()
+        pack.read(key)
+        cold.append(time.perf_counter() - start)
+
+    warm = []
+    for key in picks[-pack.cache_size:]:
+        start = time.perf_counter()
+        pack.read(key)
+        warm.append(time.perf_counter() - start)
+
+    pack.close()
+    print(f"{count:>8} {size_kb:>10.0f} {ms(open_time):>10.3f} "
+          f"{ms(statistics.median(cold)):>10.4f} {ms(max(cold)):>10.4f} "
+          f"{ms(statistics.median(warm)):>10.4f}")
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or DEFAULT_SIZES
+    print(f"{'lessons':>8} {'pack KB':>10} {'open ms':>10} "
+          f"{'cold p50':>10} {'cold max':>10} {'cached p50':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in sizes:
+            bench(count, tmp_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+"""Benchmark flipping between lessons with and without the view pool.
+
+Opens the app hidden, then alternates between two lessons: once through
+show_lesson (pooled views, shown again after the first visit) and once by
+re-rendering the text into a single widget, which is what every lesson
+click used to do. Needs a display; on a headless machine run it under Xvfb.
+
+    python benchmarks/bench_lesson_switch.py [ROUNDS]
+"""
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LESSONS = ('shortcut_keys', 'terminology')
+
+
+def load_app_module():
+    # Per-user state goes to a scratch directory so the benchmark leaves no trace
+    os.environ['LEARN_COMPUTER_HOME'] = tempfile.mkdtemp(prefix='bench-lessons-')
+    spec = importlib.util.spec_from_file_location(
+        'modern_computer_basics', os.path.join(ROOT, 'modern_computer_basics.modren.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(root, switch, rounds):
+    times = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        switch(LESSONS[i % 2])
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main(argv):
+    rounds = int(argv[0]) if argv else 50
+    module = load_app_module()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run under Xvfb")
+        return 1
+    app = module.ComputerBasicsApp(root)
+    root.update()
+
+    def rerender(key):
+        app.render_lesson(app.lesson_pack.read(key))
+
+    pooled_p50, pooled_max = timed(root, app.show_lesson, rounds)
+    rerender_p50, rerender_max = timed(root, rerender, rounds)
+
+    pool = app.lesson_views
+    print(f"{rounds} switches between {' and '.join(LESSONS)}")
+    print(f"  pooled views   p50 {pooled_p50:6.2f} ms  max {pooled_max:6.2f} ms "
+          f"({pool.misses} rendered, {pool.hits} reused, {pool.used_bytes // 1024} KB)")
+    print(f"  re-render      p50 {rerender_p50:6.2f} ms  max {rerender_max:6.2f} ms")
+
+    app.shutdown()
+    root.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,99 @@
+"""Write a large event log and time exporting it.
+
+The log holds EVENTS synthetic events from a cohort of classes: lesson
+views, practice starts, timed steps and completions spread over a term.
+It is exported to CSV and JSON lines with one process and with the pool,
+and once filtered to one class and one month. Every pooled export is
+checked to match the single-process one byte for byte. Peak memory is
+that of this process; workers stream the same way.
+
+    python benchmarks/bench_progress_export.py [EVENTS] [JOBS]
+"""
+import filecmp
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_events import COMPLETED, LESSON, STARTED, STEP, EventLog  # noqa: E402
+from progress_export import export, parse_date  # noqa: E402
+
+CLASSES = 40
+LEARNERS_PER_CLASS = 30
+LESSONS = ('mouse_keyboard', 'create_folder', 'create_text_file', 'shortcut_keys',
+           'terminology', 'getting_help')
+SCENARIOS = ('file_handling', 'shortcuts', 'editing')
+TERM_START = parse_date('2026-09-01')
+TERM_DAYS = 120
+
+
+def write_log(path, events):
+    rng = random.Random(0)
+    learners = [(f"learner-{c:02d}-{i:02d}", f"Class {c:02d}")
+                for c in range(CLASSES) for i in range(LEARNERS_PER_CLASS)]
+    written = 0
+    with EventLog(path) as log:
+        while written < events:
+            learner, class_name = rng.choice(learners)
+            at = TERM_START + written / events * TERM_DAYS * 86400
+            if rng.random() < 0.4:
+                log.add(LESSON, learner, rng.choice(LESSONS), count=rng.randint(1, 3),
+                        class_name=class_name, at=at)
+                written += 1
+                continue
+            scenario = rng.choice(SCENARIOS)
+            log.add(STARTED, learner, scenario, class_name=class_name, at=at)
+            total = 0
+            for step in range(1, 6):
+                ms = rng.randint(2000, 90000)
+                total += ms
+                log.add(STEP, learner, scenario, step=step, ms=ms, class_name=class_name,
+                        at=at + total / 1000)
+            log.add(COMPLETED, learner, scenario, ms=total, class_name=class_name,
+                    at=at + total / 1000)
+            written += 7
+
+
+def timed_export(log_path, out_path, **options):
+    start = time.perf_counter()
+    with open(out_path, 'w', encoding='utf-8', newline='') as out:
+        rows, jobs = export(log_path, out, **options)
+    return rows, jobs, time.perf_counter() - start
+
+
+def main(argv):
+    events = int(argv[0]) if argv else 1000000
+    jobs = int(argv[1]) if len(argv) > 1 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'cohort.lpe')
+        start = time.perf_counter()
+        write_log(log_path, events)
+        print(f"{events} events written in {time.perf_counter() - start:.2f}s, "
+              f"log {os.path.getsize(log_path) / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+
+        runs = [
+            ('csv', {}),
+            ('jsonl', {}),
+            ('csv', {'classes': ['Class 07'], 'since': parse_date('2026-10-01'),
+                     'until': parse_date('2026-10-31', end=True)})
+        ]
+        for fmt, filters in runs:
+            single = os.path.join(tmp, f'single.{fmt}')
+            pooled = os.path.join(tmp, f'pooled.{fmt}')
+            rows, _, one = timed_export(log_path, single, fmt=fmt, jobs=1, **filters)
+            _, used, many = timed_export(log_path, pooled, fmt=fmt, jobs=jobs, **filters)
+            same = filecmp.cmp(single, pooled, shallow=False)
+            label = f"{fmt}{' one class, one month' if filters else ''}"
+            print(f"  {label:26} {rows:8} rows, {os.path.getsize(single) / 1e6:6.1f} MB: "
+                  f"1 process {one:.2f}s, {used} processes {many:.2f}s"
+                  f"{'' if same else '  OUTPUT DIFFERS'}")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  peak memory of this process: {peak / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
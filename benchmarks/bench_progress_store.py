@@ -0,0 +1,99 @@
+"""Build a district-sized progress store and time cohort queries on it.
+
+Compares memory against keeping one dict of sets per learner.
+
+    python benchmarks/bench_progress_store.py [LEARNERS]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_store import ProgressStore, lesson_flag, practice_flag, step_flag  # noqa: E402
+
+LESSONS = ['mouse_keyboard', 'create_folder', 'create_text_file',
+           'shortcut_keys', 'terminology', 'getting_help']
+SCENARIOS = {'file_handling': 6, 'cut_and_move': 4, 'select_all': 3}
+
+
+def simulated_learners(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        flags = [lesson_flag(key) for key in LESSONS[:-1] if rng.random() < 0.7]
+        for scenario, steps in SCENARIOS.items():
+            if rng.random() < 0.6:
+                flags.append(practice_flag(scenario))
+                for step in range(1, steps + 1):
+                    if rng.random() < 0.8:
+                        break
+                    flags.append(step_flag(scenario, step))
+        yield f'learner-{i:07d}', flags
+
+
+def build_store(learners):
+    store = ProgressStore()
+    for name, flags in learners:
+        for flag in flags:
+            store.mark(name, flag)
+    return store
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 300000
+    learners = list(simulated_learners(count))
+
+    start = time.perf_counter()
+    store = build_store(learners)
+    build = time.perf_counter() - start
+
+    # Measured on a second build, since tracing slows allocation down
+    del store
+    tracemalloc.start()
+    store = build_store(learners)
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    dicts = {name: {'lessons': set(), 'steps': set()} for name, _ in learners}
+    for name, flags in learners:
+        for flag in flags:
+            dicts[name]['lessons' if flag.startswith('lesson:') else 'steps'].add(flag)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dicts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'district.lps')
+        start = time.perf_counter()
+        store.save(path)
+        saved = time.perf_counter() - start
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        store = ProgressStore.load(path)
+        loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stuck = store.stuck_on('file_handling', 3).bit_count()
+    reached = store.reached('file_handling', 3).bit_count()
+    never = store.never_opened(LESSONS)
+    funnels = {scenario: store.funnel(scenario, steps) for scenario, steps in SCENARIOS.items()}
+    queries = time.perf_counter() - start
+
+    print(f"{count} learners, {len(store.flags)} flags")
+    print(f"  build {build:.2f}s, save {saved * 1000:.0f} ms ({size / 1e6:.1f} MB), "
+          f"load {loaded * 1000:.0f} ms")
+    print(f"  memory: store {store_bytes / 1e6:.1f} MB "
+          f"(bitmaps {len(store._bits) / 1e6:.2f} MB), dict of sets {dict_bytes / 1e6:.1f} MB")
+    print(f"  stuck on file_handling step 3: {stuck} of {reached} "
+          f"({stuck * 100 / max(reached, 1):.1f}%)")
+    print(f"  never opened: {never}")
+    print(f"  all queries ({sum(len(f) for f in funnels.values())} funnel rows) "
+          f"in {queries * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+"""Build a large question bank and time opening it, drawing and grading.
+
+Questions are copies of the built-in ones spread over many lessons and
+topics, as if many lesson packs had been compiled into one bank.
+
+    python benchmarks/bench_quiz.py [QUESTIONS] [LESSONS]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_bank import BUILTIN_SOURCE, QuizBank, parse_source, source_files, write_bank  # noqa: E402
+from quiz_engine import QuizSession, QuizStats  # noqa: E402
+
+
+def synthetic_bank(questions, lessons):
+    base = [q for p in source_files(BUILTIN_SOURCE) for q in parse_source(p)[2]]
+    per_lesson = questions // lessons
+    for i in range(lessons):
+        yield (f"lesson_{i:05d}", f"Topic {i % 50:02d}", [
+            dict(base[(i * per_lesson + j) % len(base)], id=f"q{j}")
+            for j in range(per_lesson)
+        ])
+
+
+def answer_for(question, rng):
+    if question.multiple_choice:
+        return rng.randrange(len(question.choices))
+    return ' and '.join(question.accept[:question.need])
+
+
+def main(argv):
+    questions = int(argv[0]) if argv else 200000
+    lessons = int(argv[1]) if len(argv) > 1 else 2000
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'big.qbk')
+        start = time.perf_counter()
+        count = write_bank(path, synthetic_bank(questions, lessons))
+        build = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        bank = QuizBank(path)
+        opened = time.perf_counter() - start
+        open_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        keys = list(bank.lessons)
+        stats = QuizStats()
+        draws = []
+        grades = []
+        sessions = 0
+        start_all = time.perf_counter()
+        while len(draws) < 20000:
+            picked = [rng.choice(keys)] if sessions % 2 else None
+            session = QuizSession(bank, lessons=picked, length=10, stats=stats, rng=rng)
+            sessions += 1
+            while True:
+                start = time.perf_counter()
+                question = session.next_question()
+                draws.append(time.perf_counter() - start)
+                if question is None:
+                    break
+                response = answer_for(question, rng)
+                start = time.perf_counter()
+                session.answer(response)
+                grades.append(time.perf_counter() - start)
+        total = time.perf_counter() - start_all
+
+        whole = QuizSession(bank, length=count, rng=rng)
+        seen = set()
+        while whole.next_question() is not None:
+            seen.add(whole.question.index)
+        bank.close()
+
+    def us(samples, q):
+        samples = sorted(samples)
+        return samples[int(q * (len(samples) - 1))] * 1e6
+
+    print(f"{count} questions in {len(keys)} lessons, bank {size / 1e6:.1f} MB")
+    print(f"  build {build:.2f}s, open {opened * 1000:.2f} ms using {open_bytes / 1024:.0f} KB")
+    print(f"  draw+decode: median {us(draws, 0.5):.1f} µs, p99 {us(draws, 0.99):.1f} µs")
+    print(f"  grade: median {us(grades, 0.5):.1f} µs, p99 {us(grades, 0.99):.1f} µs")
+    print(f"  {sessions} sessions, {len(stats)} questions with statistics, {total:.2f}s")
+    print(f"  drawing the whole bank without repeats: {len(seen)} distinct of {count}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
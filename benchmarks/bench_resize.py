@@ -0,0 +1,108 @@
+"""Benchmark dragging the window edge with a 10,000-line lesson open.
+
+Opens the app hidden, shows a long synthetic lesson and resizes the window
+one step per frame, as a drag would. Each frame's event handling is timed
+twice: with the resize coalescing the app uses, and with every <Configure>
+applied at once, which is what a plain gridded Text does. A frame that
+takes longer than FRAME_MS is a dropped frame. Needs a display; on a
+headless machine run it under Xvfb.
+
+    python benchmarks/bench_resize.py [LINES]
+"""
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lesson_markup import compile_lesson  # noqa: E402
+from lesson_pack import open_builtin_pack  # noqa: E402
+
+FRAME_MS = 16
+STEP_PX = 3
+
+
+def load_app_module():
+    # Per-user state goes to a scratch directory so the benchmark leaves no trace
+    os.environ['LEARN_COMPUTER_HOME'] = tempfile.mkdtemp(prefix='bench-resize-')
+    spec = importlib.util.spec_from_file_location(
+        'modern_computer_basics', os.path.join(ROOT, 'modern_computer_basics.modren.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def long_lesson(lines):
+    with open_builtin_pack() as pack:
+        base = [line for entry in pack for line in pack.read(entry.key).split('\n')]
+    return '\n'.join(base[i % len(base)] for i in range(lines))
+
+
+def drag(root, widths):
+    frames = []
+    for width in widths:
+        start = time.perf_counter()
+        root.geometry(f"{width}x700")
+        root.update()
+        elapsed = time.perf_counter() - start
+        frames.append(elapsed * 1000)
+        if elapsed < FRAME_MS / 1000:
+            time.sleep(FRAME_MS / 1000 - elapsed)
+    # Let the last reflow land before the next run
+    end = time.perf_counter() + 0.5
+    while time.perf_counter() < end:
+        root.update()
+        time.sleep(0.005)
+    return frames
+
+
+def report(name, frames, coalescer):
+    frames = sorted(frames)
+    dropped = sum(ms > FRAME_MS for ms in frames)
+    print(f"  {name:12} p50 {statistics.median(frames):6.2f} ms  "
+          f"p95 {frames[int(0.95 * (len(frames) - 1))]:6.2f} ms  max {frames[-1]:6.2f} ms  "
+          f"{dropped}/{len(frames)} frames over {FRAME_MS} ms  "
+          f"({coalescer.applied} reflows for {coalescer.events} events)")
+
+
+def main(argv):
+    lines = int(argv[0]) if argv else 10000
+    module = load_app_module()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run under Xvfb")
+        return 1
+    app = module.ComputerBasicsApp(root)
+    root.geometry("1000x700")
+    root.update()
+
+    text = long_lesson(lines)
+    view = app.lesson_views.view('long', lambda: compile_lesson(text))
+    app.show_lesson_view(view)
+    root.update()
+
+    widths = list(range(1000, 800, -STEP_PX)) + list(range(800, 1000, STEP_PX))
+    coalescer = app.view_resize
+    print(f"Dragging {len(widths)} frames with a {lines}-line lesson open")
+    coalescer.events = coalescer.applied = 0
+    coalesced = drag(root, widths)
+    report('coalesced', coalesced, coalescer)
+
+    coalescer.step, coalescer.interval_ms, coalescer.settle_ms = 1, 0, 0
+    coalescer.events = coalescer.applied = 0
+    every = drag(root, widths)
+    report('every event', every, coalescer)
+
+    app.shutdown()
+    root.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
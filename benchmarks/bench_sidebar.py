@@ -0,0 +1,82 @@
+"""Benchmark the virtualized lesson sidebar with a large catalog.
+
+Builds the sidebar for a synthetic catalog of LESSONS entries spread over
+topics, then times opening it, scrolling through the whole list a few rows
+at a time and collapsing every topic. Needs a display; on a headless
+machine run it under Xvfb.
+
+    python benchmarks/bench_sidebar.py [LESSONS]
+"""
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import font
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lesson_pack import LessonEntry  # noqa: E402
+from lesson_sidebar import LessonSidebar  # noqa: E402
+from theme_engine import ThemeEngine  # noqa: E402
+from bench_theme_switch import THEMES  # noqa: E402
+
+TOPICS = 50
+
+
+def catalog(count):
+    return [
+        LessonEntry(f'lesson_{i}', f"Lesson {i}", f"Topic {i % TOPICS:02d}", 0, 0, 0)
+        for i in range(count)
+    ]
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 5000
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run under Xvfb")
+        return 1
+    root.geometry('220x700')
+    engine = ThemeEngine(root, THEMES)
+    entries = catalog(count)
+
+    start = time.perf_counter()
+    sidebar = LessonSidebar(
+        root, entries, lambda key: None, engine,
+        font.Font(family='Segoe UI', size=12),
+        font.Font(family='Segoe UI', size=11, weight='bold')
+    )
+    sidebar.frame.pack(fill=tk.BOTH, expand=True)
+    engine.apply('light')
+    root.update()
+    opened = (time.perf_counter() - start) * 1000
+
+    steps = []
+    while True:
+        before = sidebar.offset
+        start = time.perf_counter()
+        sidebar.scroll_rows(3)
+        root.update_idletasks()
+        steps.append((time.perf_counter() - start) * 1000)
+        if sidebar.offset == before:
+            break
+
+    start = time.perf_counter()
+    for topic in {entry.topic for entry in entries}:
+        sidebar.toggle(topic)
+    root.update_idletasks()
+    collapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{count} lessons in {TOPICS} topics, {len(sidebar._slots)} buttons created")
+    print(f"  open              {opened:8.1f} ms")
+    print(f"  scroll 3 rows     p50 {statistics.median(steps):.2f} ms, "
+          f"max {max(steps):.2f} ms over {len(steps)} steps")
+    print(f"  collapse {TOPICS} topics {collapsed:6.1f} ms")
+    root.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
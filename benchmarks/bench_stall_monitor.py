@@ -0,0 +1,120 @@
+"""Measure the stall monitor's overhead and check its stall attribution.
+
+Runs on a Tcl event loop, so no display is needed. Overhead is measured in
+two ways. First, the extra CPU time while the loop is idle. Second, the
+throughput of a stream of short callbacks with and without the monitor.
+The monitor is then run against handlers that block in known ways, to
+check that each stall is charged to the right handler.
+
+    python benchmarks/bench_stall_monitor.py [SECONDS]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stall_monitor import StallMonitor, format_report  # noqa: E402
+
+
+def run_loop(root, seconds):
+    # Without Tk there are no windows to keep mainloop() running
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.tk.dooneevent()
+
+
+def measure(kind, monitor, seconds):
+    """CPU seconds used while idle, or short callbacks run per second"""
+    root = tkinter.Tcl()
+    stalls = StallMonitor(root) if monitor else None
+    if stalls:
+        stalls.start()
+    done = [0]
+
+    def tick():
+        # An idle app still wakes up now and then, here every 100 ms
+        root.after(100, tick)
+
+    def work():
+        total = 0
+        for i in range(200):
+            total += i * i
+        done[0] += 1
+        root.after_idle(work)
+
+    root.after_idle(tick if kind == 'idle' else work)
+    start = time.process_time()
+    run_loop(root, seconds)
+    used = time.process_time() - start
+    if stalls:
+        stalls.stop()
+    return used if kind == 'idle' else done[0] / seconds
+
+
+def measure_fresh(kind, monitor, seconds, repeats=3):
+    """Median of runs in new processes; a second Tcl interpreter in one process runs slower"""
+    results = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, __file__, '--measure', kind, str(int(monitor)), str(seconds)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(float(out))
+    return statistics.median(results)
+
+
+def save_file_dialog():
+    # Stands in for a modal dialog or a slow disk: blocked outside Python
+    time.sleep(0.4)
+
+
+def reflow_everything():
+    end = time.perf_counter() + 0.25
+    while time.perf_counter() < end:
+        pass
+
+
+def paste_step():
+    reflow_everything()
+
+
+def main(argv):
+    if argv[:1] == ['--measure']:
+        print(measure(argv[1], argv[2] == '1', float(argv[3])))
+        return 0
+    seconds = float(argv[0]) if argv else 3.0
+
+    base_cpu = measure_fresh('idle', False, seconds)
+    mon_cpu = measure_fresh('idle', True, seconds)
+    print(f"idle CPU over {seconds:.0f}s: {base_cpu * 1000:.0f} ms without the monitor, "
+          f"{mon_cpu * 1000:.0f} ms with it "
+          f"({(mon_cpu - base_cpu) / seconds * 100:.2f}% of one core)")
+
+    base = measure_fresh('busy', False, seconds)
+    with_monitor = measure_fresh('busy', True, seconds)
+    print(f"short callbacks: {base:,.0f}/s without, {with_monitor:,.0f}/s with "
+          f"({(1 - with_monitor / base) * 100:.1f}% slower)")
+
+    root = tkinter.Tcl()
+    stalls = StallMonitor(root)
+    stalls.start()
+    for at, handler in ((200, save_file_dialog), (900, paste_step), (1500, save_file_dialog)):
+        root.after(at, handler)
+    root.after(2500, lambda: None)
+    run_loop(root, 2.5)
+    stalls.stop()
+    print()
+    report = stalls.report()
+    print(format_report(report))
+    expected = {'save_file_dialog', 'paste_step -> bench_stall_monitor.py:reflow_everything'}
+    ok = set(report['stalls']) == expected and report['stalls']['save_file_dialog']['count'] == 2
+    print("attribution correct" if ok else f"UNEXPECTED attribution: {list(report['stalls'])}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
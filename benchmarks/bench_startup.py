@@ -0,0 +1,55 @@
+"""Benchmark time to first paint by launching the app repeatedly.
+
+Each run starts a fresh interpreter with --startup-report - --exit-after-startup
+and collects the per-phase timings the app reports. Needs a display; on a
+headless machine run it under Xvfb.
+
+    python benchmarks/bench_startup.py [RUNS]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'modern_computer_basics.modren.py')
+
+
+def launch(env):
+    proc = subprocess.run(
+        [sys.executable, APP, '--startup-report', '-', '--exit-after-startup'],
+        capture_output=True, text=True, env=env, timeout=60
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"exit status {proc.returncode}")
+    return json.loads(proc.stdout)
+
+
+def main(argv):
+    runs = int(argv[0]) if argv else 20
+    with tempfile.TemporaryDirectory() as home:
+        # A clean state directory so no restore prompt interrupts the launch
+        env = dict(os.environ, LEARN_COMPUTER_HOME=home)
+        try:
+            launch(env)  # warm the lesson pack and OS file cache
+        except RuntimeError as e:
+            print(f"App failed to start: {e}")
+            return 1
+        reports = [launch(env) for _ in range(runs)]
+
+    phases = list(reports[0]['phases'])
+    print(f"{runs} launches")
+    print(f"{'phase':<12} {'p50 ms':>8} {'min ms':>8} {'max ms':>8}")
+    for phase in phases + ['total']:
+        if phase == 'total':
+            values = [r['total_ms'] for r in reports]
+        else:
+            values = [r['phases'][phase] for r in reports]
+        print(f"{phase:<12} {statistics.median(values):8.1f} {min(values):8.1f} {max(values):8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,101 @@
+"""Per-keystroke cost of the practice editor telemetry.
+
+Drives KeystrokeTelemetry.on_key with a synthetic typing stream, first
+directly and then through a Tcl command exactly like the key binding does
+(no display needed), and compares it with the naive approach of appending
+an event dict to a list and writing a line to a file on every key.
+
+    python benchmarks/bench_telemetry.py [KEYS]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keystroke_telemetry import KeystrokeTelemetry, read_log  # noqa: E402
+
+
+def typing_stream(count, seed=0):
+    """(keysym_num, state, keysym, char) tuples as Tk would substitute them"""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            events.append(('65288', '0', 'BackSpace', ''))
+        elif roll < 0.07:
+            key = rng.choice('csvzxa')
+            events.append((str(ord(key)), '4', key, ''))
+        else:
+            ch = rng.choice('abcdefghijklmnopqrstuvwxyz     ')
+            events.append((str(ord(ch)), '0', 'space' if ch == ' ' else ch, ch))
+    return events
+
+
+def naive(events, path):
+    log = []
+    with open(path, 'a', encoding='utf-8') as f:
+        for keysym_num, state, keysym, char in events:
+            event = {'t': time.perf_counter_ns(), 'key': keysym, 'char': char, 'state': state}
+            log.append(event)
+            f.write(json.dumps(event) + '\n')
+            f.flush()
+
+
+def per_key_us(seconds, count):
+    return seconds / count * 1e6
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 200000
+    events = typing_stream(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = KeystrokeTelemetry(None, os.path.join(tmp, 'keys.ktl'), capacity=1 << 20)
+        on_key = telemetry.on_key
+        start = time.perf_counter()
+        for event in events:
+            on_key(*event)
+        direct = time.perf_counter() - start
+        start = time.perf_counter()
+        telemetry.flush()
+        flushed = time.perf_counter() - start
+        logged = sum(1 for _ in read_log(telemetry.path))
+
+        interp = tkinter.Tcl()
+        telemetry = KeystrokeTelemetry(None, os.path.join(tmp, 'keys2.ktl'), capacity=1 << 20)
+        interp.createcommand('telemetry_key', telemetry.on_key)
+        interp.createcommand('noop_key', lambda *args: None)
+        scripts = [f'telemetry_key {n} {s} {k} {{{c}}}' for n, s, k, c in events]
+        noop_scripts = [f'noop_key {n} {s} {k} {{{c}}}' for n, s, k, c in events]
+        evaluate = interp.eval
+        start = time.perf_counter()
+        for script in noop_scripts:
+            evaluate(script)
+        dispatch = time.perf_counter() - start
+        start = time.perf_counter()
+        for script in scripts:
+            evaluate(script)
+        via_tcl = time.perf_counter() - start
+
+        start = time.perf_counter()
+        naive(events, os.path.join(tmp, 'naive.jsonl'))
+        slow = time.perf_counter() - start
+
+    print(f"{count} keystrokes")
+    print(f"  ring buffer, direct call     {per_key_us(direct, count):6.2f} µs/key")
+    print(f"  Tcl dispatch alone           {per_key_us(dispatch, count):6.2f} µs/key")
+    print(f"  ring buffer through Tcl      {per_key_us(via_tcl, count):6.2f} µs/key")
+    print(f"  naive list + write per key   {per_key_us(slow, count):6.2f} µs/key")
+    print(f"  one batch flush of {logged} events: {flushed * 1000:.1f} ms")
+    print(f"  counted {telemetry.chars} chars, {telemetry.corrections} corrections, "
+          f"{sum(telemetry.shortcuts.values())} shortcuts")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,110 @@
+"""Benchmark theme switches on a window with thousands of themed widgets.
+
+Compares the theme engine's diff-only batched switch against reconfiguring
+every widget one by one (what apply_theme used to do). The widgets are
+gridded into a visible window and each switch is timed through update(),
+so the redraws it causes are included. Needs a display; on a headless
+machine run it under Xvfb.
+
+    python benchmarks/bench_theme_switch.py [WIDGETS...]
+"""
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from theme_engine import ThemeEngine  # noqa: E402
+
+THEMES = {
+    'light': {
+        'bg': '#f5f5f5', 'text_bg': '#ffffff', 'text_fg': '#333333',
+        'button_bg': '#4a7a8c', 'button_fg': 'white', 'button_active': '#3a6a7c',
+        'highlight': '#e1f5fe', 'header_bg': '#4a7a8c', 'header_fg': 'white',
+        'success': '#4caf50', 'warning': '#ff9800'
+    },
+    'dark': {
+        'bg': '#2d2d2d', 'text_bg': '#3d3d3d', 'text_fg': '#e0e0e0',
+        'button_bg': '#5a8a9c', 'button_fg': 'white', 'button_active': '#4a7a8c',
+        'highlight': '#1a3a4a', 'header_bg': '#3a5a6c', 'header_fg': 'white',
+        'success': '#388e3c', 'warning': '#f57c00'
+    }
+}
+
+FRAME_BUDGET_MS = 16.0
+ROUNDS = 20
+COLUMNS = 50
+
+
+def build(root, engine, count):
+    frame = tk.Frame(root)
+    frame.pack()
+    engine.register(frame, 'frame')
+    widgets = []
+    for i in range(count):
+        if i % 3 == 0:
+            widget, role = tk.Button(frame, text=f"Lesson {i}"), 'nav_button'
+            engine.register(widget, role, hover=True)
+        elif i % 3 == 1:
+            widget, role = tk.Label(frame, text=f"Label {i}"), 'label'
+            engine.register(widget, role)
+        else:
+            widget, role = tk.Frame(frame, width=12, height=12), 'frame'
+            engine.register(widget, role)
+        widget.grid(row=i // COLUMNS, column=i % COLUMNS)
+        widgets.append((widget, role))
+    return frame, widgets
+
+
+def naive_apply(widgets, table):
+    for widget, role in widgets:
+        widget.config(**table[role])
+
+
+def timed(func, *args):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [1000, 5000, 10000]
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run under Xvfb")
+        return 1
+
+    print(f"{'widgets':>8} {'engine p50':>11} {'engine max':>11} {'naive p50':>10}  budget")
+    for count in sizes:
+        engine = ThemeEngine(root, THEMES)
+        frame, widgets = build(root, engine, count)
+        engine.apply('light')
+        root.update()
+
+        names = iter(['dark', 'light'] * ROUNDS)
+
+        def switch():
+            engine.apply(next(names))
+            root.update()
+
+        engine_p50, engine_max = timed(switch)
+
+        tables = iter([engine.tables['dark'], engine.tables['light']] * ROUNDS)
+        naive_p50, _ = timed(lambda: (naive_apply(widgets, next(tables)), root.update()))
+
+        verdict = 'ok' if engine_max < FRAME_BUDGET_MS else 'OVER'
+        print(f"{count:>8} {engine_p50:>10.2f}ms {engine_max:>10.2f}ms {naive_p50:>9.2f}ms  {verdict}")
+        frame.destroy()
+
+    root.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,370 @@
+"""UI latency and memory benchmarks for the whole app, with a regression check.
+
+Runs the real ComputerBasicsApp and drives it with synthetic X events, the
+way a learner would:
+
+    startup   launch the app until its first frame is drawn
+    lessons   click each lesson button in the sidebar in turn
+    theme     click the theme toggle in the header
+    practice  click Practice Session, type some text, then Ctrl+A, Ctrl+C,
+              Ctrl+V, Ctrl+Z, Ctrl+Y and Ctrl+S through the file handling
+              scenario until the save finishes
+
+Each scenario runs in its own process, so its peak RSS is its own. An
+action is timed from the event until Tk has processed everything it queued,
+redraws included. The report gives p50 and p99 per action and peak RSS per
+scenario.
+
+With no DISPLAY the suite starts its own Xvfb. --xvfb starts one even when
+a display is set, so windows never show up on screen.
+
+--save-baseline stores the results as JSON. Later runs are compared with
+the baseline (benchmarks/ui_baseline.json unless --baseline names another
+file). A p50, p99 or peak RSS more than --threshold percent above its
+baseline fails the run with exit status 1. Latencies also have to be at
+least MIN_DELTA_MS slower, so sub-millisecond jitter is not reported.
+
+Timings are only comparable on the machine that made the baseline, so the
+baseline has to come from the machine that runs the check: the CI runner,
+with the suite's private Xvfb, idle, and the Python and Tk it tests with.
+Make it there with the first command below and commit
+benchmarks/ui_baseline.json. The baseline records the machine it was made
+on, and a comparison on any other machine prints a warning.
+
+    python benchmarks/bench_ui.py --xvfb --rounds 30 --save-baseline
+    python benchmarks/bench_ui.py --xvfb --threshold 15
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'modern_computer_basics.modren.py')
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'ui_baseline.json')
+SCENARIOS = ('startup', 'lessons', 'theme', 'practice')
+MIN_DELTA_MS = 1.0
+SAVE_TIMEOUT = 10
+TYPED = 'Hello world'
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+# Driving the app
+
+def load_app_module():
+    spec = importlib.util.spec_from_file_location('modern_computer_basics', APP)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def open_app(module):
+    root = tk.Tk()
+    app = module.ComputerBasicsApp(root)
+    root.update()
+    return root, app
+
+
+def timed(root, action, *args):
+    """ms from the event until Tk is idle again"""
+    start = time.perf_counter()
+    action(*args)
+    root.update()
+    return (time.perf_counter() - start) * 1000
+
+
+def click(button):
+    # Button's class bindings only invoke on release over the button it was pressed on
+    button.event_generate('<Enter>', x=2, y=2)
+    button.event_generate('<ButtonPress-1>', x=2, y=2)
+    button.event_generate('<ButtonRelease-1>', x=2, y=2)
+    button.event_generate('<Leave>')
+
+
+def find_button(widget, text):
+    """The first Button under widget labelled text"""
+    for child in widget.winfo_children():
+        if isinstance(child, tk.Button) and child.cget('text') == text:
+            return child
+        found = find_button(child, text)
+        if found is not None:
+            return found
+    return None
+
+
+def lesson_titles(app):
+    return [row[2] for row in app.lesson_sidebar.rows if row[0] == 'lesson']
+
+
+def type_text(editor, text):
+    for char in text:
+        editor.event_generate('<KeyPress>', keysym='space' if char == ' ' else char)
+
+
+def shortcut(editor, key):
+    editor.event_generate(f'<Control-KeyPress-{key}>')
+
+
+# Scenarios; each returns {action: [ms, ...]}
+
+def run_startup(rounds):
+    """Fresh interpreters, timed by the app's own startup profile"""
+    times = []
+    for _ in range(rounds + 1):
+        proc = subprocess.run(
+            [sys.executable, APP, '--startup-report', '-', '--exit-after-startup'],
+            capture_output=True, text=True, timeout=60
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip() or f"exit status {proc.returncode}")
+        times.append(json.loads(proc.stdout)['total_ms'])
+    # The first launch warms the lesson pack and the OS file cache
+    return {'first_frame': times[1:]}
+
+
+def run_lessons(rounds):
+    module = load_app_module()
+    root, app = open_app(module)
+    titles = lesson_titles(app)
+    results = {'lesson_click_first': [], 'lesson_click': []}
+    for i in range(rounds):
+        for title in titles:
+            button = find_button(app.lesson_sidebar.viewport, title)
+            ms = timed(root, click, button)
+            results['lesson_click_first' if i == 0 else 'lesson_click'].append(ms)
+    app.shutdown()
+    root.destroy()
+    return results
+
+
+def run_theme(rounds):
+    module = load_app_module()
+    root, app = open_app(module)
+    # Toggle with a lesson on screen, as learners do
+    click(find_button(app.lesson_sidebar.viewport, lesson_titles(app)[0]))
+    root.update()
+    times = [timed(root, click, app.theme_button) for _ in range(rounds * 2)]
+    app.shutdown()
+    root.destroy()
+    return {'theme_toggle': times}
+
+
+def run_practice(rounds):
+    with tempfile.TemporaryDirectory(prefix='bench-ui-') as out_dir:
+        return practice_rounds(rounds, out_dir)
+
+
+def practice_rounds(rounds, out_dir):
+    module = load_app_module()
+    # Modal dialogs would wait for a person; answer them at once
+    module.filedialog.asksaveasfilename = lambda **options: os.path.join(out_dir, 'practice.txt')
+    module.messagebox.showinfo = lambda *args, **options: 'ok'
+
+    root, app = open_app(module)
+    practice_button = find_button(app.button_container, app.tr("💻 Practice Session"))
+    results = {'practice_open': [], 'practice_key': [], 'practice_shortcut': [],
+               'practice_session': []}
+    for _ in range(rounds):
+        session_start = time.perf_counter()
+        results['practice_open'].append(timed(root, click, practice_button))
+        editor = app.practice_editor
+        editor.focus_force()
+        root.update()
+        for char in TYPED:
+            results['practice_key'].append(timed(root, type_text, editor, char))
+        for key in 'acvzy':
+            results['practice_shortcut'].append(timed(root, shortcut, editor, key))
+        shortcut(editor, 's')
+        deadline = time.monotonic() + SAVE_TIMEOUT
+        while app.practice.active:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"practice session stuck at step {app.practice.step}")
+            root.update()
+            time.sleep(0.001)
+        results['practice_session'].append((time.perf_counter() - session_start) * 1000)
+    app.shutdown()
+    root.destroy()
+    return results
+
+
+RUNNERS = {
+    'startup': run_startup,
+    'lessons': run_lessons,
+    'theme': run_theme,
+    'practice': run_practice
+}
+
+
+def run_scenario(name, rounds):
+    """Child process: run one scenario and print its results as JSON"""
+    times = RUNNERS[name](rounds)
+    usage = resource.RUSAGE_CHILDREN if name == 'startup' else resource.RUSAGE_SELF
+    print(json.dumps({'times': times, 'peak_rss_kb': resource.getrusage(usage).ru_maxrss}))
+
+
+# The suite
+
+def start_xvfb():
+    """Start a private Xvfb; returns (process, display)"""
+    read_fd, write_fd = os.pipe()
+    try:
+        proc = subprocess.Popen(
+            ['Xvfb', '-displayfd', str(write_fd), '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+            pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        proc.kill()
+        raise RuntimeError("Xvfb did not start")
+    return proc, f':{number}'
+
+
+def run_suite(scenarios, rounds, env):
+    results = {}
+    for name in scenarios:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--scenario', name, '--rounds', str(rounds)],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name}: {proc.stderr.strip() or f'exit status {proc.returncode}'}")
+        data = json.loads(proc.stdout.splitlines()[-1])
+        results[name] = {
+            'actions': {
+                action: {'p50': percentile(times, 0.5), 'p99': percentile(times, 0.99),
+                         'samples': len(times)}
+                for action, times in data['times'].items()
+            },
+            'peak_rss_kb': data['peak_rss_kb']
+        }
+    return results
+
+
+def machine():
+    """What a baseline's timings depend on"""
+    return (f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs, "
+            f"Python {platform.python_version()}, Tk {tk.TkVersion}")
+
+
+def regressed(value, base, threshold, min_delta=0.0):
+    return value > base * (1 + threshold / 100) and value - base >= min_delta
+
+
+def compare(results, baseline, threshold):
+    """Print the results next to the baseline; returns the number of regressions"""
+    failures = 0
+    print(f"{'scenario / action':<34} {'p50 ms':>9} {'p99 ms':>9} {'base p50':>9} {'base p99':>9}")
+    for name, result in results.items():
+        base = baseline.get(name, {}) if baseline else {}
+        for action, stats in result['actions'].items():
+            old = base.get('actions', {}).get(action)
+            flags = []
+            if old:
+                for key in ('p50', 'p99'):
+                    if regressed(stats[key], old[key], threshold, MIN_DELTA_MS):
+                        flags.append(f"{key} +{(stats[key] / old[key] - 1) * 100:.0f}%")
+            columns = f"{old['p50']:9.2f} {old['p99']:9.2f}" if old else f"{'-':>9} {'-':>9}"
+            print(f"{name + ' / ' + action:<34} {stats['p50']:9.2f} {stats['p99']:9.2f} {columns}"
+                  f"  {'REGRESSED ' + ', '.join(flags) if flags else ''}")
+            failures += len(flags)
+        rss = result['peak_rss_kb']
+        old_rss = base.get('peak_rss_kb')
+        line = f"{name + ' / peak RSS':<34} {rss / 1024:8.1f}M"
+        if old_rss:
+            line += f" {'':9} {old_rss / 1024:8.1f}M"
+            if regressed(rss, old_rss, threshold):
+                line += f" {'':9}  REGRESSED +{(rss / old_rss - 1) * 100:.0f}%"
+                failures += 1
+        print(line)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's UI under a virtual display")
+    parser.add_argument('--rounds', type=int, default=20, help="repetitions per scenario (default: %(default)s)")
+    parser.add_argument('--only', action='append', choices=SCENARIOS, metavar='SCENARIO',
+                        help="run just this scenario (repeat for several): " + ', '.join(SCENARIOS))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help="percent over the baseline that counts as a regression (default: %(default)s)")
+    parser.add_argument('--xvfb', action='store_true', help="use a private Xvfb even if DISPLAY is set")
+    parser.add_argument('--scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        run_scenario(args.scenario, args.rounds)
+        return 0
+
+    xvfb = None
+    env = dict(os.environ)
+    if args.xvfb or not env.get('DISPLAY'):
+        try:
+            xvfb, env['DISPLAY'] = start_xvfb()
+        except (OSError, RuntimeError) as e:
+            print(f"No display available ({e}); install Xvfb or set DISPLAY")
+            return 1
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench-ui-home-') as home:
+            # A clean state directory: no restore prompt, no saved progress or theme
+            env['LEARN_COMPUTER_HOME'] = home
+            results = run_suite(args.only or SCENARIOS, args.rounds, env)
+    except (RuntimeError, subprocess.SubprocessError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print(f"{args.rounds} rounds, {os.cpu_count()} CPUs"
+          + (f", threshold {args.threshold:g}% over {os.path.relpath(args.baseline)}" if baseline else ""))
+    if baseline is not None and baseline.get('machine') != machine():
+        print(f"warning: the baseline was made on {baseline.get('machine', 'an unknown machine')}, "
+              f"this is {machine()}; timings are not comparable")
+    failures = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # Scenarios left out of this run keep their old numbers
+            with open(args.baseline, encoding='utf-8') as f:
+                results = dict(json.load(f), **results)
+        results['machine'] = machine()
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    elif failures:
+        print(f"{failures} regression(s) over {args.threshold:g}%")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
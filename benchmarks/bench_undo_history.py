@@ -0,0 +1,128 @@
+"""Memory of the practice editor's undo history over a long lab session.
+
+Replays a simulated session of HOURS hours into a TextModel (the journal's
+widget-free Text) through UndoHistory. The learner types at 3 characters a
+second with the occasional Backspace run, pastes a block every 20 seconds,
+deletes a paragraph every minute and presses Ctrl+Z and Ctrl+Y now and then.
+Every simulated hour it prints the bytes the history counts and what
+tracemalloc measures for the history alone.
+
+    python benchmarks/bench_undo_history.py [HOURS] [BUDGET_KB]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from practice_journal import TextModel  # noqa: E402
+from undo_history import UndoHistory, advance_index  # noqa: E402
+
+TYPING_PER_SECOND = 3
+WORDS = ('the', 'file', 'folder', 'save', 'copy', 'paste', 'keyboard', 'mouse', 'window',
+         'desktop', 'shortcut', 'undo', 'redo', 'select', 'document', 'computer')
+
+
+class Session:
+    """A TextModel editor whose edits feed an UndoHistory, like EditRecorder does"""
+
+    def __init__(self, budget):
+        self.model = TextModel()
+        self.cursor = '1.0'
+        self.history = UndoHistory(self.apply, budget=budget)
+
+    def apply(self, op, start, end, text):
+        if op == 'insert':
+            self.model.insert(start, text)
+            self.cursor = end
+        else:
+            self.model.delete(start, end)
+            self.cursor = start
+
+    def insert(self, text):
+        self.history.separator()
+        self.model.insert(self.cursor, text)
+        self.history.record('insert', self.cursor, text)
+        self.cursor = advance_index(self.cursor, text)
+
+    def backspace(self):
+        line, col = (int(part) for part in self.cursor.split('.'))
+        if col == 0:
+            return
+        start = f'{line}.{col - 1}'
+        text = self.model.lines[line - 1][col - 1]
+        self.history.separator()
+        self.model.delete(start, self.cursor)
+        self.history.record('delete', start, text)
+        self.cursor = start
+
+    def delete_line(self, line):
+        start, end = f'{line}.0', f'{line + 1}.0'
+        text = self.model.lines[line - 1] + '\n'
+        self.history.separator()
+        self.model.delete(start, end)
+        self.history.record('delete', start, text)
+        self.cursor = start
+
+
+def paragraph(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)) + '\n'
+
+
+def simulate(session, seconds, rng):
+    """One simulated second of work per step"""
+    for second in range(seconds):
+        for _ in range(TYPING_PER_SECOND):
+            if rng.random() < 0.05:
+                session.backspace()
+            else:
+                session.insert(rng.choice(' etaoinshrdlu\n' if rng.random() < 0.1 else 'etaoinshrdlu '))
+        if second % 20 == 0:
+            session.insert(paragraph(rng, rng.choice((5, 40, 400))))
+        if second % 60 == 30 and len(session.model.lines) > 3:
+            session.delete_line(rng.randrange(1, len(session.model.lines) - 1))
+            session.cursor = f'{len(session.model.lines) - 1}.0'
+        if second % 45 == 10:
+            for _ in range(rng.randrange(1, 4)):
+                session.history.undo()
+            if rng.random() < 0.5:
+                session.history.redo()
+            session.cursor = f'{len(session.model.lines) - 1}.0'
+        if len(session.model.lines) > 2000:
+            # The learner starts a fresh page now and then
+            session.model = TextModel()
+            session.cursor = '1.0'
+            session.history.reset()
+
+
+def main(argv):
+    hours = float(argv[0]) if argv else 8
+    budget = (int(argv[1]) if len(argv) > 1 else 1024) * 1024
+    rng = random.Random(7)
+    session = Session(budget)
+    print(f"{hours:g} h simulated session, undo budget {budget // 1024} KB")
+    tracemalloc.start()
+    start = time.perf_counter()
+    edits = 0
+    for hour in range(1, int(hours) + 1):
+        simulate(session, 3600, rng)
+        edits += 3600 * TYPING_PER_SECOND
+        history = session.history
+        # What the history itself holds, without the editor text
+        session.model, model = TextModel(), session.model
+        before = tracemalloc.take_snapshot()
+        held = sum(stat.size for stat in before.statistics('filename')
+                   if stat.traceback[0].filename.endswith('undo_history.py'))
+        session.model = model
+        print(f"  hour {hour}: {len(history.undo_stack):6} undo groups, "
+              f"{history.size / 1024:7.0f} KB counted, {held / 1024:7.0f} KB allocated, "
+              f"{history.evicted} evicted")
+    seconds = time.perf_counter() - start
+    print(f"  {edits / seconds / 1000:.0f}k edits/s, peak traced memory "
+          f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,99 @@
+"""Soak test for widget, Tcl and memory leaks.
+
+Opens the app with leak diagnostics on and repeats ROUNDS cycles of: open
+every lesson, toggle the theme twice, open the practice panel and leave it
+for a lesson again. The first two cycles are warm-up (lesson views, fonts
+and caches fill up). Prints the growth per operation and exits with status
+1 when any counter is still growing at the end. Needs a display; on a
+headless machine run it under Xvfb.
+
+--inject-leak makes every theme toggle bind one more callback to the theme
+button that is never unbound, a leak of one Tcl command per toggle. The
+run must then fail, which shows the soak test can catch a leak that small.
+
+    xvfb-run -a python benchmarks/soak_leaks.py [ROUNDS] [--inject-leak]
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from leak_monitor import LeakMonitor, format_report  # noqa: E402
+
+WARMUP_ROUNDS = 2
+
+
+def load_app_module():
+    # Per-user state goes to a scratch directory so the benchmark leaves no trace
+    os.environ['LEARN_COMPUTER_HOME'] = tempfile.mkdtemp(prefix='bench-leaks-')
+    spec = importlib.util.spec_from_file_location(
+        'modern_computer_basics', os.path.join(ROOT, 'modern_computer_basics.modren.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def inject_leak(app):
+    """Make every theme toggle bind a new callback that is never unbound"""
+    toggle = app.toggle_theme
+
+    def leaky_toggle():
+        app.theme_button.bind('<Enter>', lambda event: None, add='+')
+        toggle()
+
+    app.toggle_theme = leaky_toggle
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Soak test for widget, Tcl and memory leaks")
+    parser.add_argument('rounds', nargs='?', type=int, default=60)
+    parser.add_argument('--inject-leak', action='store_true',
+                        help="leak one Tcl command per theme toggle; the run should then fail")
+    args = parser.parse_args(argv)
+    rounds = args.rounds
+    module = load_app_module()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run under Xvfb")
+        return 1
+
+    # Operations per round: every lesson, two theme toggles, practice and back
+    monitor = LeakMonitor(root)
+    app = module.ComputerBasicsApp(root, diagnostics=monitor)
+    if args.inject_leak:
+        inject_leak(app)
+    lessons = [row[1] for row in app.lesson_sidebar.rows if row[0] == 'lesson']
+    monitor.warmup = WARMUP_ROUNDS * (len(lessons) + 4)
+    root.update()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in lessons:
+            app.show_lesson(key)
+            root.update()
+        for _ in range(2):
+            app.toggle_theme()
+            root.update()
+        app.start_practice_session()
+        root.update()
+        app.show_lesson(lessons[0])
+        root.update()
+    seconds = time.perf_counter() - start
+
+    report = monitor.report()
+    print(f"{rounds} rounds, {monitor.sampled} operations in {seconds:.1f}s")
+    print(format_report(report))
+    app.shutdown()
+    root.destroy()
+    return 1 if report['unbounded'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""Fire-and-forget progress reporting to a classroom server.
+
+report calls only append to an in-memory buffer under a lock, so the Tk thread
+never waits on the network. A daemon thread wakes every SEND_INTERVAL seconds,
+coalesces what was buffered (repeated views of the same lesson become one
+event with a count) and sends it as a single JSON line. If the server is
+unreachable the batch is kept and retried with backoff; once the buffer
+holds MAX_BUFFERED events the oldest are dropped rather than growing memory.
+"""
+import json
+import socket
+import threading
+import time
+
+SEND_INTERVAL = 1.0
+MAX_BACKOFF = 30.0
+MAX_BUFFERED = 10000
+CONNECT_TIMEOUT = 2.0
+
+
+def parse_address(address, default_port=8765):
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, default_port
+    return host, int(port)
+
+
+class ClassroomReporter:
+    """Buffers learner events and ships them from a background thread"""
+
+    def __init__(self, host, port, learner, send_interval=SEND_INTERVAL):
+        self.address = (host, port)
+        self.learner = learner
+        self.send_interval = send_interval
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._lesson_views = {}
+        self._events = []
+        self._sock = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='classroom-reporter', daemon=True)
+        self._thread.start()
+
+    # Called from the Tk thread; these never block on I/O
+
+    def lesson_viewed(self, key):
+        with self._lock:
+            count, _ = self._lesson_views.get(key, (0, 0))
+            self._lesson_views[key] = (count + 1, time.time())
+
+    def step_completed(self, scenario, step):
+        self._add({'type': 'step', 'scenario': scenario, 'step': step, 'at': time.time()})
+
+    def session_completed(self, scenario):
+        self._add({'type': 'completed', 'scenario': scenario, 'at': time.time()})
+
+    def _add(self, event):
+        with self._lock:
+            self._events.append(event)
+            overflow = len(self._events) - MAX_BUFFERED
+            if overflow > 0:
+                del self._events[:overflow]
+                self.dropped += overflow
+
+    def close(self, timeout=2.0):
+        """Try to send what is left, then stop the thread"""
+        self._stopping.set()
+        self._thread.join(timeout)
+
+    # Background thread
+
+    def _take_batch(self):
+        with self._lock:
+            views, self._lesson_views = self._lesson_views, {}
+            events, self._events = self._events, []
+        batch = [
+            {'type': 'lesson', 'key': key, 'count': count, 'at': at}
+            for key, (count, at) in views.items()
+        ]
+        batch.extend(events)
+        return batch
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._events[:0] = batch
+            overflow = len(self._events) - MAX_BUFFERED
+            if overflow > 0:
+                del self._events[:overflow]
+                self.dropped += overflow
+
+    def _send(self, batch):
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+        line = json.dumps({'learner': self.learner, 'events': batch}) + '\n'
+        self._sock.sendall(line.encode('utf-8'))
+
+    def _run(self):
+        delay = self.send_interval
+        while True:
+            stopping = self._stopping.wait(delay)
+            batch = self._take_batch()
+            if batch:
+                try:
+                    self._send(batch)
+                    delay = self.send_interval
+                except OSError:
+                    if self._sock is not None:
+                        self._sock.close()
+                        self._sock = None
+                    self._requeue(batch)
+                    delay = min(delay * 2, MAX_BACKOFF)
+            if stopping:
+                break
+        if self._sock is not None:
+            self._sock.close()
@@ -0,0 +1,358 @@
+"""Classroom progress server.
+
+Every app started with --classroom HOST:PORT reports lesson views and
+practice step completions here. Clients send newline-delimited JSON batches:
+
+    {"learner": "seat-12", "events": [
+        {"type": "lesson", "key": "shortcut_keys", "count": 2, "at": 1760000000.0},
+        {"type": "step", "scenario": "file_handling", "step": 3, "at": 1760000004.2},
+        {"type": "completed", "scenario": "file_handling", "at": 1760000031.9}
+    ]}
+
+The server never answers them, so a client never waits on it. Incoming
+events update an in-memory view of the class straight away and are queued
+for SQLite. A writer task drains the queue in batches, one executemany per
+transaction, on a worker thread with a connection from a small pool. A
+batch that fails to commit goes back on the queue and is retried with
+backoff; if the writer task ends anyway, the server stops.
+
+The live view is plain HTTP on a second port:
+
+    http://HOST:HTTP_PORT/                 auto-refreshing progress table
+    http://HOST:HTTP_PORT/progress.json    the same data as JSON
+    http://HOST:HTTP_PORT/summary.json     per-lesson and per-step totals from SQLite
+
+    python classroom_server.py --port 8765 --http-port 8766 --db classroom.sqlite3
+"""
+import argparse
+import asyncio
+import contextlib
+import html
+import json
+import logging
+import queue
+import sqlite3
+import sys
+import time
+
+DEFAULT_PORT = 8765
+DEFAULT_HTTP_PORT = 8766
+
+BATCH_SIZE = 500
+BATCH_INTERVAL = 0.5
+MAX_RETRY_INTERVAL = 30.0
+POOL_SIZE = 4
+MAX_LINE = 1 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    learner TEXT NOT NULL,
+    type TEXT NOT NULL,
+    lesson TEXT,
+    scenario TEXT,
+    step INTEGER,
+    count INTEGER NOT NULL DEFAULT 1,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_learner ON events (learner, at);
+"""
+
+INSERT = """
+INSERT INTO events (learner, type, lesson, scenario, step, count, at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+log = logging.getLogger('classroom_server')
+
+
+class ConnectionPool:
+    """A fixed set of SQLite connections shared by worker threads"""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self._idle = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False)
+            # WAL lets the live summary read while the writer commits
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._idle.put(conn)
+        self.size = size
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class LearnerState:
+    __slots__ = ('lesson', 'lessons_seen', 'scenario', 'step', 'completed', 'last_seen')
+
+    def __init__(self):
+        self.lesson = ''
+        self.lessons_seen = set()
+        self.scenario = ''
+        self.step = 0
+        self.completed = 0
+        self.last_seen = 0.0
+
+    def as_dict(self):
+        return {
+            'lesson': self.lesson,
+            'lessons_seen': len(self.lessons_seen),
+            'scenario': self.scenario,
+            'step': self.step,
+            'completed_sessions': self.completed,
+            'last_seen': self.last_seen
+        }
+
+
+class ClassroomServer:
+    """Collects client reports, keeps a live view and batches them into SQLite"""
+
+    def __init__(self, db_path, batch_size=BATCH_SIZE, batch_interval=BATCH_INTERVAL,
+                 pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.learners = {}
+        self.pending = []
+        self.events_received = 0
+        self.events_written = 0
+        self.write_errors = 0
+        self._wakeup = None
+        self._servers = []
+        self._writer = None
+
+    # Ingest
+
+    def ingest(self, learner, events):
+        state = self.learners.get(learner)
+        if state is None:
+            state = self.learners[learner] = LearnerState()
+        rows = self.pending
+        for event in events:
+            kind = event.get('type')
+            at = float(event.get('at') or time.time())
+            state.last_seen = max(state.last_seen, at)
+            if kind == 'lesson':
+                key = event.get('key', '')
+                state.lesson = key
+                state.lessons_seen.add(key)
+                rows.append((learner, kind, key, None, None, int(event.get('count', 1)), at))
+            elif kind == 'step':
+                state.scenario = event.get('scenario', '')
+                state.step = int(event.get('step', 0))
+                rows.append((learner, kind, None, state.scenario, state.step, 1, at))
+            elif kind == 'completed':
+                state.scenario = event.get('scenario', '')
+                state.completed += 1
+                rows.append((learner, kind, None, state.scenario, None, 1, at))
+            else:
+                continue
+            self.events_received += 1
+        if len(rows) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    break
+                try:
+                    batch = json.loads(line)
+                    self.ingest(str(batch['learner']), batch.get('events', ()))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Storage
+
+    def _write_rows(self, rows):
+        with self.pool.connection() as conn:
+            with conn:
+                conn.executemany(INSERT, rows)
+
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        retry = 0.0
+        while True:
+            if retry:
+                # Backing off after a failed write; full batches wait too
+                await asyncio.sleep(retry)
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.batch_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            try:
+                await self.flush(loop)
+            except sqlite3.Error as e:
+                retry = min(max(retry * 2, self.batch_interval), MAX_RETRY_INTERVAL)
+                log.warning("Could not store %d events (%s); retrying in %.1fs",
+                            len(self.pending), e, retry)
+            else:
+                retry = 0.0
+
+    async def flush(self, loop=None):
+        """Write the queued events; on a database error they stay queued"""
+        if not self.pending:
+            return
+        loop = loop or asyncio.get_running_loop()
+        rows, self.pending = self.pending, []
+        try:
+            await loop.run_in_executor(None, self._write_rows, rows)
+        except sqlite3.Error:
+            self.pending = rows + self.pending
+            self.write_errors += 1
+            raise
+        self.events_written += len(rows)
+
+    # Live view
+
+    def progress(self):
+        return {name: state.as_dict() for name, state in sorted(self.learners.items())}
+
+    def _summary(self):
+        with self.pool.connection() as conn:
+            lessons = conn.execute(
+                "SELECT lesson, COUNT(DISTINCT learner), SUM(count) FROM events "
+                "WHERE type = 'lesson' GROUP BY lesson ORDER BY lesson"
+            ).fetchall()
+            steps = conn.execute(
+                "SELECT scenario, step, COUNT(DISTINCT learner) FROM events "
+                "WHERE type = 'step' GROUP BY scenario, step ORDER BY scenario, step"
+            ).fetchall()
+        return {
+            'lessons': [{'lesson': l, 'learners': n, 'views': v} for l, n, v in lessons],
+            'steps': [{'scenario': s, 'step': st, 'learners': n} for s, st, n in steps]
+        }
+
+    def render_html(self):
+        now = time.time()
+        rows = []
+        for name, state in sorted(self.learners.items()):
+            ago = int(now - state.last_seen) if state.last_seen else '-'
+            rows.append(
+                "<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in (
+                    name, state.lesson, len(state.lessons_seen),
+                    state.scenario, state.step, state.completed, f"{ago}s"
+                )) + "</tr>"
+            )
+        return (
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            "<meta http-equiv='refresh' content='2'><title>Classroom progress</title>"
+            "<style>body{font-family:'Segoe UI',sans-serif}td,th{padding:4px 10px}"
+            "tr:nth-child(even){background:#e1f5fe}</style></head><body>"
+            f"<h1>Classroom progress</h1><p>{len(self.learners)} learners, "
+            f"{self.events_received} events received, {self.events_written} stored</p>"
+            "<table><tr><th>Learner</th><th>Lesson</th><th>Lessons seen</th>"
+            "<th>Practice</th><th>Step</th><th>Completed</th><th>Last seen</th></tr>"
+            + "".join(rows) + "</table></body></html>"
+        )
+
+    async def handle_http(self, reader, writer):
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+            path = request.split(b' ', 2)[1].decode('ascii', 'replace')
+            if path == '/progress.json':
+                body, ctype = json.dumps(self.progress()), 'application/json'
+            elif path == '/summary.json':
+                summary = await asyncio.get_running_loop().run_in_executor(None, self._summary)
+                body, ctype = json.dumps(summary), 'application/json'
+            elif path == '/':
+                body, ctype = self.render_html(), 'text/html; charset=utf-8'
+            else:
+                body, ctype = 'not found', 'text/plain'
+            data = body.encode('utf-8')
+            status = '404 Not Found' if body == 'not found' else '200 OK'
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode('ascii') + data
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, IndexError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    # Lifecycle
+
+    async def start(self, host='0.0.0.0', port=DEFAULT_PORT, http_port=DEFAULT_HTTP_PORT):
+        self._servers.append(await asyncio.start_server(
+            self.handle_client, host, port, limit=MAX_LINE))
+        if http_port is not None:
+            self._servers.append(await asyncio.start_server(self.handle_http, host, http_port))
+        self._writer = asyncio.create_task(self.write_loop())
+        return [s.sockets[0].getsockname()[1] for s in self._servers]
+
+    async def run(self):
+        """Wait while the server runs; the writer only ends on an error it cannot retry"""
+        await self._writer
+        raise RuntimeError("Classroom writer task ended")
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            log.error("Could not store the last %d events: %s", len(self.pending), e)
+        self.pool.close()
+
+
+async def serve(args):
+    server = ClassroomServer(args.db)
+    ports = await server.start(args.host, args.port, args.http_port)
+    print(f"Classroom server on {args.host}:{ports[0]}, live view at http://{args.host}:{ports[1]}/")
+    try:
+        await server.run()
+    except Exception:
+        log.exception("Classroom server stopped: events can no longer be stored")
+        raise
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect learner progress for a classroom")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--http-port', type=int, default=DEFAULT_HTTP_PORT)
+    parser.add_argument('--db', default='classroom.sqlite3')
+    args = parser.parse_args(argv)
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s')
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Opening files in the practice editor without freezing the window.
+
+Ordinary files are streamed into the Text widget by ChunkedLoader: it reads
+and decodes a chunk, inserts it, and yields back to the event loop through
+root.after whenever its time slice is used up, reporting progress as it
+goes. Inserting a multi-megabyte file in one call would block redraws and
+input for seconds.
+
+Files above LARGE_FILE_BYTES are not loaded at all. MappedFileView maps the
+file read-only and hands out one screenful of lines starting at a byte
+offset, so moving around a huge log costs the same as moving around a small
+one. Positions are byte offsets aligned to line starts, which avoids ever
+building a line index.
+"""
+import codecs
+import mmap
+import os
+import time
+
+CHUNK_BYTES = 64 * 1024
+SLICE_MS = 15
+LARGE_FILE_BYTES = 8 * 1024 * 1024
+MAX_WINDOW_BYTES = 256 * 1024
+
+
+class ChunkedLoader:
+    """Streams a text file into a Text widget from after() callbacks"""
+
+    def __init__(self, root, widget, path, on_progress, on_done,
+                 chunk_bytes=CHUNK_BYTES, slice_ms=SLICE_MS):
+        self.root = root
+        self.widget = widget
+        self.path = path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.chunk_bytes = chunk_bytes
+        self.slice_seconds = slice_ms / 1000
+        self.size = os.path.getsize(path)
+        self.loaded = 0
+        self.error = None
+        self._file = open(path, 'rb')
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._job = root.after_idle(self._step)
+
+    @property
+    def done(self):
+        return self._file is None
+
+    def _step(self):
+        self._job = None
+        deadline = time.perf_counter() + self.slice_seconds
+        try:
+            while True:
+                data = self._file.read(self.chunk_bytes)
+                text = self._decoder.decode(data, final=not data)
+                if text:
+                    self.widget.insert('end-1c', text)
+                self.loaded += len(data)
+                if not data:
+                    self._finish()
+                    return
+                if time.perf_counter() >= deadline:
+                    break
+        except (OSError, ValueError) as e:
+            self.error = e
+            self._finish()
+            return
+        self.on_progress(self.loaded * 100 / self.size if self.size else 100)
+        # A short delay rather than after_idle lets pending input and redraws in first
+        self._job = self.root.after(1, self._step)
+
+    def _finish(self):
+        self._file.close()
+        self._file = None
+        self.on_done(self)
+
+    def cancel(self):
+        """Stop loading; whatever was inserted so far stays"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MappedFileView:
+    """A movable window of lines over a memory-mapped file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self.size = len(self.map)
+        self.offset = 0
+        self.end = 0
+
+    def line_start(self, pos):
+        pos = min(max(pos, 0), self.size)
+        return self.map.rfind(b'\n', 0, pos) + 1 if pos else 0
+
+    def forward(self, lines):
+        """Move the window start down by up to lines lines"""
+        pos = self.offset
+        for _ in range(lines):
+            newline = self.map.find(b'\n', pos, self.size)
+            if newline < 0 or newline + 1 >= self.size:
+                break
+            pos = newline + 1
+        self.offset = pos
+
+    def backward(self, lines):
+        pos = self.offset
+        for _ in range(lines):
+            if pos == 0:
+                break
+            pos = self.map.rfind(b'\n', 0, pos - 1) + 1
+        self.offset = pos
+
+    def moveto(self, fraction):
+        self.offset = self.line_start(int(self.size * min(max(fraction, 0.0), 1.0)))
+
+    def window(self, lines):
+        """Text of up to lines lines from the window start
+
+        Near the end of the file the window start moves back so the view
+        stays full instead of scrolling into blank space.
+        """
+        count = self._measure(lines)
+        if count < lines and self.end >= self.size and self.offset:
+            self.backward(lines - count)
+            self._measure(lines)
+        data = self.map[self.offset:self.end]
+        return data.decode('utf-8', errors='replace').rstrip('\n')
+
+    def _measure(self, lines):
+        """Set the window end after up to lines lines; return how many fit"""
+        pos = self.offset
+        limit = min(self.size, self.offset + MAX_WINDOW_BYTES)
+        count = 0
+        while count < lines and pos < limit:
+            newline = self.map.find(b'\n', pos, limit)
+            pos = limit if newline < 0 else newline + 1
+            count += 1
+        self.end = pos
+        return count
+
+    def fraction(self):
+        """Visible span as scrollbar fractions"""
+        if not self.size:
+            return 0.0, 1.0
+        return self.offset / self.size, self.end / self.size
+
+    def close(self):
+        self.map.close()
+        self._file.close()
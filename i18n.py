@@ -0,0 +1,295 @@
+"""Localization catalogs for UI and practice strings.
+
+Translations are written as locales/<code>.json:
+
+    {
+      "language": "Español",
+      "messages": {"Save File (Ctrl+S)": "Guardar archivo (Ctrl+S)", ...}
+    }
+
+Message ids are the English strings themselves, so an untranslated string
+simply shows in English. On first use a locale is compiled to
+locales/<code>.lcat, a binary catalog that is memory-mapped instead of
+parsed: a lookup hashes the message id, bisects a sorted table of hashes and
+decodes just that one translation. Only the active locale is ever opened,
+and listing the installed locales only reads file names, so startup time
+and memory do not grow with the number of languages.
+
+Catalog layout (little-endian):
+
+    header   magic 'LCT1', version, entry count, language name length
+    name     UTF-8 language name
+    table    count x (crc32 of id, id offset, id length, text offset, text length),
+             sorted by hash
+    strings  UTF-8 ids and translations
+
+Lessons are translated separately, as lesson packs built from
+lessons/<code>/ (see lesson_pack.open_locale_pack).
+
+    python i18n.py build locales/es.json       compile one catalog
+    python i18n.py list locales/es.lcat        show a catalog's language and size
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tkinter as tk
+import zlib
+
+from save_pipeline import atomic_write
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+DEFAULT_LOCALE = 'en'
+DEFAULT_LANGUAGE = 'English'
+
+MAGIC = b'LCT1'
+VERSION = 1
+HEADER = struct.Struct('<4sHII')
+ENTRY = struct.Struct('<IIIII')
+
+
+class CatalogError(Exception):
+    pass
+
+
+def _hash(data):
+    return zlib.crc32(data)
+
+
+def compile_catalog(language, messages):
+    """Serialize {msgid: translation} into catalog bytes"""
+    name = language.encode('utf-8')
+    items = sorted(
+        ((msgid.encode('utf-8'), text.encode('utf-8')) for msgid, text in messages.items() if text),
+        key=lambda item: (_hash(item[0]), item[0])
+    )
+    base = HEADER.size + len(name) + ENTRY.size * len(items)
+    table = []
+    strings = []
+    offset = base
+    for key, text in items:
+        table.append(ENTRY.pack(_hash(key), offset, len(key), offset + len(key), len(text)))
+        strings.append(key)
+        strings.append(text)
+        offset += len(key) + len(text)
+    header = HEADER.pack(MAGIC, VERSION, len(items), len(name))
+    return b''.join([header, name] + table + strings)
+
+
+def catalog_path(source):
+    return os.path.splitext(source)[0] + '.lcat'
+
+
+def build_catalog(source, path=None):
+    """Compile a locale's JSON source, returning the catalog bytes"""
+    with open(source, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise CatalogError(f"{source}: {e}") from None
+    language = data.get('language') or os.path.splitext(os.path.basename(source))[0]
+    catalog = compile_catalog(language, data.get('messages', {}))
+    if path is not None:
+        atomic_write(path, catalog)
+    return catalog
+
+
+class Catalog:
+    """Read-only view of a compiled catalog, memory-mapped or in memory"""
+
+    def __init__(self, data, close=None):
+        self.data = data
+        self._close = close
+        if len(data) < HEADER.size:
+            raise CatalogError("truncated catalog")
+        magic, version, self.count, name_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise CatalogError("not a catalog, or an unsupported version")
+        self.language = bytes(data[HEADER.size:HEADER.size + name_len]).decode('utf-8')
+        self._table = HEADER.size + name_len
+        self._cache = {}
+
+    @classmethod
+    def open(cls, path):
+        f = open(path, 'rb')
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            raise
+
+        def close():
+            data.close()
+            f.close()
+        return cls(data, close)
+
+    def _hash_at(self, index):
+        return struct.unpack_from('<I', self.data, self._table + index * ENTRY.size)[0]
+
+    def lookup(self, msgid):
+        """The translation of msgid, or None"""
+        try:
+            return self._cache[msgid]
+        except KeyError:
+            pass
+        key = msgid.encode('utf-8')
+        wanted = _hash(key)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash_at(middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        text = None
+        data = self.data
+        for index in range(low, self.count):
+            entry_hash, key_at, key_len, text_at, text_len = ENTRY.unpack_from(
+                data, self._table + index * ENTRY.size)
+            if entry_hash != wanted:
+                break
+            if data[key_at:key_at + key_len] == key:
+                text = bytes(data[text_at:text_at + text_len]).decode('utf-8')
+                break
+        self._cache[msgid] = text
+        return text
+
+    def close(self):
+        self._cache.clear()
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+def catalog_is_stale(source, path):
+    try:
+        return os.path.getmtime(source) > os.path.getmtime(path)
+    except OSError:
+        return True
+
+
+def open_catalog(code, directory=LOCALE_DIR):
+    """Open a locale's catalog, compiling it first if its source changed"""
+    source = os.path.join(directory, code + '.json')
+    path = catalog_path(source)
+    if os.path.exists(source) and catalog_is_stale(source, path):
+        try:
+            build_catalog(source, path)
+        except OSError:
+            # Read-only install: use the freshly compiled catalog from memory
+            return Catalog(build_catalog(source))
+    return Catalog.open(path)
+
+
+def available_locales(directory=LOCALE_DIR):
+    """Installed locale codes, from file names only"""
+    codes = {DEFAULT_LOCALE}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for name in names:
+        code, ext = os.path.splitext(name)
+        if ext in ('.json', '.lcat'):
+            codes.add(code)
+    return sorted(codes)
+
+
+def language_name(code, directory=LOCALE_DIR):
+    """A locale's own name for itself, reading only the catalog header"""
+    if code == DEFAULT_LOCALE:
+        return DEFAULT_LANGUAGE
+    source = os.path.join(directory, code + '.json')
+    path = catalog_path(source)
+    try:
+        if os.path.exists(source) and catalog_is_stale(source, path):
+            build_catalog(source, path)
+        with open(path, 'rb') as f:
+            head = f.read(HEADER.size)
+            magic, version, count, name_len = HEADER.unpack(head)
+            if magic == MAGIC:
+                return f.read(name_len).decode('utf-8')
+    except (OSError, CatalogError, struct.error, UnicodeDecodeError):
+        pass
+    return code
+
+
+class Translator:
+    """Translates message ids with the active locale's catalog
+
+    Widgets whose text is a message id can be bound, and are relabelled
+    when the locale changes.
+    """
+
+    def __init__(self, code=DEFAULT_LOCALE, directory=LOCALE_DIR):
+        self.directory = directory
+        self.code = DEFAULT_LOCALE
+        self.catalog = None
+        self._bound = {}
+        self.set_locale(code)
+
+    def __call__(self, msgid):
+        if self.catalog is None:
+            return msgid
+        text = self.catalog.lookup(msgid)
+        return msgid if text is None else text
+
+    @property
+    def language(self):
+        return self.catalog.language if self.catalog is not None else DEFAULT_LANGUAGE
+
+    def set_locale(self, code):
+        """Switch to another locale, falling back to English if it is missing"""
+        catalog = None
+        if code != DEFAULT_LOCALE:
+            try:
+                catalog = open_catalog(code, self.directory)
+            except (OSError, ValueError, CatalogError):
+                code = DEFAULT_LOCALE
+        if self.catalog is not None:
+            self.catalog.close()
+        self.catalog = catalog
+        self.code = code
+        self.relabel()
+        return code
+
+    def available(self):
+        return available_locales(self.directory)
+
+    def language_name(self, code):
+        if code == self.code:
+            return self.language
+        return language_name(code, self.directory)
+
+    def bind(self, widget, msgid, option='text'):
+        """Show msgid translated in widget's option, now and after every switch"""
+        self._bound[str(widget), option] = (widget, msgid)
+        widget.configure(**{option: self(msgid)})
+
+    def relabel(self):
+        for key, (widget, msgid) in list(self._bound.items()):
+            try:
+                widget.configure(**{key[1]: self(msgid)})
+            except tk.TclError:
+                # Destroyed since it was bound
+                del self._bound[key]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 2 and argv[0] == 'build':
+        catalog = build_catalog(argv[1], catalog_path(argv[1]))
+        print(f"Wrote {Catalog(catalog).count} messages to {catalog_path(argv[1])}")
+    elif len(argv) == 2 and argv[0] == 'list':
+        catalog = Catalog.open(argv[1])
+        print(f"{catalog.language}: {catalog.count} messages")
+        catalog.close()
+    else:
+        print("usage: i18n.py build locales/CODE.json | list locales/CODE.lcat")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
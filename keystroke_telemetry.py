@@ -0,0 +1,221 @@
+"""Opt-in keystroke telemetry for the practice editor.
+
+Enabled with --telemetry. Every key press in the practice editor is stored
+as (perf_counter_ns timestamp, kind, code) in a preallocated ring of arrays,
+so recording a key allocates nothing and never touches the disk. The key
+binding is a raw Tcl script on its own bindtag that passes only the four
+fields we need, which skips building a tkinter Event for every key.
+
+Typing speed, corrections, pauses and shortcut use are updated as keys
+arrive. The ring is written out in batches from an idle callback a couple
+of seconds after typing starts, or sooner when it is half full. Batches
+are appended to a binary log:
+
+    magic 'KTB1', record count
+    timestamps  count x int64 (perf_counter_ns)
+    codes       count x uint32 (character or keysym number)
+    kinds       count x uint8
+
+benchmarks/bench_telemetry.py measures the per-keystroke cost.
+"""
+import struct
+import time
+from array import array
+
+KIND_CHAR = 1
+KIND_CORRECTION = 2
+KIND_SHORTCUT = 3
+KIND_OTHER = 4
+
+CAPACITY = 4096
+FLUSH_DELAY_MS = 2000
+PAUSE_NS = 2_000_000_000
+
+BINDTAG = 'KeyTelemetry'
+BATCH = struct.Struct('<4sI')
+BATCH_MAGIC = b'KTB1'
+
+CONTROL_MASK = 0x4
+CORRECTION_KEYSYMS = (0xFF08, 0xFFFF)  # BackSpace, Delete
+MODIFIER_KEYSYMS = range(0xFFE1, 0xFFEF)  # Shift, Control, Caps Lock, Alt, ...
+
+
+class KeystrokeTelemetry:
+    """Ring buffer of key events with running typing statistics
+
+    root may be None for headless use, in which case nothing is scheduled
+    and flush() must be called explicitly.
+    """
+
+    def __init__(self, root, path, capacity=CAPACITY, flush_delay_ms=FLUSH_DELAY_MS):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.root = root
+        self.path = path
+        self.capacity = capacity
+        self.flush_delay_ms = flush_delay_ms
+        self._mask = capacity - 1
+        self._times = array('q', bytes(8 * capacity))
+        self._codes = array('I', bytes(4 * capacity))
+        self._kinds = array('B', bytes(capacity))
+        self._head = 0
+        self._flushed = 0
+        self._flush_job = None
+        self.dropped = 0
+        self.reset_stats()
+
+    # Recording
+
+    def attach(self, widget):
+        """Record key presses in widget, ahead of its own bindings"""
+        command = widget.register(self.on_key)
+        widget.bind_class(BINDTAG, '<KeyPress>', f'{command} %N %s %K %A')
+        widget.bindtags((BINDTAG,) + widget.bindtags())
+
+    def on_key(self, keysym_num, state, keysym, char):
+        now = time.perf_counter_ns()
+        keysym_num = int(keysym_num)
+        if keysym_num in MODIFIER_KEYSYMS:
+            return
+        if int(state) & CONTROL_MASK:
+            kind = KIND_SHORTCUT
+            code = keysym_num
+            name = 'Ctrl+' + keysym.upper()
+            self.shortcuts[name] = self.shortcuts.get(name, 0) + 1
+        elif keysym_num in CORRECTION_KEYSYMS:
+            kind = KIND_CORRECTION
+            code = keysym_num
+            self.corrections += 1
+        elif len(char) == 1 and char.isprintable():
+            kind = KIND_CHAR
+            code = ord(char)
+            self.chars += 1
+        else:
+            kind = KIND_OTHER
+            code = keysym_num
+
+        gap = now - self._last_key
+        if gap < PAUSE_NS:
+            self.active_ns += gap
+        elif self._last_key:
+            self.pauses += 1
+        self._last_key = now
+        self.keys += 1
+
+        slot = self._head & self._mask
+        self._times[slot] = now
+        self._codes[slot] = code
+        self._kinds[slot] = kind
+        self._head += 1
+
+        if self._flush_job is None and self.root is not None:
+            self._flush_job = self.root.after(
+                self.flush_delay_ms,
+                lambda: self.root.after_idle(self.flush)
+            )
+        elif self._head - self._flushed == self.capacity // 2 and self.root is not None:
+            # Half full: write it out at the next idle moment instead of waiting
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = self.root.after_idle(self.flush)
+
+    # Statistics
+
+    def reset_stats(self):
+        """Start counting a new session; recorded events are kept"""
+        self.keys = 0
+        self.chars = 0
+        self.corrections = 0
+        self.pauses = 0
+        self.active_ns = 0
+        self.shortcuts = {}
+        self._last_key = 0
+
+    @property
+    def wpm(self):
+        """Words (five characters) per minute of active typing, pauses excluded"""
+        if not self.active_ns:
+            return 0.0
+        return (self.chars / 5) / (self.active_ns / 60e9)
+
+    @property
+    def correction_rate(self):
+        typed = self.chars + self.corrections
+        return self.corrections / typed if typed else 0.0
+
+    def stats(self):
+        return {
+            'keys': self.keys,
+            'chars': self.chars,
+            'corrections': self.corrections,
+            'correction_rate': self.correction_rate,
+            'pauses': self.pauses,
+            'active_seconds': self.active_ns / 1e9,
+            'wpm': self.wpm,
+            'shortcuts': dict(self.shortcuts)
+        }
+
+    def summary(self):
+        """One or two lines for the end-of-session message"""
+        lines = [f"⌨️ Typing: {self.wpm:.0f} WPM, {self.correction_rate:.0%} corrections, "
+                 f"{self.pauses} pauses"]
+        if self.shortcuts:
+            used = sorted(self.shortcuts.items(), key=lambda item: -item[1])
+            lines.append("Shortcuts used: " + ", ".join(f"{name} ×{n}" for name, n in used))
+        return '\n'.join(lines)
+
+    # Persistence
+
+    def _pending_slices(self):
+        count = self._head - self._flushed
+        if count > self.capacity:
+            self.dropped += count - self.capacity
+            self._flushed = self._head - self.capacity
+            count = self.capacity
+        start = self._flushed & self._mask
+        end = start + count
+        if end <= self.capacity:
+            return [(start, end)]
+        return [(start, self.capacity), (0, end - self.capacity)]
+
+    def flush(self):
+        """Append everything recorded since the last flush to the log"""
+        self._flush_job = None
+        count = self._head - self._flushed
+        if not count:
+            return
+        slices = self._pending_slices()
+        count = sum(end - start for start, end in slices)
+        parts = [BATCH.pack(BATCH_MAGIC, count)]
+        for column in (self._times, self._codes, self._kinds):
+            for start, end in slices:
+                parts.append(column[start:end].tobytes())
+        self._flushed = self._head
+        with open(self.path, 'ab') as f:
+            f.write(b''.join(parts))
+
+    def close(self):
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = None
+        self.flush()
+
+
+def read_log(path):
+    """Yield (timestamp_ns, kind, code) for every event in a telemetry log"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    offset = 0
+    while offset + BATCH.size <= len(data):
+        magic, count = BATCH.unpack_from(data, offset)
+        end = offset + BATCH.size + count * 13
+        if magic != BATCH_MAGIC or end > len(data):
+            # A batch cut short by a crash; earlier ones are complete
+            break
+        offset += BATCH.size
+        times = array('q', data[offset:offset + 8 * count])
+        offset += 8 * count
+        codes = array('I', data[offset:offset + 4 * count])
+        offset += 4 * count
+        kinds = array('B', data[offset:offset + count])
+        offset += count
+        yield from zip(times, kinds, codes)
@@ -0,0 +1,242 @@
+"""Opt-in memory and widget leak diagnostics.
+
+Kiosk instances run for days. Anything that creates a widget, a Tcl
+command, a binding or a text tag per lesson switch or theme toggle, and
+never frees it, shows up as slow memory growth. LeakMonitor counts those
+after each such operation:
+
+    widgets      live Tk widgets
+    commands     Tcl commands, including Python callbacks registered with Tk
+    bindings     event bindings on every bindtag in use, plus text tag bindings
+    bindtags     distinct bindtags in use
+    text_tags    tags in all Text widgets
+    images       Tk images
+    afters       pending after callbacks
+    objects      Python objects tracked by the garbage collector
+    traced_bytes memory allocated by Python, from tracemalloc
+
+The Tk counts come from one Tcl procedure that walks the widget tree, so a
+sample is a single call into Tcl. Every sample records how much each
+counter changed since the previous one. The change is charged to the
+operation that was just performed.
+
+Caches fill up at first and then stay level: the lesson view pool, font
+metrics and the search index. So a leak is only reported for a counter
+that is still rising after a warm-up. unbounded() splits the samples after
+the warm-up into thirds. A counter leaks when its lowest value in the last
+third is above its highest value in the first third, by more than its
+slack. A tracemalloc snapshot taken when the warm-up ends is compared with
+one taken at report time to show which source lines the memory went to.
+Samples go into preallocated arrays, so the monitor's own bookkeeping does
+not grow and cannot read as a leak.
+
+Diagnostics cost a tree walk and a gc scan per operation, so they only run
+with --leak-report.
+
+    python leak_monitor.py report leaks.json
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from array import array
+
+COUNTERS = ('widgets', 'commands', 'bindings', 'bindtags', 'text_tags', 'images', 'afters',
+            'objects', 'traced_bytes')
+# Growth between the first and last third that still counts as level
+SLACK = {'objects': 100, 'traced_bytes': 16 * 1024}
+WARMUP = 20
+MAX_SAMPLES = 5000
+TOP_LINES = 10
+TRACE_FRAMES = 4
+
+COUNT_SCRIPT = r'''
+proc ::leak_monitor_counts {} {
+    set widgets 0
+    set text_tags 0
+    set tag_bindings 0
+    set tags [dict create]
+    set queue [list .]
+    while {[llength $queue]} {
+        set w [lindex $queue end]
+        set queue [lreplace $queue end end]
+        incr widgets
+        foreach tag [bindtags $w] {
+            dict set tags $tag 1
+        }
+        if {[winfo class $w] eq "Text"} {
+            set names [$w tag names]
+            incr text_tags [llength $names]
+            foreach name $names {
+                incr tag_bindings [llength [$w tag bind $name]]
+            }
+        }
+        lappend queue {*}[winfo children $w]
+    }
+    set bindings $tag_bindings
+    foreach tag [dict keys $tags] {
+        incr bindings [llength [bind $tag]]
+    }
+    list $widgets [llength [info commands]] $bindings [dict size $tags] $text_tags \
+        [llength [image names]] [llength [after info]]
+}
+'''
+
+
+def _snapshot():
+    """A tracemalloc snapshot without the monitor's and tracemalloc's own allocations"""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__)
+    ])
+
+
+class LeakMonitor:
+    """Samples widget, Tcl and Python memory counters after each operation"""
+
+    def __init__(self, root, warmup=WARMUP, max_samples=MAX_SAMPLES):
+        self.root = root
+        self.warmup = warmup
+        self.started = time.time()
+        self.operations = {}
+        self.max_samples = max_samples
+        # Ring buffers of post-warm-up samples, one per counter
+        self.series = {name: array('q', bytes(8 * max_samples)) for name in COUNTERS}
+        self.stored = 0
+        self.previous = None
+        self.baseline_snapshot = None
+        self.sampled = 0
+        self._pending = set()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        root.tk.eval(COUNT_SCRIPT)
+
+    def counts(self):
+        values = self.root.tk.splitlist(self.root.tk.call('::leak_monitor_counts'))
+        counts = dict(zip(COUNTERS, (int(value) for value in values)))
+        counts['objects'] = len(gc.get_objects())
+        counts['traced_bytes'] = tracemalloc.get_traced_memory()[0]
+        return counts
+
+    def after(self, operation):
+        """Sample once the operation's idle work (redraws, deferred layout) is done"""
+        if operation not in self._pending:
+            self._pending.add(operation)
+            self.root.after_idle(self.sample, operation)
+
+    def sample(self, operation):
+        self._pending.discard(operation)
+        counts = self.counts()
+        entry = self.operations.setdefault(
+            operation, {'count': 0, 'growth': dict.fromkeys(COUNTERS, 0)})
+        entry['count'] += 1
+        if self.previous is not None:
+            growth = entry['growth']
+            for name in COUNTERS:
+                growth[name] += counts[name] - self.previous[name]
+        self.previous = counts
+        self.sampled += 1
+        if self.sampled > self.warmup:
+            slot = self.stored % self.max_samples
+            for name in COUNTERS:
+                self.series[name][slot] = counts[name]
+            self.stored += 1
+        elif self.sampled == self.warmup:
+            self.baseline_snapshot = _snapshot()
+        return counts
+
+    def history(self, name):
+        """A counter's post-warm-up samples, oldest first"""
+        values = self.series[name]
+        if self.stored <= self.max_samples:
+            return values[:self.stored]
+        start = self.stored % self.max_samples
+        return values[start:] + values[:start]
+
+    def unbounded(self):
+        """{counter: (first third max, last third min)} for counters still growing"""
+        third = min(self.stored, self.max_samples) // 3
+        if third == 0:
+            return {}
+        leaks = {}
+        for name in COUNTERS:
+            values = self.history(name)
+            high = max(values[:third])
+            low = min(values[-third:])
+            if low - high > SLACK.get(name, 0):
+                leaks[name] = (high, low)
+        return leaks
+
+    def top_growth(self, limit=TOP_LINES):
+        """Source lines whose allocations grew most since the warm-up ended"""
+        if self.baseline_snapshot is None:
+            return []
+        stats = _snapshot().compare_to(self.baseline_snapshot, 'lineno')
+        return [{'line': str(stat.traceback[0]), 'bytes': stat.size_diff, 'blocks': stat.count_diff}
+                for stat in stats[:limit] if stat.size_diff > 0]
+
+    def report(self):
+        operations = {}
+        for operation, entry in self.operations.items():
+            count = entry['count']
+            operations[operation] = {
+                'count': count,
+                'growth': entry['growth'],
+                'per_op': {name: round(total / count, 1) for name, total in entry['growth'].items()}
+            }
+        return {
+            'started': self.started,
+            'ended': time.time(),
+            'warmup': self.warmup,
+            'samples': self.sampled,
+            'counters': self.previous or {},
+            'operations': operations,
+            'unbounded': {name: {'first_third_max': high, 'last_third_min': low}
+                          for name, (high, low) in self.unbounded().items()},
+            'top_growth': self.top_growth()
+        }
+
+    def write(self, path):
+        report = json.dumps(self.report(), indent=1)
+        if path == '-':
+            print(report)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+
+
+def format_report(report):
+    minutes = (report['ended'] - report['started']) / 60
+    lines = [f"{report['samples']} samples over {minutes:.1f} min "
+             f"(first {report['warmup']} are warm-up)"]
+    lines.append(f"  {'operation':<16} {'count':>6}  growth per operation")
+    for operation, entry in report['operations'].items():
+        grown = ', '.join(f"{name} {value:+g}" for name, value in entry['per_op'].items() if value)
+        lines.append(f"  {operation:<16} {entry['count']:6}  {grown or 'none'}")
+    if report['unbounded']:
+        lines.append("Still growing after warm-up:")
+        for name, values in report['unbounded'].items():
+            lines.append(f"  {name}: {values['first_third_max']} -> {values['last_third_min']}")
+    else:
+        lines.append("No counter grows without bound.")
+    if report['top_growth']:
+        lines.append("Allocations grown most since warm-up:")
+        for stat in report['top_growth']:
+            lines.append(f"  {stat['bytes']:+10} B {stat['blocks']:+7} blocks  {stat['line']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 2 and argv[0] == 'report':
+        with open(argv[1], encoding='utf-8') as f:
+            report = json.load(f)
+        print(format_report(report))
+        return 1 if report['unbounded'] else 0
+    print("usage: leak_monitor.py report REPORT_JSON")
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
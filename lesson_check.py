@@ -0,0 +1,521 @@
+"""Lesson source validator.
+
+Checks lesson sources (see lesson_pack.py) for the mistakes that slip
+through when lessons are written by hand:
+
+    header      Windows line endings, no blank line after the header, bad
+                header lines, no title
+    shortcuts   shortcuts written loosely ("ctrl + c"), a shortcut listed
+                twice or with different meanings in one collection, and
+                translations whose shortcut table differs from the built-in
+                lesson with the same key
+    numbering   exercise steps that do not count 1, 2, 3..., a "Lesson N"
+                title that disagrees with the file's NN_ prefix, and two
+                lessons with the same number in one collection
+    wrap        headings that wrap in the 600 px lesson column, words too
+                long to wrap at all, and list items and tips that wrap
+                leaving one word on their last row
+    glyphs      characters Segoe UI cannot show in Tk: emoji sequences
+                (joiners, skin tones, flags), private-use, unassigned and
+                control code points, and emoji outside the set known to
+                render
+
+Widths are estimated from approximate Segoe UI advance widths rather than
+measured with Tk, so checking needs no display and runs in worker
+processes. The fonts and margins per line kind mirror
+configure_lesson_tags() in the app.
+
+Each file is checked on its own in a process pool. Results are cached by
+a hash of the file's bytes, so only new or changed lessons are checked
+again. The checks that compare lessons run afterwards in the main process,
+over the facts (shortcut table, "Lesson N" number) each check returns.
+
+    python lesson_check.py lessons
+    python lesson_check.py --jobs 8 --report report.json path/to/lessons
+
+The exit status is 1 if any error was found (or any warning, with --strict).
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from app_paths import state_path
+from lesson_markup import classify_line
+from lesson_pack import LESSONS_DIR, lesson_key
+from save_pipeline import atomic_write
+
+# Bump whenever a check changes, so cached results are thrown away
+RULES_VERSION = 2
+
+ERROR = 'error'
+WARNING = 'warning'
+
+WRAP_PX = 600
+DPI = 96
+BOLD = 1.07
+
+# (points, bold, first row margin, wrapped row margin) per markup tag,
+# as set up by configure_lesson_tags; None is plain text
+TAG_FONTS = {
+    None: (13, False, 0, 0),
+    'title': (18, True, 0, 0),
+    'heading': (14, True, 0, 0),
+    'subheading': (13, True, 0, 0),
+    'tip': (13, False, 10, 0),
+    'bullet': (13, False, 10, 26),
+    'exercise': (13, False, 10, 30)
+}
+HEADINGS = ('title', 'heading', 'subheading')
+ITEMS = ('bullet', 'exercise', 'tip')
+
+# Approximate Segoe UI advance widths in thousandths of an em
+ADVANCE = {}
+for _chars, _width in (
+        (" ", 274), ("ilj|'!.,:;", 240), ("I`", 260), ("ft()[]{}", 330),
+        ("r-", 360), ("sz\"/\\", 450), ("cvxykJ*", 490), ("aeL?_", 540),
+        ("0123456789$<>=+~^", 560), ("ETFSZ#", 570), ("bdghnopqu&", 600),
+        ("BCKPRXY", 610), ("ADGHNOQUV", 690), ("w", 760), ("m%@", 880),
+        ("M", 860), ("W", 930)):
+    for _char in _chars:
+        ADVANCE[_char] = _width
+DEFAULT_ADVANCE = 600
+WIDE_ADVANCE = 1000
+EMOJI_ADVANCE = 1250
+
+# Emoji the lessons and the app already use, seen to render with Segoe UI.
+# Others may show as an empty box, so they are reported until added here.
+KNOWN_EMOJI = frozenset('🔹📝💡📖🖱❓📁❌✅🌐🆘📊🛠☀🔍⏱📄📂🌟🚪💻🌙🎉⌛⌨')
+VARIATION_SELECTOR = '️'
+
+
+def _sequence_part(code):
+    # Code points that only make sense combined into one emoji, which Tk
+    # cannot do: joiners, keycaps, skin tones, flag letters and tag characters
+    return (code in (0x200d, 0x20e3) or 0x1f3fb <= code <= 0x1f3ff or
+            0x1f1e6 <= code <= 0x1f1ff or 0xe0020 <= code <= 0xe007f)
+
+
+SHORTCUT_ITEM = re.compile(
+    r'^\s*•\s*((?:(?:ctrl|alt|shift|win)\s*\+\s*)+[^\s:]+)\s*:\s*(.+?)\s*$', re.I)
+MODIFIERS = {'ctrl': 'Ctrl', 'alt': 'Alt', 'shift': 'Shift', 'win': 'Win'}
+LESSON_NUMBER = re.compile(r'(\d+)\s*$')
+NOTABLE = re.compile('[\x00-\x08\x0b-\x1f\x7f\u2000-\U0010ffff]')
+
+PARALLEL_MIN = 256
+MAX_CHUNK = 64
+MAX_CACHE_ENTRIES = 200000
+MAX_CACHED_WORDS = 100000
+
+
+def canonical_shortcut(written):
+    """'Ctrl+Shift+Esc' for 'ctrl + shift + esc'"""
+    parts = [part.strip() for part in written.split('+')]
+    key = parts[-1]
+    key = key.upper() if len(key) == 1 else key[:1].upper() + key[1:]
+    return '+'.join([MODIFIERS[part.lower()] for part in parts[:-1]] + [key])
+
+
+@lru_cache(maxsize=4096)
+def char_advance(char):
+    width = ADVANCE.get(char)
+    if width is not None:
+        return width
+    if unicodedata.combining(char) or char == VARIATION_SELECTOR:
+        return 0
+    if ord(char) > 0xffff or unicodedata.category(char) == 'So':
+        return EMOJI_ADVANCE
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return WIDE_ADVANCE
+    base = unicodedata.normalize('NFD', char)[0]
+    return ADVANCE.get(base, DEFAULT_ADVANCE)
+
+
+_word_advances = {}
+
+
+def word_advance(word):
+    """Width of a word in thousandths of an em; words repeat a lot, so cached"""
+    width = _word_advances.get(word)
+    if width is None:
+        width = sum(map(char_advance, word))
+        if len(_word_advances) < MAX_CACHED_WORDS:
+            _word_advances[word] = width
+    return width
+
+
+def em_px(points, bold=False):
+    """Pixels per thousandth of an em"""
+    return points * DPI / 72 * (BOLD if bold else 1) / 1000
+
+
+def text_width(text, points, bold=False):
+    """Estimated width of text in pixels"""
+    return sum(map(char_advance, text)) * em_px(points, bold)
+
+
+def wrap_rows(widths, space, first, rest):
+    """Greedy word wrap of word widths as Tk does it: (rows, words on the last row)"""
+    rows, x, last, available = 1, 0, 0, first
+    for width in widths:
+        if x and x + space + width > available:
+            rows += 1
+            available = rest
+            x, last = width, 1
+        else:
+            x += (space if x else 0) + width
+            last += 1
+    return rows, last
+
+
+# Checks on one lesson
+
+def check_header(content, issues):
+    """The lesson text and the file line it starts on, or (None, 0)"""
+    if '\r' in content:
+        issues.append([1, ERROR, 'header', "Windows (CRLF) line endings; save with LF"])
+        return None, 0
+    header, sep, text = content.partition('\n\n')
+    if not sep:
+        issues.append([1, ERROR, 'header', "no blank line after the header"])
+        return None, 0
+    fields = {}
+    for number, line in enumerate(header.split('\n'), 1):
+        field, colon, value = line.partition(':')
+        if not colon:
+            issues.append([number, ERROR, 'header', f"bad header line {line!r}"])
+        else:
+            fields[field.strip().lower()] = value.strip()
+    if not fields.get('title'):
+        issues.append([1, WARNING, 'header', "no title; the file name will be shown"])
+    return text, header.count('\n') + 3
+
+
+def check_glyphs(line, number, issues):
+    # Only control characters and those from U+2000 on can be a problem
+    for char in dict.fromkeys(NOTABLE.findall(line)):
+        code = ord(char)
+        if code < 0x80:
+            problem = (ERROR, "control character")
+        elif char in KNOWN_EMOJI:
+            continue
+        elif _sequence_part(code):
+            problem = (ERROR, "part of an emoji sequence, which Tk shows as separate boxes")
+        elif unicodedata.category(char) in ('Co', 'Cn', 'Cs'):
+            problem = (ERROR, "unassigned or private-use character")
+        elif code > 0xffff:
+            problem = (WARNING, "emoji not known to render with Segoe UI")
+        else:
+            continue
+        severity, message = problem
+        issues.append([number, severity, 'glyphs', f"U+{code:04X} {char!r}: {message}"])
+
+
+def check_wrap(line, tag, number, issues):
+    points, bold, first_margin, rest_margin = TAG_FONTS[tag]
+    scale = em_px(points, bold)
+    # Widths in thousandths of an em from here on
+    first, rest = (WRAP_PX - first_margin) / scale, (WRAP_PX - rest_margin) / scale
+    words = line.split()
+    widths = [word_advance(word) for word in words]
+    space = ADVANCE[' ']
+    if sum(widths) + space * (len(words) - 1) <= min(first, rest):
+        return
+    for word, width in zip(words, widths):
+        if width > min(first, rest):
+            issues.append([number, ERROR, 'wrap',
+                           f"{word[:30]!r} is wider than the {WRAP_PX} px column "
+                           "and will be split mid-word"])
+            return
+    rows, last = wrap_rows(widths, space, first, rest)
+    if rows == 1:
+        return
+    if tag in HEADINGS:
+        issues.append([number, WARNING, 'wrap',
+                       f"{tag} wraps onto {rows} lines at {WRAP_PX} px; shorten it"])
+    elif last == 1 and tag in ITEMS:
+        issues.append([number, WARNING, 'wrap',
+                       f"wraps at {WRAP_PX} px leaving {words[-1]!r} alone on the last line"])
+
+
+def check_lesson(data):
+    """Check one lesson source (bytes); returns plain data, safe to cache
+
+    Nothing here depends on the file's name, so results can be shared by
+    identical files and reused after a rename.
+    """
+    issues = []
+    result = {'issues': issues, 'shortcuts': {}, 'lesson_number': None}
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        issues.append([data.count(b'\n', 0, e.start) + 1, ERROR, 'header', "not valid UTF-8"])
+        return result
+    text, first_line = check_header(content, issues)
+    if text is None:
+        return result
+
+    shortcuts = result['shortcuts']
+    seen_text = False
+    expected_step = None
+    for number, line in enumerate(text.split('\n'), first_line):
+        tag = classify_line(line, not seen_text)
+        if not line.strip():
+            continue
+        if tag == 'title':
+            match = LESSON_NUMBER.search(line)
+            result['lesson_number'] = int(match.group(1)) if match else None
+        seen_text = True
+
+        check_glyphs(line, number, issues)
+        check_wrap(line, tag, number, issues)
+
+        if tag == 'exercise':
+            step = int(line.strip().partition('. ')[0])
+            if step != (expected_step or 1):
+                issues.append([number, ERROR, 'numbering',
+                               f"step numbered {step}, expected {expected_step or 1}"])
+            expected_step = step + 1
+        else:
+            expected_step = None
+
+        match = SHORTCUT_ITEM.match(line)
+        if match:
+            written, meaning = match.groups()
+            name = canonical_shortcut(written)
+            if written != name:
+                issues.append([number, WARNING, 'shortcuts', f"write {written!r} as {name!r}"])
+            if name in shortcuts:
+                issues.append([number, ERROR, 'shortcuts',
+                               f"{name} is already listed on line {shortcuts[name][0]}"])
+            else:
+                shortcuts[name] = [number, meaning]
+    return result
+
+
+def check_chunk(chunk):
+    return [(digest, check_lesson(data)) for digest, data in chunk]
+
+
+# Checks across lessons
+
+def check_collections(results):
+    """Issues between lessons, as {path: [issue, ...]}
+
+    Files in one directory form a collection. A collection next to a
+    'builtin' one is a translation of it and must teach the same shortcuts
+    in its lessons of the same keys.
+    """
+    found = {}
+    collections = {}
+    for path in results:
+        collections.setdefault(os.path.dirname(path), []).append(path)
+
+    def add(path, line, severity, check, message):
+        found.setdefault(path, []).append([line, severity, check, message])
+
+    for folder, paths in collections.items():
+        numbers = {}
+        meanings = {}
+        for path in sorted(paths):
+            result = results[path]
+            prefix = os.path.basename(path).partition('_')[0]
+            if prefix.isdigit():
+                number = int(prefix)
+                if number in numbers:
+                    add(path, 1, WARNING, 'numbering', f"lesson number {prefix} is also used by "
+                        f"{os.path.basename(numbers[number])}")
+                else:
+                    numbers[number] = path
+                titled = result['lesson_number']
+                if titled is not None and titled != number:
+                    add(path, 1, WARNING, 'numbering',
+                        f"title says lesson {titled} but the file is numbered {prefix}")
+            for name, (line, meaning) in result['shortcuts'].items():
+                first = meanings.setdefault(name, (path, meaning))
+                if first[1].casefold() != meaning.casefold():
+                    add(path, line, WARNING, 'shortcuts', f"{name} means {meaning!r} here but "
+                        f"{first[1]!r} in {os.path.basename(first[0])}")
+
+        reference = os.path.join(os.path.dirname(folder), 'builtin')
+        if reference == folder or reference not in collections:
+            continue
+        builtin = {lesson_key(path): results[path] for path in collections[reference]}
+        for path in paths:
+            original = builtin.get(lesson_key(path))
+            if original is None:
+                add(path, 1, WARNING, 'shortcuts',
+                    f"no built-in lesson {lesson_key(path)!r} to translate")
+                continue
+            ours = results[path]['shortcuts']
+            missing = [name for name in original['shortcuts'] if name not in ours]
+            if missing:
+                add(path, 1, ERROR, 'shortcuts',
+                    f"built-in lesson lists {', '.join(missing)}, missing here")
+            for name, (line, _) in ours.items():
+                if name not in original['shortcuts']:
+                    add(path, line, ERROR, 'shortcuts', f"{name} is not in the built-in lesson")
+    return found
+
+
+class ResultCache:
+    """Check results by content hash, kept in a JSON file between runs"""
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        self.used = set()
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('rules') == RULES_VERSION and data.get('wrap_px') == WRAP_PX:
+                self.results = data['results']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def get(self, digest):
+        result = self.results.get(digest)
+        if result is not None:
+            self.used.add(digest)
+        return result
+
+    def put(self, digest, result):
+        self.results[digest] = result
+        self.used.add(digest)
+
+    def save(self):
+        # Results for files seen in this run are always kept
+        results = self.results
+        if len(results) > MAX_CACHE_ENTRIES:
+            results = {d: r for d, r in results.items() if d in self.used}
+        atomic_write(self.path, json.dumps(
+            {'rules': RULES_VERSION, 'wrap_px': WRAP_PX, 'results': results},
+            ensure_ascii=False, separators=(',', ':')))
+
+
+def lesson_files(paths):
+    """Every .txt source under the given files and directories"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for folder, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                if name.endswith('.txt'):
+                    yield os.path.join(folder, name)
+
+
+def validate(paths, jobs=None, cache=None):
+    """Check lesson files; returns (results by path, run statistics)
+
+    A result is {'issues': [[line, severity, check, message], ...], ...}.
+    """
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    todo = {}
+    waiting = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        result = cache.get(digest) if cache is not None else None
+        if result is not None:
+            results[path] = result
+        else:
+            todo[digest] = data
+            waiting.setdefault(digest, []).append(path)
+
+    work = list(todo.items())
+    if jobs > 1 and len(work) >= PARALLEL_MIN:
+        size = min(MAX_CHUNK, -(-len(work) // (jobs * 4)))
+        chunks = [work[i:i + size] for i in range(0, len(work), size)]
+        with ProcessPoolExecutor(jobs) as pool:
+            checked = [pair for part in pool.map(check_chunk, chunks) for pair in part]
+    else:
+        jobs = 1
+        checked = check_chunk(work)
+
+    for digest, result in checked:
+        if cache is not None:
+            cache.put(digest, result)
+        for path in waiting[digest]:
+            results[path] = result
+
+    merged = {}
+    extra = check_collections(results)
+    for path, result in results.items():
+        issues = result['issues'] + extra.get(path, [])
+        merged[path] = dict(result, issues=sorted(issues, key=lambda issue: issue[0]))
+    stats = {
+        'files': len(results),
+        'checked': len(work),
+        'cached': len(results) - sum(len(waiting[d]) for d in todo),
+        'jobs': jobs,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    return merged, stats
+
+
+def report(results, stats):
+    """The machine-readable report: run statistics plus every issue"""
+    issues = [
+        {'file': path, 'line': line, 'severity': severity, 'check': check, 'message': message}
+        for path in sorted(results)
+        for line, severity, check, message in results[path]['issues']
+    ]
+    return dict(stats,
+                rules=RULES_VERSION,
+                errors=sum(issue['severity'] == ERROR for issue in issues),
+                warnings=sum(issue['severity'] == WARNING for issue in issues),
+                issues=issues)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check lesson sources for authoring mistakes")
+    parser.add_argument('paths', nargs='*', default=[LESSONS_DIR],
+                        help="lesson files or directories of them (default: lessons/)")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--report', metavar='FILE', help="write a JSON report to FILE, or - for stdout")
+    parser.add_argument('--cache', metavar='FILE', help="result cache (default: in the state directory)")
+    parser.add_argument('--no-cache', action='store_true', help="check every file again")
+    parser.add_argument('--strict', action='store_true', help="fail on warnings too")
+    parser.add_argument('-q', '--quiet', action='store_true', help="print only the summary")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache or state_path('lesson_check.json'))
+    results, stats = validate(list(lesson_files(args.paths)), jobs=args.jobs, cache=cache)
+    if cache is not None:
+        cache.save()
+
+    summary = report(results, stats)
+    if args.report == '-':
+        print(json.dumps(summary, indent=1, ensure_ascii=False))
+    else:
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=1, ensure_ascii=False)
+                f.write('\n')
+        if not args.quiet:
+            for issue in summary['issues']:
+                print(f"{issue['file']}:{issue['line']}: {issue['severity']}: "
+                      f"{issue['message']} [{issue['check']}]")
+        print(f"{stats['files']} lessons ({stats['cached']} cached) checked in "
+              f"{stats['seconds']:.2f}s with {stats['jobs']} process(es): "
+              f"{summary['errors']} errors, {summary['warnings']} warnings",
+              file=sys.stderr if args.report == '-' else sys.stdout)
+    failed = summary['errors'] or (args.strict and summary['warnings'])
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
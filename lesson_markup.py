@@ -0,0 +1,94 @@
+"""Lesson markup compiler.
+
+Lessons are plain text with a few conventions:
+
+    first line              lesson title
+    === SECTION ===         heading
+    🔹 Practice Exercises:   subheading (symbol-led line ending in a colon)
+    💡 ...                  tip
+    • item / - item         bullet
+    1. step                 exercise / numbered step
+
+compile_lesson() parses a lesson once into a CompiledLesson: the text to insert
+plus, for each tag, the line ranges it covers. Consecutive lines with the same
+tag are merged into one run, so rendering costs one insert and one tag_add per
+tag regardless of how many lines the lesson has.
+
+Ranges are whole lines ("N.0" to "N+1.0"), which keeps them valid however Tk
+counts emoji and other wide characters within a line.
+"""
+from functools import lru_cache
+
+TAGS = ('title', 'heading', 'subheading', 'tip', 'bullet', 'exercise')
+
+TIP_MARKERS = ('💡',)
+BULLET_MARKERS = ('•', '- ')
+
+
+class CompiledLesson:
+    """Lesson text plus {tag: [start, end, start, end, ...]} Text indices"""
+
+    __slots__ = ('text', 'runs', 'line_count')
+
+    def __init__(self, text, runs, line_count):
+        self.text = text
+        self.runs = runs
+        self.line_count = line_count
+
+    def run_count(self):
+        return sum(len(ranges) // 2 for ranges in self.runs.values())
+
+
+def classify_line(line, is_first):
+    stripped = line.strip()
+    if not stripped:
+        return None
+    if is_first:
+        return 'title'
+    if stripped.startswith('===') and stripped.endswith('==='):
+        return 'heading'
+    if stripped.startswith(TIP_MARKERS):
+        return 'tip'
+    if stripped.startswith(BULLET_MARKERS):
+        return 'bullet'
+    number, dot, rest = stripped.partition('. ')
+    if dot and number.isdigit() and rest:
+        return 'exercise'
+    if not stripped[0].isalnum() and stripped.endswith(':'):
+        return 'subheading'
+    return None
+
+
+@lru_cache(maxsize=64)
+def compile_lesson(text):
+    """Parse lesson text into a cached CompiledLesson"""
+    runs = {}
+    run_tag = None
+    run_start = 0
+    seen_text = False
+    lines = text.split('\n')
+
+    for number, line in enumerate(lines, 1):
+        tag = classify_line(line, not seen_text)
+        if line.strip():
+            seen_text = True
+        if tag != run_tag:
+            if run_tag is not None:
+                runs.setdefault(run_tag, []).extend((f'{run_start}.0', f'{number}.0'))
+            run_tag = tag
+            run_start = number
+    if run_tag is not None:
+        runs.setdefault(run_tag, []).extend((f'{run_start}.0', f'{len(lines) + 1}.0'))
+
+    return CompiledLesson(text, runs, len(lines))
+
+
+def render(text_widget, compiled):
+    """Replace a read-only Text widget's content with a compiled lesson"""
+    text_widget.config(state='normal')
+    text_widget.delete('1.0', 'end')
+    text_widget.insert('end', compiled.text)
+    for tag, ranges in compiled.runs.items():
+        text_widget.tag_add(tag, *ranges)
+    text_widget.config(state='disabled')
+    text_widget.yview_moveto(0)
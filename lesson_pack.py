@@ -0,0 +1,323 @@
+"""Lesson pack archives.
+
+A lesson pack is a single file holding many compressed lessons:
+
+    header   magic, version, lesson count, offset of the index
+    blobs    one zlib-compressed UTF-8 body per lesson
+    index    per lesson: blob offset, compressed and raw size, key, title, topic
+
+Packs are opened with mmap, so opening a pack only reads the header and the
+index. A lesson body is decompressed the first time it is asked for and kept
+in a small LRU cache afterwards.
+
+Packs are built from a directory of ``NN_key.txt`` source files. Each source
+starts with ``name: value`` header lines (``title`` and ``topic``), then a
+blank line, then the lesson text.
+
+    python lesson_pack.py build lessons/builtin lessons/builtin.lpk
+    python lesson_pack.py list lessons/builtin.lpk
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections import OrderedDict
+
+from app_paths import state_path
+
+MAGIC = b'LPK1'
+VERSION = 1
+
+# magic, version, flags, lesson count, index offset
+HEADER = struct.Struct('<4sHHIQ')
+# blob offset, compressed size, raw size, key/title/topic byte lengths
+INDEX_ENTRY = struct.Struct('<QIIHHH')
+
+LESSONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lessons')
+BUILTIN_SOURCE = os.path.join(LESSONS_DIR, 'builtin')
+BUILTIN_PACK = os.path.join(LESSONS_DIR, 'builtin.lpk')
+
+DEFAULT_CACHE_SIZE = 16
+
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+PACK_MODE = 0o666 & ~_UMASK
+
+
+class LessonPackError(Exception):
+    """Raised when a lesson pack is missing, corrupt or has an unknown key"""
+
+
+class LessonEntry:
+    """Index record for one lesson in a pack"""
+
+    __slots__ = ('key', 'title', 'topic', 'offset', 'size', 'raw_size')
+
+    def __init__(self, key, title, topic, offset, size, raw_size):
+        self.key = key
+        self.title = title
+        self.topic = topic
+        self.offset = offset
+        self.size = size
+        self.raw_size = raw_size
+
+    def __repr__(self):
+        return f"LessonEntry({self.key!r}, {self.title!r})"
+
+
+class LessonPack:
+    """Read-only, memory-mapped view of a lesson pack file"""
+
+    def __init__(self, path, cache_size=DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._fingerprint = None
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise LessonPackError(f"Empty lesson pack: {path}")
+        try:
+            self.entries = self._read_index()
+        except Exception:
+            self.close()
+            raise
+        self._by_key = {entry.key: entry for entry in self.entries}
+
+    def _read_index(self):
+        if len(self._map) < HEADER.size:
+            raise LessonPackError(f"Truncated lesson pack: {self.path}")
+        magic, version, _flags, count, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise LessonPackError(f"Not a lesson pack: {self.path}")
+        if version != VERSION:
+            raise LessonPackError(f"Unsupported lesson pack version {version}: {self.path}")
+
+        entries = []
+        pos = index_offset
+        try:
+            for _ in range(count):
+                offset, size, raw_size, key_len, title_len, topic_len = \
+                    INDEX_ENTRY.unpack_from(self._map, pos)
+                pos += INDEX_ENTRY.size
+                key = self._map[pos:pos + key_len].decode('utf-8')
+                pos += key_len
+                title = self._map[pos:pos + title_len].decode('utf-8')
+                pos += title_len
+                topic = self._map[pos:pos + topic_len].decode('utf-8')
+                pos += topic_len
+                if pos > len(self._map) or offset + size > index_offset:
+                    raise LessonPackError(f"Truncated lesson pack: {self.path}")
+                entries.append(LessonEntry(key, title, topic, offset, size, raw_size))
+        except (struct.error, UnicodeDecodeError) as e:
+            raise LessonPackError(f"Corrupt lesson pack index in {self.path}: {e}") from None
+        return entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def entry(self, key):
+        try:
+            return self._by_key[key]
+        except KeyError:
+            raise LessonPackError(f"No lesson {key!r} in {self.path}") from None
+
+    def read(self, key):
+        """Return the text of a lesson, decoding it on first use"""
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        entry = self.entry(key)
+        blob = self._map[entry.offset:entry.offset + entry.size]
+        try:
+            text = zlib.decompress(blob).decode('utf-8')
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise LessonPackError(f"Corrupt lesson {key!r} in {self.path}: {e}") from None
+
+        cache[key] = text
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return text
+
+    def fingerprint(self):
+        """Hex digest of the pack contents, used to tell when derived data is stale"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha1(self._map).hexdigest()
+        return self._fingerprint
+
+    def close(self):
+        self._cache.clear()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def lesson_key(path):
+    """'shortcut_keys' for a source file named 04_shortcut_keys.txt"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    prefix, _, rest = name.partition('_')
+    return rest if prefix.isdigit() and rest else name
+
+
+def parse_source(path):
+    """Read a lesson source file and return (key, title, topic, text)"""
+    key = lesson_key(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    meta = {}
+    header, sep, text = content.partition('\n\n')
+    if not sep:
+        raise LessonPackError(f"Missing blank line after header in {path}")
+    for line in header.splitlines():
+        field, colon, value = line.partition(':')
+        if not colon:
+            raise LessonPackError(f"Bad header line {line!r} in {path}")
+        meta[field.strip().lower()] = value.strip()
+
+    return key, meta.get('title', key), meta.get('topic', ''), text
+
+
+def source_files(source_dir):
+    return sorted(
+        os.path.join(source_dir, name)
+        for name in os.listdir(source_dir)
+        if name.endswith('.txt')
+    )
+
+
+def write_pack(path, lessons, level=9):
+    """Write (key, title, topic, text) tuples to a pack file at path
+
+    The pack goes to a unique temp file next to path and is renamed over it,
+    so two processes building the same pack cannot mix their output.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix='.' + os.path.basename(path) + '.',
+        suffix='.tmp'
+    )
+    try:
+        index = []
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+            for key, title, topic, text in lessons:
+                raw = text.encode('utf-8')
+                blob = zlib.compress(raw, level)
+                index.append((f.tell(), len(blob), len(raw), key, title, topic))
+                f.write(blob)
+
+            index_offset = f.tell()
+            for offset, size, raw_size, key, title, topic in index:
+                key_b, title_b, topic_b = (s.encode('utf-8') for s in (key, title, topic))
+                f.write(INDEX_ENTRY.pack(offset, size, raw_size,
+                                         len(key_b), len(title_b), len(topic_b)))
+                f.write(key_b + title_b + topic_b)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(index), index_offset))
+        # mkstemp creates the file owner-only; packs are shared like any other file
+        os.chmod(tmp_path, PACK_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def build_pack(source_dir, path):
+    """Compile every lesson source in source_dir into a pack at path"""
+    lessons = [parse_source(p) for p in source_files(source_dir)]
+    write_pack(path, lessons)
+    return len(lessons)
+
+
+def pack_is_stale(source_dir, path):
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        return True
+    newest = max([os.path.getmtime(source_dir)] +
+                 [os.path.getmtime(p) for p in source_files(source_dir)])
+    return newest > built
+
+
+def open_built_pack(source_dir, path, cache_size=DEFAULT_CACHE_SIZE):
+    """Open the pack built from source_dir at path, rebuilding it if stale or corrupt
+
+    A read-only install cannot be rebuilt in place, so the fresh pack goes to
+    the per-user cache in the state directory instead.
+    """
+    if not os.path.isdir(source_dir):
+        return LessonPack(path, cache_size=cache_size)
+    if not pack_is_stale(source_dir, path):
+        try:
+            return LessonPack(path, cache_size=cache_size)
+        except LessonPackError:
+            pass
+    try:
+        build_pack(source_dir, path)
+    except OSError:
+        path = state_path('lessons', os.path.basename(path))
+        if pack_is_stale(source_dir, path):
+            build_pack(source_dir, path)
+    return LessonPack(path, cache_size=cache_size)
+
+
+def open_builtin_pack(cache_size=DEFAULT_CACHE_SIZE):
+    """Open the built-in pack, rebuilding it first if its sources changed"""
+    return open_built_pack(BUILTIN_SOURCE, BUILTIN_PACK, cache_size)
+
+
+def open_locale_pack(locale, cache_size=DEFAULT_CACHE_SIZE):
+    """Open the lessons translated for a locale, or the built-in ones if there are none
+
+    Translations live in lessons/<locale>/ with the same file names as
+    lessons/builtin/, so lesson keys are the same in every language.
+    """
+    source = os.path.join(LESSONS_DIR, locale)
+    if locale == 'builtin' or not os.path.isdir(source):
+        return open_builtin_pack(cache_size)
+    return open_built_pack(source, os.path.join(LESSONS_DIR, locale + '.lpk'), cache_size)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[0] == 'build':
+        count = build_pack(argv[1], argv[2])
+        print(f"Wrote {count} lessons to {argv[2]}")
+    elif len(argv) == 2 and argv[0] == 'list':
+        with LessonPack(argv[1]) as pack:
+            for entry in pack:
+                print(f"{entry.key:24} {entry.raw_size:8} {entry.topic:12} {entry.title}")
+    else:
+        print("usage: lesson_pack.py build SOURCE_DIR PACK | list PACK")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Full-text lesson search.
+
+An inverted index maps every lesson term to the lessons that contain it and
+the (line, column) positions of each occurrence. Shortcuts are indexed as a
+whole ("ctrl+c") and by their parts ("ctrl", "c"), so both "ctrl+v" and
+"paste" find the shortcut table.
+
+The index is built once from a lesson pack and saved next to it. It carries
+the pack's content fingerprint and is only rebuilt when the lessons change.
+Match positions double as highlight ranges, so the lesson view never has to
+scan its text with Text.search.
+"""
+import json
+import os
+import re
+import zlib
+from bisect import bisect_left
+
+from app_paths import STATE_DIR, state_path
+from save_pipeline import atomic_write
+
+INDEX_VERSION = 1
+
+TOKEN_RE = re.compile(r"[^\W_]+(?:\+[^\W_]+)*")
+PART_RE = re.compile(r"[^\W_]+")
+
+MAX_PREFIX_TERMS = 50
+
+
+def tokenize(line):
+    """Yield (term, column) for every searchable term in a line"""
+    for match in TOKEN_RE.finditer(line):
+        token = match.group().lower()
+        yield token, match.start()
+        if '+' in token:
+            for part in PART_RE.finditer(token):
+                yield part.group(), match.start() + part.start()
+
+
+def query_terms(query):
+    return [match.group().lower() for match in TOKEN_RE.finditer(query)]
+
+
+class SearchHit:
+    """Lesson matching a query, with the positions of every matched term"""
+
+    __slots__ = ('key', 'positions')
+
+    def __init__(self, key, positions):
+        self.key = key
+        # Sorted (line, column, length) tuples
+        self.positions = positions
+
+    def first_line(self):
+        return self.positions[0][0] if self.positions else 1
+
+
+class SearchIndex:
+    """Inverted index of term -> {lesson key: [line, col, line, col, ...]}"""
+
+    def __init__(self, postings, order, fingerprint=None):
+        self.postings = postings
+        self.order = {key: i for i, key in enumerate(order)}
+        self.fingerprint = fingerprint
+        self.terms = sorted(postings)
+
+    @classmethod
+    def build(cls, pack):
+        postings = {}
+        for entry in pack:
+            text = pack.read(entry.key)
+            for line_no, line in enumerate(text.split('\n'), 1):
+                for term, col in tokenize(line):
+                    positions = postings.setdefault(term, {}).setdefault(entry.key, [])
+                    positions.extend((line_no, col))
+        return cls(postings, [entry.key for entry in pack], pack.fingerprint())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version in {path}")
+        return cls(data['postings'], data['order'], data['fingerprint'])
+
+    def save(self, path):
+        order = sorted(self.order, key=self.order.get)
+        data = {
+            'version': INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'order': order,
+            'postings': self.postings
+        }
+        atomic_write(path, zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8')))
+
+    def expand(self, term, prefix=False):
+        """Indexed terms equal to term, or starting with it when prefix is set"""
+        if not prefix:
+            return [term] if term in self.postings else []
+        terms = self.terms
+        start = bisect_left(terms, term)
+        matches = []
+        for candidate in terms[start:start + MAX_PREFIX_TERMS]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches
+
+    def search(self, query):
+        """Return SearchHits for lessons containing every query term
+
+        The last term is matched as a prefix so results can update while the
+        learner is still typing it.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        found = None
+        positions = {}
+        for i, term in enumerate(terms):
+            expanded = self.expand(term, prefix=(i == len(terms) - 1))
+            keys = set()
+            for indexed_term in expanded:
+                for key, flat in self.postings[indexed_term].items():
+                    keys.add(key)
+                    spots = positions.setdefault(key, set())
+                    for j in range(0, len(flat), 2):
+                        spots.add((flat[j], flat[j + 1], len(indexed_term)))
+            found = keys if found is None else found & keys
+            if not found:
+                return []
+
+        hits = [SearchHit(key, sorted(positions[key])) for key in found]
+        hits.sort(key=lambda hit: (-len(hit.positions), self.order.get(hit.key, 0)))
+        return hits
+
+
+def index_path(pack):
+    return os.path.splitext(pack.path)[0] + '.idx'
+
+
+def _load_matching(path, pack):
+    """The index saved at path if it was built from this pack, else None"""
+    try:
+        index = SearchIndex.load(path)
+    except (OSError, ValueError, KeyError, zlib.error):
+        return None
+    return index if index.fingerprint == pack.fingerprint() else None
+
+
+def open_search_index(pack, path=None):
+    """Load the saved index for a pack, rebuilding it if the lessons changed
+
+    An index that cannot be saved next to its pack (a read-only install) is
+    kept in the per-user cache in the state directory instead.
+    """
+    path = path or index_path(pack)
+    name = os.path.basename(path)
+    index = _load_matching(path, pack)
+    if index is None:
+        index = _load_matching(os.path.join(STATE_DIR, 'lessons', name), pack)
+    if index is not None:
+        return index
+
+    index = SearchIndex.build(pack)
+    try:
+        index.save(path)
+    except OSError:
+        try:
+            index.save(state_path('lessons', name))
+        except OSError:
+            # Nowhere to save it: search still works from the fresh index
+            pass
+    return index
+
+
+def text_ranges(text, positions, wide_chars=False):
+    """Turn (line, column, length) positions into flat Text widget indices
+
+    Tcl 8.6 counts characters outside the Basic Multilingual Plane (most
+    emoji) as two, so columns are shifted when wide_chars is set.
+    """
+    lines = text.split('\n') if wide_chars else None
+    ranges = []
+    for line_no, col, length in positions:
+        end = col + length
+        if wide_chars:
+            line = lines[line_no - 1]
+            col += sum(1 for ch in line[:col] if ord(ch) > 0xFFFF)
+            end += sum(1 for ch in line[:end] if ord(ch) > 0xFFFF)
+        ranges.extend((f'{line_no}.{col}', f'{line_no}.{end}'))
+    return ranges
+
+
+def tcl_counts_wide_chars(widget):
+    """True when the Tcl build stores non-BMP characters as surrogate pairs"""
+    return int(widget.tk.call('string', 'length', '\U0001F5B1')) == 2
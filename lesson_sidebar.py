@@ -0,0 +1,225 @@
+"""Virtualized lesson list for the sidebar.
+
+The catalog is flattened into rows: one header per topic, followed by that
+topic's lessons unless the topic is collapsed. Only as many buttons as fit
+in the sidebar (plus one) are ever created. Scrolling moves the row window
+and relabels the same buttons, placed at fixed pixel offsets, so opening and
+scrolling cost the same for six lessons or five thousand.
+
+Buttons are themed through the theme engine like the rest of the window.
+A recycled button switches role between 'nav_button', 'nav_button_current'
+(the lesson on screen) and 'group_header' only when its row kind changes.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+SIDEBAR_TAG = 'LessonSidebar'
+WHEEL_ROWS = 3
+ROW_GAP = 6
+
+HEADER = 'header'
+LESSON = 'lesson'
+
+
+def sidebar_rows(entries, collapsed=()):
+    """Flatten lesson entries into (kind, value, label) rows grouped by topic
+
+    Topics appear in the order of their first lesson; header rows carry the
+    topic name, lesson rows the lesson key.
+    """
+    topics = {}
+    for entry in entries:
+        topics.setdefault(entry.topic or "Lessons", []).append(entry)
+    rows = []
+    for topic, members in topics.items():
+        closed = topic in collapsed
+        arrow = '▸' if closed else '▾'
+        rows.append((HEADER, topic, f"{arrow} {topic} ({len(members)})"))
+        if not closed:
+            rows.extend((LESSON, entry.key, entry.title) for entry in members)
+    return rows
+
+
+class LessonSidebar:
+    """Scrollable, collapsible lesson list that recycles a handful of buttons"""
+
+    def __init__(self, parent, entries, on_select, theme_engine, button_font, header_font):
+        self.entries = list(entries)
+        self.on_select = on_select
+        self.theme_engine = theme_engine
+        self.button_font = button_font
+        self.header_font = header_font
+        self.collapsed = set()
+        self.rows = sidebar_rows(self.entries)
+        self.offset = 0
+        self.current = None
+
+        self.frame = tk.Frame(parent)
+        self.scrollbar = ttk.Scrollbar(self.frame, command=self.yview)
+        self.viewport = tk.Frame(self.frame)
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.viewport.bind('<Configure>', lambda e: self.refresh())
+        theme_engine.register(self.frame, 'frame')
+        theme_engine.register(self.viewport, 'frame')
+
+        self._slots = []
+        self._slot_rows = []
+        self._slot_roles = []
+        self._relabel = False
+        self.row_height = self._make_slot().winfo_reqheight() + ROW_GAP
+
+        root = parent.winfo_toplevel()
+        root.bind_class(SIDEBAR_TAG, '<MouseWheel>',
+                        lambda e: self.scroll_rows(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS))
+        root.bind_class(SIDEBAR_TAG, '<Button-4>', lambda e: self.scroll_rows(-WHEEL_ROWS))
+        root.bind_class(SIDEBAR_TAG, '<Button-5>', lambda e: self.scroll_rows(WHEEL_ROWS))
+        self.viewport.bindtags((SIDEBAR_TAG,) + self.viewport.bindtags())
+
+    def _make_slot(self):
+        index = len(self._slots)
+        button = tk.Button(
+            self.viewport,
+            command=lambda: self.activate(index),
+            font=self.button_font,
+            anchor=tk.W,
+            bd=0,
+            relief=tk.FLAT,
+            padx=15,
+            pady=8
+        )
+        self.theme_engine.register(button, 'nav_button', hover=True)
+        button.bindtags((SIDEBAR_TAG,) + button.bindtags())
+        self._slots.append(button)
+        self._slot_rows.append(None)
+        self._slot_roles.append('nav_button')
+        return button
+
+    # Scrolling
+
+    @property
+    def content_height(self):
+        return len(self.rows) * self.row_height
+
+    def _clamp(self, offset):
+        limit = max(0, self.content_height - self.viewport.winfo_height())
+        return min(max(0, offset), limit)
+
+    def yview(self, *args):
+        """Scrollbar command"""
+        if args[0] == 'moveto':
+            offset = float(args[1]) * self.content_height
+        elif args[2] == 'pages':
+            offset = self.offset + int(args[1]) * self.viewport.winfo_height()
+        else:
+            offset = self.offset + int(args[1]) * self.row_height
+        self.scroll_to(offset)
+
+    def scroll_rows(self, rows):
+        self.scroll_to(self.offset + rows * self.row_height)
+        return 'break'
+
+    def scroll_to(self, offset):
+        offset = self._clamp(int(offset))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def show_row(self, index):
+        """Scroll just enough to bring a row into view"""
+        top = index * self.row_height
+        height = self.viewport.winfo_height()
+        if top < self.offset:
+            self.scroll_to(top)
+        elif top + self.row_height > self.offset + height:
+            self.scroll_to(top + self.row_height - height)
+
+    # Rendering
+
+    def refresh(self):
+        """Place and label the buttons for the rows in view"""
+        height = self.viewport.winfo_height()
+        width = self.viewport.winfo_width()
+        if height <= 1:
+            return
+        self.offset = self._clamp(self.offset)
+        needed = height // self.row_height + 2
+        while len(self._slots) < needed:
+            self._make_slot()
+
+        first, shift = divmod(self.offset, self.row_height)
+        for i, button in enumerate(self._slots):
+            row = first + i
+            if i >= needed or row >= len(self.rows):
+                if self._slot_rows[i] is not None:
+                    button.place_forget()
+                    self._slot_rows[i] = None
+                continue
+            if self._slot_rows[i] != self.rows[row] or self._relabel:
+                self._label(i, self.rows[row])
+                self._slot_rows[i] = self.rows[row]
+            button.place(x=0, y=i * self.row_height - shift,
+                         width=width, height=self.row_height - ROW_GAP)
+        self._relabel = False
+
+        if self.content_height > height:
+            total = self.content_height
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+            if not self.scrollbar.winfo_ismapped():
+                self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y, before=self.viewport)
+        elif self.scrollbar.winfo_ismapped():
+            self.scrollbar.pack_forget()
+
+    def _label(self, slot, row):
+        kind, value, label = row
+        if kind == HEADER:
+            role, font = 'group_header', self.header_font
+        elif value == self.current:
+            role, font = 'nav_button_current', self.button_font
+        else:
+            role, font = 'nav_button', self.button_font
+        button = self._slots[slot]
+        if self._slot_roles[slot] != role:
+            self.theme_engine.register(button, role, hover=True)
+            self._slot_roles[slot] = role
+        button.configure(text=label, font=font)
+
+    # Actions
+
+    def activate(self, slot):
+        row = self._slot_rows[slot]
+        if row is None:
+            return
+        kind, value, _ = row
+        if kind == HEADER:
+            self.toggle(value)
+        else:
+            self.on_select(value)
+
+    def toggle(self, topic):
+        """Collapse or expand a topic"""
+        if topic in self.collapsed:
+            self.collapsed.remove(topic)
+        else:
+            self.collapsed.add(topic)
+        self.rows = sidebar_rows(self.entries, self.collapsed)
+        self.refresh()
+
+    def set_entries(self, entries):
+        """Show another catalog, such as the same lessons in another language"""
+        self.entries = list(entries)
+        self.collapsed = set()
+        self.rows = sidebar_rows(self.entries)
+        self._relabel = True
+        self.refresh()
+
+    def select(self, key):
+        """Mark key as the lesson being shown and scroll it into view"""
+        if key == self.current:
+            return
+        self.current = key
+        self._relabel = True
+        for index, (kind, value, _) in enumerate(self.rows):
+            if kind == LESSON and value == key:
+                self.show_row(index)
+                break
+        self.refresh()
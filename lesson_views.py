@@ -0,0 +1,89 @@
+"""Pool of rendered lesson views.
+
+Rendering a lesson means inserting its text into a Text widget and tagging
+it, after which Tk lays out every display line again. Instead of reusing
+one widget, each opened lesson keeps its own widget, and switching lessons
+just shows the right one (see resize_layout.ViewStack). Hidden views are
+unmapped but keep their layout. Views are kept in least-recently-used
+order and the oldest are destroyed once the estimated memory of all views
+exceeds the budget.
+
+Pooled views are not registered with the theme engine. The app restyles
+the view on screen when the theme changes, and a hidden view when it is
+next shown.
+"""
+from collections import OrderedDict
+
+VIEW_BUDGET_BYTES = 1024 * 1024
+
+# Rough cost of a rendered Text widget: fixed widget and layout state, plus
+# per-character segment storage and display line caches
+VIEW_OVERHEAD_BYTES = 16 * 1024
+BYTES_PER_CHAR = 8
+
+
+def estimate_cost(text):
+    return VIEW_OVERHEAD_BYTES + BYTES_PER_CHAR * len(text)
+
+
+class LessonView:
+    __slots__ = ('key', 'frame', 'text', 'cost', 'theme')
+
+    def __init__(self, key, frame, text, cost):
+        self.key = key
+        self.frame = frame
+        self.text = text
+        self.cost = cost
+        self.theme = None
+
+
+class LessonViewPool:
+    """LRU-evicted rendered lesson views under a memory budget
+
+    factory(compiled) builds and renders a view, returning its (frame, text)
+    widgets; the pool owns them from then on and destroys them on eviction.
+    """
+
+    def __init__(self, factory, budget_bytes=VIEW_BUDGET_BYTES):
+        self.factory = factory
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._views = OrderedDict()
+
+    def __len__(self):
+        return len(self._views)
+
+    def __contains__(self, key):
+        return key in self._views
+
+    def view(self, key, compile):
+        """The view for key, rendering it from compile() if it is not pooled"""
+        view = self._views.get(key)
+        if view is not None:
+            self._views.move_to_end(key)
+            self.hits += 1
+            return view
+
+        compiled = compile()
+        frame, text = self.factory(compiled)
+        view = LessonView(key, frame, text, estimate_cost(compiled.text))
+        self._views[key] = view
+        self.used_bytes += view.cost
+        self.misses += 1
+        self._evict()
+        return view
+
+    def _evict(self):
+        # The newest view always stays, even if it alone is over budget
+        while self.used_bytes > self.budget_bytes and len(self._views) > 1:
+            _, view = self._views.popitem(last=False)
+            self.used_bytes -= view.cost
+            view.frame.destroy()
+
+    def clear(self):
+        for view in self._views.values():
+            view.frame.destroy()
+        self._views.clear()
+        self.used_bytes = 0
@@ -1,20 +1,121 @@
+import time
+_IMPORTS_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, font, filedialog
 from tkinter import messagebox
+import argparse
+import getpass
 import os
 
+from app_paths import state_dir, state_path
+from file_loader import LARGE_FILE_BYTES, ChunkedLoader, MappedFileView
+from i18n import DEFAULT_LOCALE, Translator
+from lesson_markup import compile_lesson, render
+from lesson_pack import LessonPackError, open_locale_pack
+from lesson_search import open_search_index, tcl_counts_wide_chars, text_ranges
+from lesson_sidebar import LessonSidebar
+from lesson_views import VIEW_BUDGET_BYTES, LessonViewPool
+from practice_engine import PracticeEngine
+from progress_events import COMPLETED, LESSON, STARTED, STEP, EventLog, EventLogError
+from progress_store import ProgressStore, ProgressStoreError
+from quiz_bank import QuizBankError, open_locale_bank
+from quiz_engine import QuizSession, QuizStats, QuizStatsError
+from resize_layout import ResizeCoalescer, ViewStack, WrapFollower, font_metrics
+from practice_journal import PracticeJournal
+from save_pipeline import SaveWriter, atomic_write
+from shortcut_drill import (HIT, TIMEOUT_MS, WRONG, DrillStats, LoopMonitor,
+                            ShortcutDrill, drill_shortcuts, key_name)
+from stall_monitor import StallMonitor, session_report_path
+from startup_profile import StartupProfile
+from text_edits import EditRecorder
+from theme_engine import ThemeEngine
+from undo_history import UNDO_BUDGET_BYTES, UndoHistory
+
+_IMPORTS_DONE = time.perf_counter()
+
 class ComputerBasicsApp:
-    def __init__(self, root):
+    def __init__(self, root, practice_engine=None, startup_profile=None, classroom=None,
+                 learner=None, telemetry=None, lesson_view_budget=VIEW_BUDGET_BYTES,
+                 locale=DEFAULT_LOCALE, class_name='', undo_budget=UNDO_BUDGET_BYTES,
+                 diagnostics=None):
         self.root = root
-        self.root.title("Computer Basics Tutorial")
+        self.startup_profile = startup_profile
+        
+        # Opt-in leak diagnostics, sampled after lesson switches, theme toggles and practice
+        self.diagnostics = diagnostics
+        
+        # Optional classroom reporter; reporting never blocks the UI
+        self.classroom = classroom
+        self.learner = learner or getpass.getuser()
+        self.class_name = class_name
+        
+        # Only the active locale's catalog and lesson pack are ever opened
+        self.tr = Translator(locale)
+        
+        # Opt-in keystroke telemetry for the practice editor
+        self.telemetry = telemetry
+        self.root.title(self.tr("Computer Basics Tutorial"))
         self.root.geometry("1000x700")
         self.root.minsize(800, 600)
         
-        # Practice session variables
-        self.practice_active = False
-        self.current_practice_step = 0
-        self.practice_file_path = ""
-        self.practice_completed_steps = set()
+        # Practice session state lives in the UI-independent engine
+        self.practice = practice_engine
+        if self.practice is None:
+            self.practice = PracticeEngine()
+        self.practice.translate = self.tr
+        
+        # Built on first use; most launches never open a practice session
+        self.practice_container = None
+        self.undo_budget = undo_budget
+        self._save_writer = None
+        self._progress_store = None
+        
+        # Timed learner events for instructor reports, appended as they happen
+        self._event_log = None
+        self.practice_started = None
+        self.practice_step_started = None
+        
+        # Quiz questions are memory-mapped from the active locale's bank on first use
+        self.quiz_container = None
+        self.quiz = None
+        self.quiz_lesson = None
+        self._quiz_bank = None
+        self._quiz_stats = None
+        
+        # Shortcut drill; its heartbeat only runs while drilling
+        self.drill_container = None
+        self.drill = None
+        self.drill_job = None
+        self.loop_monitor = LoopMonitor(self.root)
+        self._drill_stats = None
+        
+        # Lessons are decoded from the pack only when opened
+        try:
+            self.lesson_pack = open_locale_pack(self.tr.code)
+        except (OSError, LessonPackError):
+            if self.tr.code == DEFAULT_LOCALE:
+                raise
+            # The translated lessons are broken: fall back to English throughout
+            self.tr.set_locale(DEFAULT_LOCALE)
+            self.lesson_pack = open_locale_pack(DEFAULT_LOCALE)
+        self.current_lesson = None
+        self.lesson_view_budget = lesson_view_budget
+        
+        # Search variables
+        self._search_index = None
+        self.search_job = None
+        self.search_result_lines = {}
+        self.showing_search_results = False
+        self.tcl_wide_chars = tcl_counts_wide_chars(self.root)
+        
+        # Keep crash recovery available before the practice panel exists
+        self.practice_journal = PracticeJournal(
+            self.root,
+            state_dir(),
+            get_text=lambda: self.practice_editor.get(1.0, 'end-1c'),
+            wide_chars=self.tcl_wide_chars
+        )
         
         # Theme variables
         self.dark_mode = False
@@ -47,19 +148,33 @@ class ComputerBasicsApp:
             }
         }
         
+        # Themes are compiled once; toggling only touches changed options
+        self.theme_engine = ThemeEngine(self.root, self.themes)
+        
         # Fonts
         self.title_font = font.Font(family='Segoe UI', size=24, weight='bold')
         self.subtitle_font = font.Font(family='Segoe UI', size=12)
         self.button_font = font.Font(family='Segoe UI', size=12)
+        self.group_font = font.Font(family='Segoe UI', size=11, weight='bold')
         self.text_font = font.Font(family='Segoe UI', size=13)
-        self.practice_font = font.Font(family='Segoe UI', size=12, weight='bold')
+        self.practice_font = None
+        
+        # Wrapped labels follow the panel width; resizes are coalesced
+        self.wraps = WrapFollower()
+        self.mark_startup('app_init')
         
         # Create UI elements
         self.create_widgets()
+        self.register_theme_roles()
         self.apply_theme()
+        self.mark_startup('widgets')
         
         # Show welcome message
         self.show_welcome_message()
+        self.mark_startup('welcome')
+        
+        # Offer to bring back a session interrupted by a crash
+        self.root.after_idle(self.offer_practice_restore)
     
     def create_widgets(self):
         # Create main container
@@ -73,9 +188,9 @@ class ComputerBasicsApp:
         # Title label
         self.title_label = tk.Label(
             self.header_frame,
-            text="Computer Basics Tutorial",
             font=self.title_font
         )
+        self.tr.bind(self.title_label, "Computer Basics Tutorial")
         self.title_label.pack(side=tk.LEFT)
         
         # Theme toggle button
@@ -89,12 +204,47 @@ class ComputerBasicsApp:
         )
         self.theme_button.pack(side=tk.RIGHT, padx=5)
         
+        # Language picker; names are read from the catalogs only when it opens
+        self.locale_codes = []
+        self.locale_var = tk.StringVar(value=self.tr.language)
+        self.locale_picker = ttk.Combobox(
+            self.header_frame,
+            textvariable=self.locale_var,
+            state='readonly',
+            width=10,
+            postcommand=self.list_locales
+        )
+        self.locale_picker.pack(side=tk.RIGHT, padx=5)
+        self.locale_picker.bind(
+            '<<ComboboxSelected>>',
+            lambda e: self.set_locale(self.locale_codes[self.locale_picker.current()])
+        )
+        
+        # Search box
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(
+            self.header_frame,
+            textvariable=self.search_var,
+            font=self.subtitle_font,
+            width=24,
+            relief=tk.FLAT
+        )
+        self.search_entry.pack(side=tk.RIGHT, padx=5, ipady=3)
+        self.search_var.trace_add('write', self.on_search_changed)
+        
+        self.search_label = tk.Label(
+            self.header_frame,
+            text="🔍",
+            font=("Segoe UI", 14)
+        )
+        self.search_label.pack(side=tk.RIGHT)
+        
         # Subtitle label
         self.subtitle_label = tk.Label(
             self.header_frame,
-            text="Learn essential computer skills",
             font=self.subtitle_font
         )
+        self.tr.bind(self.subtitle_label, "Learn essential computer skills")
         self.subtitle_label.pack(side=tk.LEFT, padx=10)
         
         # Content frame
@@ -109,17 +259,120 @@ class ComputerBasicsApp:
         # Right panel for content
         self.right_panel = tk.Frame(self.content_frame)
         self.right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.panel_resize = ResizeCoalescer(
+            self.right_panel, self.wraps.resize,
+            step=font_metrics(self.text_font).char_width
+        )
         
         # Create buttons
         self.create_buttons()
         
         # Create text display
         self.create_text_display()
-        
-        # Create practice panel (initially hidden)
-        self.create_practice_panel()
+    
+    def mark_startup(self, phase):
+        if self.startup_profile is not None:
+            self.startup_profile.mark(phase)
+    
+    @property
+    def search_index(self):
+        """Lesson search index, loaded on the first search"""
+        if self._search_index is None:
+            self._search_index = open_search_index(self.lesson_pack)
+        return self._search_index
+    
+    @property
+    def save_writer(self):
+        """Background file writer, started on the first save"""
+        if self._save_writer is None:
+            self._save_writer = SaveWriter(self.root, fsync='file')
+        return self._save_writer
+    
+    @property
+    def progress_store(self):
+        """Lessons opened and practice steps completed, loaded on first use"""
+        if self._progress_store is None:
+            try:
+                self._progress_store = ProgressStore.open(state_path('progress.lps'))
+            except (OSError, ProgressStoreError):
+                self._progress_store = ProgressStore()
+        return self._progress_store
+    
+    def log_event(self, kind, subject, step=0, ms=0):
+        """Append to the event log, opened on the first event; a log that cannot be written is skipped"""
+        try:
+            if self._event_log is None:
+                self._event_log = EventLog(state_path('events.lpe'), flush_each=True)
+            self._event_log.add(kind, self.learner, subject, step=step, ms=ms,
+                                class_name=self.class_name)
+        except (OSError, EventLogError):
+            pass
+    
+    @property
+    def quiz_bank(self):
+        """Question bank for the current language, opened on the first quiz"""
+        if self._quiz_bank is None:
+            self._quiz_bank = open_locale_bank(self.tr.code)
+        return self._quiz_bank
+    
+    @property
+    def drill_stats(self):
+        """Shortcut latency histograms, loaded on the first drill"""
+        if self._drill_stats is None:
+            self._drill_stats = DrillStats.open(state_path('drill.json'))
+        return self._drill_stats
+    
+    @property
+    def quiz_stats(self):
+        """Per-question answer statistics, loaded on the first quiz"""
+        if self._quiz_stats is None:
+            try:
+                self._quiz_stats = QuizStats.open(state_path('quiz_stats.qst'))
+            except (OSError, QuizStatsError):
+                self._quiz_stats = QuizStats()
+        return self._quiz_stats
+    
+    def shutdown(self):
+        """Flush the practice journal, finish queued saves and last reports"""
+        try:
+            self.practice_journal.close()
+        except OSError:
+            pass
+        if self._progress_store is not None:
+            try:
+                self._progress_store.save(state_path('progress.lps'))
+            except OSError:
+                pass
+        if self._event_log is not None:
+            try:
+                self._event_log.close()
+            except OSError:
+                pass
+        if self._quiz_stats is not None:
+            try:
+                self._quiz_stats.save(state_path('quiz_stats.qst'))
+            except OSError:
+                pass
+        if self._drill_stats is not None:
+            try:
+                self._drill_stats.save(state_path('drill.json'))
+            except OSError:
+                pass
+        if self._save_writer is not None:
+            self._save_writer.close()
+        if self.classroom is not None:
+            self.classroom.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+    
+    def ensure_practice_panel(self):
+        """Build the practice panel the first time a session starts"""
+        if self.practice_container is None:
+            self.create_practice_panel()
     
     def create_practice_panel(self):
+        self.practice_font = font.Font(family='Segoe UI', size=12, weight='bold')
+        
         # Practice container
         self.practice_container = tk.Frame(self.right_panel)
         
@@ -127,37 +380,82 @@ class ComputerBasicsApp:
         self.practice_instructions = tk.Label(
             self.practice_container,
             font=self.practice_font,
-            wraplength=600,
             justify=tk.LEFT
         )
         self.practice_instructions.pack(fill=tk.X, pady=(0, 10))
+        self.wraps.register(self.practice_instructions, self.practice_font, margin=5)
         
         # Practice editor frame
         self.editor_frame = tk.Frame(self.practice_container)
         self.editor_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Text editor
+        # Text editor; undo comes from the bounded history below, not Tk's stack
         self.practice_editor = tk.Text(
             self.editor_frame,
             wrap=tk.WORD,
             font=self.text_font,
             padx=10,
-            pady=10,
-            undo=True
+            pady=10
         )
         self.practice_editor.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Editor scrollbar
-        editor_scroll = ttk.Scrollbar(self.editor_frame)
-        editor_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.practice_editor.config(yscrollcommand=editor_scroll.set)
-        editor_scroll.config(command=self.practice_editor.yview)
+        self.editor_scroll = ttk.Scrollbar(self.editor_frame)
+        self.editor_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.practice_editor.config(yscrollcommand=self.editor_scroll.set)
+        self.editor_scroll.config(command=self.practice_editor.yview)
+        
+        # Opened files: a chunked load in progress, or a read-only mapped view
+        self.file_loader = None
+        self.file_view = None
+        view_keys = {
+            '<Up>': -1,
+            '<Down>': 1,
+            '<Button-4>': -3,
+            '<Button-5>': 3
+        }
+        for sequence, lines in view_keys.items():
+            self.root.bind_class(
+                'MappedView', sequence,
+                lambda e, lines=lines: self.move_file_view(lines)
+            )
+        self.root.bind_class(
+            'MappedView', '<MouseWheel>',
+            lambda e: self.move_file_view(-3 if e.delta > 0 else 3)
+        )
+        self.root.bind_class(
+            'MappedView', '<Prior>',
+            lambda e: self.move_file_view(-self.file_view_lines())
+        )
+        self.root.bind_class(
+            'MappedView', '<Next>',
+            lambda e: self.move_file_view(self.file_view_lines())
+        )
+        self.root.bind_class('MappedView', '<Configure>', lambda e: self.render_file_view())
         
         # Bind keyboard shortcuts for practice
         self.practice_editor.bind('<Control-s>', lambda e: self.check_practice_step('save'))
         self.practice_editor.bind('<Control-c>', lambda e: self.check_practice_step('copy'))
         self.practice_editor.bind('<Control-v>', lambda e: self.check_practice_step('paste'))
         self.practice_editor.bind('<Control-z>', lambda e: self.check_practice_step('undo'))
+        self.practice_editor.bind('<Control-x>', lambda e: self.check_practice_step('cut'))
+        self.practice_editor.bind('<Control-y>', lambda e: self.check_practice_step('redo'))
+        self.practice_editor.bind('<Control-a>', self.select_all_practice_text)
+        
+        # Journal every edit so a crashed session can be restored
+        self.editor_edits = EditRecorder(self.practice_editor)
+        self.editor_edits.add_listener(self.practice_journal.record_edit)
+        
+        # Undo and redo keep compact diffs within a fixed memory budget
+        self.editor_history = UndoHistory(
+            self.apply_history_edit,
+            budget=self.undo_budget,
+            wide_chars=self.tcl_wide_chars
+        )
+        self.editor_history.attach(self.practice_editor)
+        self.editor_edits.add_text_listener(self.editor_history.record)
+        if self.telemetry is not None:
+            self.telemetry.attach(self.practice_editor)
         
         # Practice controls frame
         self.controls_frame = tk.Frame(self.practice_container)
@@ -166,23 +464,49 @@ class ComputerBasicsApp:
         # Save button
         self.save_button = tk.Button(
             self.controls_frame,
-            text="Save File (Ctrl+S)",
             command=lambda: self.check_practice_step('save'),
             font=self.button_font,
             width=15
         )
+        self.tr.bind(self.save_button, "Save File (Ctrl+S)")
         self.save_button.pack(side=tk.LEFT, padx=5)
         
+        # Open file button
+        self.open_button = tk.Button(
+            self.controls_frame,
+            command=self.open_practice_file,
+            font=self.button_font,
+            width=10
+        )
+        self.tr.bind(self.open_button, "Open File")
+        self.open_button.pack(side=tk.LEFT, padx=5)
+        
         # New file button
         self.new_file_button = tk.Button(
             self.controls_frame,
-            text="New File",
             command=self.start_practice_session,
             font=self.button_font,
             width=10
         )
+        self.tr.bind(self.new_file_button, "New File")
         self.new_file_button.pack(side=tk.LEFT, padx=5)
         
+        # Scenario picker
+        self.scenario_ids = list(self.practice.scenarios)
+        self.scenario_var = tk.StringVar(value=self.tr(self.practice.scenario.title))
+        self.scenario_picker = ttk.Combobox(
+            self.controls_frame,
+            textvariable=self.scenario_var,
+            values=self.scenario_titles(),
+            state='readonly',
+            width=22
+        )
+        self.scenario_picker.pack(side=tk.LEFT, padx=5)
+        self.scenario_picker.bind(
+            '<<ComboboxSelected>>',
+            lambda e: self.start_practice_session(self.scenario_ids[self.scenario_picker.current()])
+        )
+        
         # Status label
         self.practice_status = tk.Label(
             self.controls_frame,
@@ -199,41 +523,170 @@ class ComputerBasicsApp:
             length=100
         )
         self.practice_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Theme the new widgets to match the rest of the window
+        roles = {
+            'frame': [self.practice_container, self.editor_frame, self.controls_frame],
+            'text': [self.practice_editor],
+            'label': [self.practice_instructions, self.practice_status],
+            'action_button': [self.save_button, self.open_button, self.new_file_button]
+        }
+        for role, widgets in roles.items():
+            for widget in widgets:
+                self.theme_engine.register(widget, role)
+    
+    def ensure_quiz_panel(self):
+        """Build the quiz panel the first time a quiz starts"""
+        if self.quiz_container is None:
+            self.create_quiz_panel()
+    
+    def create_quiz_panel(self):
+        self.quiz_container = tk.Frame(self.right_panel)
+        
+        # Which lesson, and how far along
+        self.quiz_heading = tk.Label(
+            self.quiz_container,
+            font=self.subtitle_font,
+            anchor=tk.W
+        )
+        self.quiz_heading.pack(fill=tk.X, pady=(10, 5), padx=10)
+        
+        # Question
+        self.quiz_prompt = tk.Label(
+            self.quiz_container,
+            font=self.title_font,
+            justify=tk.LEFT,
+            anchor=tk.W
+        )
+        self.quiz_prompt.pack(fill=tk.X, pady=10, padx=10)
+        self.wraps.register(self.quiz_prompt, self.title_font, margin=25)
+        
+        # Answer: a radio button per choice, or a typed answer
+        self.quiz_answer_frame = tk.Frame(self.quiz_container)
+        self.quiz_answer_frame.pack(fill=tk.X, padx=10)
+        self.quiz_choice_var = tk.IntVar(value=-1)
+        self.quiz_choices = []
+        self.quiz_entry = tk.Entry(self.quiz_answer_frame, font=self.text_font)
+        self.quiz_entry.bind('<Return>', lambda e: self.check_quiz_answer())
+        
+        # Feedback after checking
+        self.quiz_feedback = tk.Label(
+            self.quiz_container,
+            font=self.text_font,
+            justify=tk.LEFT,
+            anchor=tk.W
+        )
+        self.quiz_feedback.pack(fill=tk.X, pady=10, padx=10)
+        self.wraps.register(self.quiz_feedback, self.text_font, margin=25)
+        
+        # Quiz controls
+        self.quiz_controls = tk.Frame(self.quiz_container)
+        self.quiz_controls.pack(fill=tk.X, pady=(10, 0), padx=10)
+        self.quiz_check_button = tk.Button(
+            self.quiz_controls,
+            command=self.check_quiz_answer,
+            font=self.button_font,
+            width=10
+        )
+        self.tr.bind(self.quiz_check_button, "Check")
+        self.quiz_check_button.pack(side=tk.LEFT, padx=5)
+        self.quiz_next_button = tk.Button(
+            self.quiz_controls,
+            command=self.next_quiz_question,
+            font=self.button_font,
+            width=10
+        )
+        self.tr.bind(self.quiz_next_button, "Next")
+        self.quiz_next_button.pack(side=tk.LEFT, padx=5)
+        self.quiz_score = tk.Label(self.quiz_controls, font=self.text_font)
+        self.quiz_score.pack(side=tk.RIGHT, padx=10)
+        
+        roles = {
+            'frame': [self.quiz_container, self.quiz_answer_frame, self.quiz_controls],
+            'label': [self.quiz_heading, self.quiz_prompt, self.quiz_feedback, self.quiz_score],
+            'text': [self.quiz_entry],
+            'action_button': [self.quiz_check_button, self.quiz_next_button]
+        }
+        for role, widgets in roles.items():
+            for widget in widgets:
+                self.theme_engine.register(widget, role)
+    
+    def ensure_drill_panel(self):
+        """Build the shortcut drill panel the first time a drill starts"""
+        if self.drill_container is None:
+            self.create_drill_panel()
+    
+    def create_drill_panel(self):
+        # Takes keyboard focus so every shortcut comes straight to the drill
+        self.drill_container = tk.Frame(self.right_panel, takefocus=1)
+        self.drill_container.bind('<KeyPress>', self.on_drill_key)
+        self.drill_container.bind('<Button-1>', lambda e: self.drill_container.focus_set())
+        
+        self.drill_heading = tk.Label(
+            self.drill_container,
+            font=self.subtitle_font,
+            anchor=tk.W
+        )
+        self.tr.bind(self.drill_heading, "⏱️ Press the shortcut as fast as you can")
+        self.drill_heading.pack(fill=tk.X, pady=(10, 5), padx=10)
+        
+        # The shortcut to press, and what it does
+        self.drill_prompt = tk.Label(self.drill_container, font=self.title_font)
+        self.drill_prompt.pack(pady=(40, 5))
+        self.drill_description = tk.Label(self.drill_container, font=self.text_font)
+        self.drill_description.pack(pady=(0, 20))
+        
+        # Result of the last press, and where practice is going
+        self.drill_status = tk.Label(self.drill_container, font=self.text_font)
+        self.drill_status.pack(pady=5)
+        self.drill_summary = tk.Label(
+            self.drill_container,
+            font=self.text_font,
+            justify=tk.LEFT
+        )
+        self.drill_summary.pack(pady=5)
+        self.wraps.register(self.drill_summary, self.text_font, margin=45)
+        
+        for widget in (self.drill_heading, self.drill_prompt, self.drill_description,
+                       self.drill_status, self.drill_summary):
+            self.theme_engine.register(widget, 'label')
+        self.theme_engine.register(self.drill_container, 'frame')
+    
+    def quiz_choice(self, index):
+        """Radio button for choice index, created the first time a question has that many"""
+        while len(self.quiz_choices) <= index:
+            button = tk.Radiobutton(
+                self.quiz_answer_frame,
+                variable=self.quiz_choice_var,
+                value=len(self.quiz_choices),
+                font=self.text_font,
+                anchor=tk.W,
+                justify=tk.LEFT
+            )
+            self.wraps.register(button, self.text_font, margin=55)
+            self.theme_engine.register(button, 'choice')
+            self.quiz_choices.append(button)
+        return self.quiz_choices[index]
     
     def create_buttons(self):
         # Button container
         self.button_container = tk.Frame(self.left_panel)
         self.button_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Lesson buttons
-        lessons = [
-            ("🖱️ Using Mouse & Keyboard", self.show_mouse_keyboard),
-            ("📁 Create a Folder", self.show_create_folder),
-            ("📝 Create Text File", self.show_create_text_file),
-            ("⌨️ Shortcut Keys", self.show_shortcut_keys),
-            ("📖 Terminology", self.show_terminology),
-            ("❓ Getting Help", self.show_getting_help),
-            ("💻 Practice Session", self.start_practice_session)
-        ]
-        
-        for text, command in lessons:
-            btn = tk.Button(
-                self.button_container,
-                text=text,
-                command=command,
-                font=self.button_font,
-                anchor=tk.W,
-                bd=0,
-                relief=tk.FLAT,
-                padx=15
-            )
-            btn.pack(fill=tk.X, pady=3, ipady=8)
-            self.style_button(btn)
+        # Practice and exit stay at the bottom; the lesson list scrolls above them
+        practice_btn = tk.Button(
+            self.button_container,
+            command=self.start_practice_session,
+            font=self.button_font,
+            anchor=tk.W,
+            bd=0,
+            relief=tk.FLAT,
+            padx=15
+        )
         
         # Exit button
         exit_btn = tk.Button(
             self.button_container,
-            text="🚪 Exit",
             command=self.root.quit,
             font=self.button_font,
             anchor=tk.W,
@@ -241,24 +694,56 @@ class ComputerBasicsApp:
             relief=tk.FLAT,
             padx=15
         )
-        exit_btn.pack(fill=tk.X, pady=(20, 5), ipady=8)
-        self.style_button(exit_btn, True)
-    
-    def style_button(self, button, is_exit=False):
-        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
-        bg = '#8c4a4a' if is_exit else theme['button_bg']
-        active_bg = '#7c3a3a' if is_exit else theme['button_active']
         
-        button.config(
-            bg=bg,
-            fg=theme['button_fg'],
-            activebackground=active_bg,
-            activeforeground=theme['button_fg']
+        # Quiz on the lesson being read, or on everything from the welcome page
+        quiz_btn = tk.Button(
+            self.button_container,
+            command=self.start_quiz,
+            font=self.button_font,
+            anchor=tk.W,
+            bd=0,
+            relief=tk.FLAT,
+            padx=15
+        )
+        self.tr.bind(exit_btn, "🚪 Exit")
+        self.tr.bind(practice_btn, "💻 Practice Session")
+        
+        # Timed shortcut drill
+        drill_btn = tk.Button(
+            self.button_container,
+            command=self.start_shortcut_drill,
+            font=self.button_font,
+            anchor=tk.W,
+            bd=0,
+            relief=tk.FLAT,
+            padx=15
         )
+        self.tr.bind(quiz_btn, "📝 Quiz")
+        self.tr.bind(drill_btn, "⏱️ Shortcut Drill")
+        exit_btn.pack(side=tk.BOTTOM, fill=tk.X, pady=(20, 5), ipady=8)
+        self.style_button(exit_btn, True)
+        practice_btn.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 3), ipady=8)
+        self.style_button(practice_btn)
+        quiz_btn.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 3), ipady=8)
+        self.style_button(quiz_btn)
+        drill_btn.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 3), ipady=8)
+        self.style_button(drill_btn)
         
-        # Bind hover effects
-        button.bind("<Enter>", lambda e, b=button: b.config(bg=active_bg))
-        button.bind("<Leave>", lambda e, b=button, bg=bg: b.config(bg=bg))
+        # Lesson list, grouped by topic; only visible rows have buttons
+        self.lesson_sidebar = LessonSidebar(
+            self.button_container,
+            self.lesson_pack,
+            self.show_lesson,
+            self.theme_engine,
+            self.button_font,
+            self.group_font
+        )
+        self.lesson_sidebar.frame.pack(fill=tk.BOTH, expand=True)
+    
+    def style_button(self, button, is_exit=False):
+        # Colors and hover effects come from the theme engine's shared binding
+        role = 'exit_button' if is_exit else 'nav_button'
+        self.theme_engine.register(button, role, hover=True)
     
     def create_text_display(self):
         # Text container with shadow effect
@@ -270,17 +755,35 @@ class ComputerBasicsApp:
         )
         self.text_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
         
+        # Only the visible lesson view is placed, and only it is resized;
+        # while the window edge is dragged it reflows a few times a second
+        self.view_stack = ViewStack(self.text_container, padx=5, pady=5)
+        self.view_resize = ResizeCoalescer(
+            self.text_container, self.view_stack.resize,
+            step=font_metrics(self.text_font).char_width
+        )
+        
+        # Shared display for the welcome page and search results
+        self.text_frame, self.text_display = self.create_display(self.text_container)
+        self.text_display.tag_configure('search_result', underline=True)
+        self.text_display.tag_bind('search_result', '<Button-1>', self.open_search_result)
+        self.visible_display = self.text_display
+        self.visible_view = None
+        
+        # Lessons keep their own rendered view while they fit the budget
+        self.lesson_views = LessonViewPool(self.create_lesson_view, self.lesson_view_budget)
+    
+    def create_display(self, parent):
+        """A read-only lesson Text with its scrollbar, in a frame of its own"""
         # Actual text frame
-        self.text_frame = tk.Frame(
-            self.text_container,
+        frame = tk.Frame(
+            parent,
             bd=0,
             relief=tk.FLAT
         )
-        self.text_frame.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=(5, 0))
-        
         # Text widget
-        self.text_display = tk.Text(
-            self.text_frame,
+        display = tk.Text(
+            frame,
             wrap=tk.WORD,
             font=self.text_font,
             padx=20,
@@ -290,263 +793,700 @@ class ComputerBasicsApp:
             bd=0,
             highlightthickness=0
         )
-        self.text_display.pack(fill=tk.BOTH, expand=True)
+        display.pack(fill=tk.BOTH, expand=True)
         
         # Scrollbar
-        scrollbar = ttk.Scrollbar(self.text_display)
+        scrollbar = ttk.Scrollbar(display)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.text_display.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.text_display.yview)
+        display.config(yscrollcommand=scrollbar.set)
+        scrollbar.config(command=display.yview)
         
         # Disable text editing
-        self.text_display.config(state=tk.DISABLED)
+        display.config(state=tk.DISABLED)
+        
+        # Lesson markup styles
+        self.configure_lesson_tags(display)
+        
+        # Search styles
+        display.tag_configure('search_match', background='#fff176', foreground='#333333')
+        return frame, display
+    
+    def create_lesson_view(self, compiled):
+        """Build and render a pooled lesson view"""
+        frame, display = self.create_display(self.text_container)
+        render(display, compiled)
+        return frame, display
+    
+    def configure_lesson_tags(self, text_widget):
+        """Set up the tags produced by the lesson markup compiler"""
+        text_widget.tag_configure('title', font=('Segoe UI', 18, 'bold'), spacing3=12)
+        text_widget.tag_configure('heading', font=('Segoe UI', 14, 'bold'), spacing1=14)
+        text_widget.tag_configure('subheading', font=('Segoe UI', 13, 'bold'), spacing1=12)
+        text_widget.tag_configure('bullet', lmargin1=10, lmargin2=26)
+        text_widget.tag_configure('exercise', lmargin1=10, lmargin2=30)
+        text_widget.tag_configure('tip', font=('Segoe UI', 13, 'italic'), lmargin1=10)
+    
+    def register_theme_roles(self):
+        """Tell the theme engine which role each widget plays"""
+        roles = {
+            'window': [self.root],
+            'frame': [
+                self.main_container, self.content_frame, self.left_panel,
+                self.right_panel, self.button_container, self.text_container
+            ],
+            'header': [self.header_frame],
+            'header_label': [self.title_label, self.subtitle_label, self.search_label],
+            'header_button': [self.theme_button],
+            'text_frame': [self.text_frame],
+            'text': [self.text_display, self.search_entry]
+        }
+        for role, widgets in roles.items():
+            for widget in widgets:
+                self.theme_engine.register(widget, role)
     
     def apply_theme(self):
-        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
-        
         # Update theme button
         self.theme_button.config(text="🌙" if self.dark_mode else "☀️")
         
-        # Apply colors
-        self.root.config(bg=theme['bg'])
-        self.main_container.config(bg=theme['bg'])
-        self.header_frame.config(bg=theme['header_bg'])
-        self.title_label.config(bg=theme['header_bg'], fg=theme['header_fg'])
-        self.subtitle_label.config(bg=theme['header_bg'], fg=theme['header_fg'])
-        self.theme_button.config(
-            bg=theme['header_bg'],
-            fg=theme['header_fg'],
-            activebackground=theme['header_bg'],
-            activeforeground=theme['header_fg']
-        )
-        self.content_frame.config(bg=theme['bg'])
-        self.left_panel.config(bg=theme['bg'])
-        self.right_panel.config(bg=theme['bg'])
-        self.button_container.config(bg=theme['bg'])
-        self.text_container.config(bg=theme['bg'])
-        self.text_frame.config(bg=theme['text_bg'])
-        self.text_display.config(
-            bg=theme['text_bg'],
-            fg=theme['text_fg'],
-            insertbackground=theme['text_fg']
-        )
-        
-        # Practice panel colors
-        if hasattr(self, 'practice_container'):
-            self.practice_container.config(bg=theme['bg'])
-            self.practice_instructions.config(bg=theme['bg'], fg=theme['text_fg'])
-            self.editor_frame.config(bg=theme['bg'])
-            self.practice_editor.config(
-                bg=theme['text_bg'],
-                fg=theme['text_fg'],
-                insertbackground=theme['text_fg']
-            )
-            self.controls_frame.config(bg=theme['bg'])
-            self.practice_status.config(bg=theme['bg'], fg=theme['text_fg'])
-        
-        # Style all buttons
-        for child in self.button_container.winfo_children():
-            if isinstance(child, tk.Button):
-                is_exit = child['text'].startswith("🚪")
-                self.style_button(child, is_exit)
-        
-        # Style practice buttons if they exist
-        if hasattr(self, 'save_button'):
-            self.save_button.config(
-                bg=theme['button_bg'],
-                fg=theme['button_fg'],
-                activebackground=theme['button_active']
-            )
-            self.new_file_button.config(
-                bg=theme['button_bg'],
-                fg=theme['button_fg'],
-                activebackground=theme['button_active']
-            )
+        # Apply colors; the pooled lesson view on screen is not registered with the engine
+        self.theme_engine.apply('dark' if self.dark_mode else 'light')
+        view = self.visible_view
+        if view is not None and view.frame.winfo_exists():
+            self.restyle_view(view)
     
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
         self.apply_theme()
+        if self.diagnostics is not None:
+            self.diagnostics.after('theme_toggle')
     
-    def clear_text(self):
-        self.text_display.config(state=tk.NORMAL)
-        self.text_display.delete(1.0, tk.END)
-        self.text_display.config(state=tk.DISABLED)
+    def list_locales(self):
+        """Fill the language picker when it opens"""
+        self.locale_codes = self.tr.available()
+        self.locale_picker['values'] = [self.tr.language_name(code) for code in self.locale_codes]
     
-    def insert_text(self, text, tags=None):
-        self.text_display.config(state=tk.NORMAL)
-        if tags:
-            self.text_display.insert(tk.END, text, tags)
+    def set_locale(self, code):
+        """Switch language, re-rendering only what is on screen"""
+        if code == self.tr.code:
+            return
+        previous = self.tr.code
+        code = self.tr.set_locale(code)
+        try:
+            lesson_pack = open_locale_pack(code)
+        except (OSError, LessonPackError) as e:
+            # Stay in the old language rather than mix it with the new one
+            self.tr.set_locale(previous)
+            self.locale_var.set(self.tr.language)
+            messagebox.showerror(
+                self.tr("Language"),
+                self.tr("The lessons for this language could not be loaded: {error}").format(error=e)
+            )
+            return
+        self.locale_var.set(self.tr.language)
+        self.root.title(self.tr("Computer Basics Tutorial"))
+        try:
+            atomic_write(state_path('locale'), code)
+        except OSError:
+            pass
+        
+        # Rendered views and the search index belong to the old pack
+        self.lesson_pack.close()
+        self.lesson_pack = lesson_pack
+        self._search_index = None
+        self.lesson_views.clear()
+        self.lesson_sidebar.set_entries(self.lesson_pack)
+        if self._quiz_bank is not None:
+            self._quiz_bank.close()
+            self._quiz_bank = None
+        
+        if self.practice_container is not None:
+            self.scenario_picker['values'] = self.scenario_titles()
+            self.scenario_var.set(self.tr(self.practice.scenario.title))
+        if self.practice_container is not None and self.practice_container.winfo_ismapped():
+            self.update_practice_instructions()
+        elif self.quiz is not None:
+            self.start_quiz()
+        elif self.drill is not None:
+            self.start_shortcut_drill()
+        elif self.current_lesson is not None:
+            self.display_lesson(self.current_lesson)
+        elif self.showing_search_results:
+            self.run_search()
         else:
-            self.text_display.insert(tk.END, text)
-        self.text_display.config(state=tk.DISABLED)
-        self.text_display.see(tk.END)
+            self.show_welcome_message()
+    
+    def render_lesson(self, text):
+        """Show lesson text in one insert, styled by the markup compiler"""
+        render(self.text_display, compile_lesson(text))
+        self.view_stack.show(self.text_frame)
+        self.visible_display = self.text_display
+        self.visible_view = None
     
-    def start_practice_session(self):
-        """Start a new file handling practice session"""
-        self.practice_active = True
-        self.current_practice_step = 1
-        self.practice_completed_steps = set()
-        self.practice_file_path = ""
+    def restyle_view(self, view):
+        """Give a pooled view the current theme's colours if it has older ones"""
+        theme = self.theme_engine.current
+        if view.theme != theme:
+            view.frame.configure(**self.theme_engine.style('text_frame'))
+            view.text.configure(**self.theme_engine.style('text'))
+            view.theme = theme
+    
+    def show_lesson_view(self, view):
+        """Raise a pooled view, restyling it first if the theme changed meanwhile"""
+        self.restyle_view(view)
+        self.view_stack.show(view.frame)
+        self.visible_display = view.text
+        self.visible_view = view
+    
+    def start_practice_session(self, scenario_id=None):
+        """Start a practice session, repeating the current scenario unless one is given"""
+        self.ensure_practice_panel()
+        self.hide_quiz_panel()
+        self.hide_drill_panel()
         
         # Hide regular text display and show practice panel
         self.text_container.pack_forget()
         self.practice_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
         
         # Clear the editor
+        self.close_practice_file()
         self.practice_editor.delete(1.0, tk.END)
+        self.editor_history.reset()
+        result = self.practice.start(scenario_id)
+        self.practice_journal.start(self.practice.scenario.id)
+        self.progress_store.mark_practice(self.learner, self.practice.scenario.id)
+        self.practice_started = self.practice_step_started = time.perf_counter()
+        self.log_event(STARTED, self.practice.scenario.id)
+        if self.telemetry is not None:
+            self.telemetry.reset_stats()
+        self.scenario_var.set(self.tr(self.practice.scenario.title))
         
         # Set up practice session
+        self.show_practice_result(result)
         self.update_practice_instructions()
         self.update_practice_progress()
-        self.practice_status.config(text="Practice session started!")
         
         # Focus the editor
         self.practice_editor.focus_set()
+        if self.diagnostics is not None:
+            self.diagnostics.after('practice_open')
+    
+    def offer_practice_restore(self):
+        """Ask whether to continue a practice session left in the journal"""
+        session = self.practice_journal.recover()
+        if session is None:
+            return
+        if session.scenario not in self.practice.scenarios:
+            self.practice_journal.discard()
+            return
+        if messagebox.askyesno(
+            self.tr("Restore Practice Session"),
+            self.tr("Your last practice session was not finished.\n"
+                    "Do you want to continue where you left off?")
+        ):
+            self.restore_practice_session(session)
+        else:
+            self.practice_journal.discard()
+    
+    def restore_practice_session(self, session):
+        """Start a practice session pre-filled from a recovered journal"""
+        self.start_practice_session(session.scenario)
+        self.practice_editor.insert(1.0, session.text)
+        self.editor_history.reset()
+        
+        result = self.practice.restore(
+            session.step,
+            session.completed,
+            session.file_path,
+            session.scenario
+        )
+        self.record_practice_step()
+        self.show_practice_result(result)
+        self.update_practice_instructions()
+        self.update_practice_progress()
     
     def update_practice_instructions(self):
         """Update the instructions based on current step"""
-        steps = [
-            "1. Type some text in the editor above",
-            "2. Use Ctrl+C to copy some text",
-            "3. Use Ctrl+V to paste the copied text",
-            "4. Use Ctrl+Z to undo your last change",
-            "5. Save your file using Ctrl+S or the Save button"
-        ]
-        
-        instructions = "💻 PRACTICE SESSION: File Handling\n\n"
-        instructions += "Complete these steps to practice file handling:\n\n"
-        
-        for i, step in enumerate(steps, 1):
-            if i in self.practice_completed_steps:
-                instructions += f"✓ {step}\n"
-            elif i == self.current_practice_step:
-                instructions += f"→ {step} (Current step)\n"
-            else:
-                instructions += f"○ {step}\n"
-        
-        self.practice_instructions.config(text=instructions)
+        self.practice_instructions.config(text=self.practice.instructions())
+    
+    def scenario_titles(self):
+        return [self.tr(scenario.title) for scenario in self.practice.scenarios.values()]
     
     def update_practice_progress(self):
         """Update the progress bar"""
-        total_steps = 5
-        completed = len(self.practice_completed_steps)
-        progress = (completed / total_steps) * 100
-        self.practice_progress['value'] = progress
+        self.practice_progress['value'] = self.practice.progress()
+    
+    def record_practice_step(self):
+        self.practice_journal.record_step(
+            self.practice.step,
+            self.practice.completed,
+            self.practice.file_path,
+            self.practice.scenario.id
+        )
     
     def check_practice_step(self, action):
-        """Check if user performed the correct practice step"""
-        if not self.practice_active:
+        """Gather what the learner just did and let the practice engine judge it"""
+        practice = self.practice
+        if action in ('undo', 'redo'):
+            # Always done here, practising or not; Tk's own undo is off
+            has_text = self.practice_editor.compare('end-1c', '!=', '1.0')
+            ok = self.perform_practice_action(action)
+            self.show_practice_result(practice.handle(action, ok=ok, has_text=has_text))
+            return 'break'
+        if not practice.active:
             return
         
-        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        has_text = self.practice_editor.compare('end-1c', '!=', '1.0')
         
-        if action == 'save' and self.current_practice_step == 5:
-            # Save file step
+        if action == 'save' and self.file_view is not None:
+            self.practice_status.config(
+                text=self.tr("📄 Large files open read-only. Click New File to practice saving.")
+            )
+            return 'break'
+        if action == 'save' and practice.accepts('save'):
+            if self.save_writer.busy:
+                return
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+                filetypes=[(self.tr("Text Files"), "*.txt"), (self.tr("All Files"), "*.*")]
             )
+            result = practice.handle('save', ok=bool(file_path), detail=file_path)
             if file_path:
-                try:
-                    with open(file_path, 'w') as f:
-                        f.write(self.practice_editor.get(1.0, tk.END))
-                    self.practice_file_path = file_path
-                    self.complete_practice_step()
-                    self.practice_status.config(
-                        text=f"File saved successfully: {os.path.basename(file_path)}",
-                        fg=theme['success']
-                    )
-                except Exception as e:
-                    self.practice_status.config(
-                        text=f"Error saving file: {str(e)}",
-                        fg=theme['warning']
-                    )
-            else:
-                self.practice_status.config(
-                    text="Please select a location to save your file",
-                    fg=theme['warning']
-                )
-        elif action == 'copy' and self.current_practice_step == 2:
-            if self.practice_editor.tag_ranges(tk.SEL):
-                self.complete_practice_step()
-                self.practice_status.config(
-                    text="Text copied! Now try pasting it with Ctrl+V",
-                    fg=theme['success']
+                # Snapshot the buffer once; the write happens off the Tk thread
+                self.save_writer.save(
+                    file_path,
+                    self.practice_editor.get(1.0, tk.END),
+                    self.practice_save_finished
                 )
+        elif practice.accepts(action):
+            ok = self.perform_practice_action(action)
+            result = practice.handle(action, ok=ok, has_text=has_text)
+        else:
+            result = practice.handle(action, has_text=has_text)
+        
+        self.show_practice_result(result)
+    
+    def perform_practice_action(self, action):
+        """Do the editor side of an expected action and report whether it worked"""
+        editor = self.practice_editor
+        if action in ('copy', 'cut'):
+            return bool(editor.tag_ranges(tk.SEL))
+        if action == 'undo':
+            return self.editor_history.undo()
+        if action == 'redo':
+            return self.editor_history.redo()
+        return True
+    
+    def apply_history_edit(self, op, start, end, text):
+        """Make an undo or redo edit and put the cursor where it happened"""
+        editor = self.practice_editor
+        if op == 'insert':
+            editor.insert(start, text)
+            editor.mark_set(tk.INSERT, end)
+        else:
+            editor.delete(start, end)
+            editor.mark_set(tk.INSERT, start)
+        editor.tag_remove(tk.SEL, 1.0, tk.END)
+        editor.see(tk.INSERT)
+    
+    def open_practice_file(self):
+        """Open a file into the practice editor without blocking the window"""
+        path = filedialog.askopenfilename(
+            filetypes=[
+                (self.tr("Text Files"), "*.txt"),
+                (self.tr("Logs and CSV"), "*.log *.csv"),
+                (self.tr("All Files"), "*.*")
+            ]
+        )
+        if not path:
+            return
+        self.close_practice_file()
+        try:
+            if os.path.getsize(path) > LARGE_FILE_BYTES:
+                self.open_file_view(path)
             else:
-                self.practice_status.config(
-                    text="First select some text to copy",
-                    fg=theme['warning']
-                )
-        elif action == 'paste' and self.current_practice_step == 3:
-            try:
-                self.practice_editor.update()
-                self.complete_practice_step()
-                self.practice_status.config(
-                    text="Text pasted! Now try undoing with Ctrl+Z",
-                    fg=theme['success']
-                )
-            except:
-                self.practice_status.config(
-                    text="First copy some text to paste",
-                    fg=theme['warning']
-                )
-        elif action == 'undo' and self.current_practice_step == 4:
-            try:
-                self.practice_editor.edit_undo()
-                self.complete_practice_step()
-                self.practice_status.config(
-                    text="Change undone! Now save your file with Ctrl+S",
-                    fg=theme['success']
-                )
-            except:
-                self.practice_status.config(
-                    text="Nothing to undo yet",
-                    fg=theme['warning']
-                )
-        elif self.current_practice_step == 1 and self.practice_editor.get(1.0, "end-1c"):
-            # First step - just typing something
-            self.complete_practice_step()
-            self.practice_status.config(
-                text="Great! Now try copying some text with Ctrl+C",
-                fg=theme['success']
-            )
+                self.load_practice_file(path)
+        except (OSError, ValueError) as e:
+            self.practice_status.config(text=self.tr("❌ Could not open file: {error}").format(error=e))
     
-    def complete_practice_step(self):
-        """Mark the current step as completed and move to next"""
-        self.practice_completed_steps.add(self.current_practice_step)
-        self.current_practice_step += 1
+    def load_practice_file(self, path):
+        """Stream a file into the editor in time-sliced chunks"""
+        editor = self.practice_editor
+        self.file_loader = ChunkedLoader(
+            self.root,
+            editor,
+            path,
+            self.practice_file_progress,
+            self.practice_file_loaded
+        )
+        editor.delete(1.0, tk.END)
         
-        if self.current_practice_step > 5:
-            self.practice_completed()
+        # Neither the journal nor the undo history should hold a second copy of the file
+        self.editor_edits.remove_listener(self.practice_journal.record_edit)
+        self.editor_edits.remove_text_listener(self.editor_history.record)
+        self.editor_history.reset()
+        self.practice_status.config(
+            text=self.tr("📂 Opening {name}...").format(name=os.path.basename(path))
+        )
+    
+    def practice_file_progress(self, percent):
+        self.practice_progress['value'] = percent
+    
+    def practice_file_loaded(self, loader):
+        self.file_loader = None
+        self.end_file_load()
+        name = os.path.basename(loader.path)
+        if loader.error is not None:
+            status = self.tr("❌ Could not read {name}: {error}").format(name=name, error=loader.error)
         else:
+            status = self.tr("📂 Opened {name} ({size} KB)").format(name=name, size=loader.size // 1024)
+        self.practice_status.config(text=status)
+    
+    def end_file_load(self):
+        self.editor_edits.add_text_listener(self.editor_history.record)
+        self.editor_edits.add_listener(self.practice_journal.record_edit)
+        if self.practice_journal.active:
+            # One snapshot of the loaded text instead of journaling every chunk
+            self.practice_journal.compact()
+        self.update_practice_progress()
+    
+    def open_file_view(self, path):
+        """Show a large file read-only, materializing only the visible lines"""
+        self.file_view = MappedFileView(path)
+        editor = self.practice_editor
+        self.editor_edits.remove_listener(self.practice_journal.record_edit)
+        self.editor_edits.remove_text_listener(self.editor_history.record)
+        self.editor_history.reset()
+        editor.delete(1.0, tk.END)
+        editor.config(wrap=tk.NONE, yscrollcommand='')
+        editor.bindtags(('MappedView',) + editor.bindtags())
+        self.editor_scroll.config(command=self.scroll_file_view)
+        self.render_file_view()
+        self.practice_status.config(
+            text=self.tr("📄 {name} is large ({size} MB), showing it read-only").format(
+                name=os.path.basename(path),
+                size=f"{self.file_view.size / 1e6:.0f}"
+            )
+        )
+    
+    def file_view_lines(self):
+        """How many lines of the editor font fit in the editor"""
+        line_height = font_metrics(self.text_font).linespace
+        return max(1, self.practice_editor.winfo_height() // line_height)
+    
+    def render_file_view(self):
+        if self.file_view is None:
+            return
+        text = self.file_view.window(self.file_view_lines())
+        editor = self.practice_editor
+        editor.config(state=tk.NORMAL)
+        editor.delete(1.0, tk.END)
+        editor.insert(1.0, text)
+        editor.config(state=tk.DISABLED)
+        self.editor_scroll.set(*self.file_view.fraction())
+    
+    def move_file_view(self, lines):
+        if lines < 0:
+            self.file_view.backward(-lines)
+        else:
+            self.file_view.forward(lines)
+        self.render_file_view()
+        return 'break'
+    
+    def scroll_file_view(self, *args):
+        """Scrollbar command for the mapped view"""
+        if args[0] == 'moveto':
+            self.file_view.moveto(float(args[1]))
+            self.render_file_view()
+        else:
+            count = int(args[1])
+            if args[2] == 'pages':
+                count *= self.file_view_lines()
+            self.move_file_view(count)
+    
+    def close_practice_file(self):
+        """Stop a file load or leave the mapped view, restoring the normal editor"""
+        if self.practice_container is None:
+            return
+        if self.file_loader is not None:
+            self.file_loader.cancel()
+            self.file_loader = None
+            self.end_file_load()
+        if self.file_view is not None:
+            self.file_view.close()
+            self.file_view = None
+            editor = self.practice_editor
+            editor.bindtags(tuple(tag for tag in editor.bindtags() if tag != 'MappedView'))
+            editor.config(
+                state=tk.NORMAL,
+                wrap=tk.WORD,
+                yscrollcommand=self.editor_scroll.set
+            )
+            self.editor_scroll.config(command=editor.yview)
+            self.editor_edits.add_text_listener(self.editor_history.record)
+            self.editor_edits.add_listener(self.practice_journal.record_edit)
+    
+    def select_all_practice_text(self, event=None):
+        """Ctrl+A selects the whole practice document"""
+        self.practice_editor.tag_add(tk.SEL, 1.0, 'end-1c')
+        self.practice_editor.mark_set(tk.INSERT, 'end-1c')
+        self.check_practice_step('select_all')
+        return 'break'
+    
+    def practice_save_finished(self, result):
+        """Called on the Tk thread when a background save completes"""
+        detail = result.path if result.ok else str(result.error)
+        self.show_practice_result(self.practice.handle('saved', ok=result.ok, detail=detail))
+    
+    def show_practice_result(self, result):
+        """Reflect an engine result in the status line, steps and progress bar"""
+        if result.status is None:
+            return
+        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        self.practice_status.config(
+            text=result.status,
+            fg=theme.get(result.level, theme['text_fg'])
+        )
+        
+        if result.advanced:
+            self.record_practice_step()
+            self.report_practice_progress(result)
             self.update_practice_instructions()
             self.update_practice_progress()
+        if result.finished:
+            self.practice_completed()
+    
+    def report_practice_progress(self, result):
+        scenario = self.practice.scenario.id
+        step = max(self.practice.completed)
+        self.progress_store.mark_step(self.learner, scenario, step)
+        now = time.perf_counter()
+        self.log_event(STEP, scenario, step=step, ms=(now - self.practice_step_started) * 1000)
+        self.practice_step_started = now
+        if result.finished:
+            self.log_event(COMPLETED, scenario, ms=(now - self.practice_started) * 1000)
+        if self.classroom is None:
+            return
+        self.classroom.step_completed(scenario, step)
+        if result.finished:
+            self.classroom.session_completed(scenario)
     
     def practice_completed(self):
         """Called when all practice steps are completed"""
-        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        # Show completion message
+        summary = self.tr(self.practice.scenario.summary)
+        if self.telemetry is not None:
+            summary += "\n\n" + self.telemetry.summary()
+        messagebox.showinfo(self.tr("Practice Completed"), summary)
         
-        self.practice_status.config(
-            text="🎉 Congratulations! You completed all practice steps!",
-            fg=theme['success']
+        self.practice_journal.finish()
+    
+    def start_quiz(self):
+        """Quiz on the lesson being read, or on every lesson"""
+        try:
+            bank = self.quiz_bank
+        except (OSError, QuizBankError) as e:
+            messagebox.showerror(
+                self.tr("Quiz"),
+                self.tr("The quiz questions could not be loaded: {error}").format(error=e)
+            )
+            return
+        lesson = self.current_lesson
+        self.quiz_lesson = lesson if lesson in bank.lessons else None
+        lessons = None if self.quiz_lesson is None else [self.quiz_lesson]
+        self.quiz = QuizSession(bank, lessons=lessons, stats=self.quiz_stats)
+        
+        self.hide_practice_panel()
+        self.hide_drill_panel()
+        self.ensure_quiz_panel()
+        self.text_container.pack_forget()
+        self.quiz_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
+        self.next_quiz_question()
+    
+    def next_quiz_question(self):
+        """Show the next question, or start a new quiz once this one is over"""
+        if self.quiz.finished and self.quiz.length:
+            self.start_quiz()
+            return
+        question = self.quiz.next_question()
+        tr = self.tr
+        if self.quiz_lesson is None:
+            title = tr("📝 Quiz: all lessons")
+        else:
+            title = tr("📝 Quiz: {lesson}").format(lesson=self.lesson_pack.entry(self.quiz_lesson).title)
+        progress = tr("Question {number} of {total}").format(
+            number=self.quiz.asked, total=self.quiz.length
+        )
+        self.quiz_heading.config(text=f"{title}  ·  {progress}")
+        self.quiz_feedback.config(text="")
+        self.quiz_score.config(
+            text=tr("Score: {score}/{total}").format(score=self.quiz.score, total=self.quiz.length)
         )
-        self.update_practice_progress()
         
-        # Show completion message
-        messagebox.showinfo(
-            "Practice Completed",
-            "Great job! You've practiced:\n"
-            "- Creating and editing a text file\n"
-            "- Using keyboard shortcuts (Ctrl+C, Ctrl+V, Ctrl+Z, Ctrl+S)\n"
-            "- Saving a file to your computer\n\n"
-            "You can start a new practice session anytime."
+        for button in self.quiz_choices:
+            button.pack_forget()
+        self.quiz_entry.pack_forget()
+        self.quiz_choice_var.set(-1)
+        if question is None:
+            self.quiz_prompt.config(text=tr("There are no questions for this lesson yet."))
+            return
+        self.quiz_prompt.config(text=question.prompt)
+        if question.multiple_choice:
+            for i, choice in enumerate(question.choices):
+                button = self.quiz_choice(i)
+                button.config(text=choice)
+                button.pack(fill=tk.X, pady=2)
+        else:
+            self.quiz_entry.delete(0, tk.END)
+            self.quiz_entry.pack(fill=tk.X, pady=2)
+            self.quiz_entry.focus_set()
+    
+    def check_quiz_answer(self):
+        """Grade the answer given to the current question"""
+        question = self.quiz.question
+        if question is None:
+            return
+        tr = self.tr
+        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        if question.multiple_choice:
+            response = self.quiz_choice_var.get()
+            missing = response < 0
+        else:
+            response = self.quiz_entry.get()
+            missing = not response.strip()
+        if missing:
+            self.quiz_feedback.config(text=tr("Choose or type an answer first."), fg=theme['warning'])
+            return
+        
+        grade = self.quiz.answer(response)
+        if grade.correct:
+            lines = [tr("✅ Correct!")]
+        else:
+            lines = [tr("❌ Not quite. The answer is: {answer}").format(answer=grade.expected)]
+        if question.explain:
+            lines.append(question.explain)
+        if self.quiz.finished:
+            lines.append('')
+            lines.append(tr("🎉 Quiz finished! You scored {score} of {total}.").format(
+                score=self.quiz.score, total=self.quiz.length
+            ))
+        self.quiz_feedback.config(
+            text='\n'.join(lines),
+            fg=theme['success'] if grade.correct else theme['warning']
+        )
+        self.quiz_score.config(
+            text=tr("Score: {score}/{total}").format(score=self.quiz.score, total=self.quiz.length)
         )
+    
+    def hide_quiz_panel(self):
+        if self.quiz_container is not None and self.quiz_container.winfo_ismapped():
+            self.quiz_container.pack_forget()
+            self.text_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
+            self.quiz = None
+    
+    def start_shortcut_drill(self):
+        """Drill the Ctrl shortcuts from the Shortcut Keys lesson"""
+        if 'shortcut_keys' not in self.lesson_pack:
+            return
+        shortcuts = drill_shortcuts(self.lesson_pack.read('shortcut_keys'))
+        if not shortcuts:
+            return
+        self.hide_practice_panel()
+        self.hide_quiz_panel()
+        self.hide_drill_panel()
+        self.ensure_drill_panel()
+        self.drill = ShortcutDrill(shortcuts, self.drill_stats, on_time=self.loop_monitor.on_time)
+        
+        self.text_container.pack_forget()
+        self.drill_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
+        self.drill_container.focus_set()
+        self.drill_prompt.config(text="")
+        self.drill_description.config(text="")
+        self.drill_status.config(text=self.tr("Get ready..."), fg=self.theme_engine.style('label')['fg'])
+        self.update_drill_summary()
+        self.loop_monitor.start()
+        self.drill_job = self.root.after(self.drill.foreperiod_ms(), self.show_drill_prompt)
+    
+    def show_drill_prompt(self):
+        name, description = self.drill.next_prompt()
+        self.drill_prompt.config(text=name)
+        self.drill_description.config(text=description)
+        # Idle callbacks queued now run after Tk has redrawn the prompt
+        drill = self.drill
+        self.root.after_idle(lambda: drill.prompt_shown(time.perf_counter_ns()))
+        self.drill_job = self.root.after(TIMEOUT_MS, self.drill_timeout)
+    
+    def on_drill_key(self, event):
+        now = time.perf_counter_ns()
+        name = key_name(event.keysym, event.state)
+        result = None
+        if name is not None and self.drill is not None:
+            result = self.drill.key(name, now)
+        if result is None:
+            return 'break'
         
-        self.practice_active = False
+        tr = self.tr
+        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        if result.kind == WRONG:
+            self.drill_status.config(
+                text=tr("That was {pressed}. Try {shortcut}.").format(
+                    pressed=result.pressed, shortcut=result.shortcut),
+                fg=theme['warning']
+            )
+            return 'break'
+        if result.kind == HIT:
+            status = tr("✅ {shortcut} in {ms} ms").format(
+                shortcut=result.shortcut, ms=f"{result.latency_ms:.0f}")
+        else:
+            status = tr("✅ {shortcut}, but the app was busy so this one was not timed").format(
+                shortcut=result.shortcut)
+        self.drill_status.config(text=status, fg=theme['success'])
+        self.next_drill_prompt()
+        return 'break'
+    
+    def drill_timeout(self):
+        result = self.drill.timeout()
+        description = self.drill.shortcuts[result.shortcut]
+        theme = self.themes['dark'] if self.dark_mode else self.themes['light']
+        self.drill_status.config(
+            text=self.tr("⌛ Time's up: {shortcut} is {description}").format(
+                shortcut=result.shortcut, description=description),
+            fg=theme['warning']
+        )
+        self.next_drill_prompt()
+    
+    def next_drill_prompt(self):
+        if self.drill_job is not None:
+            self.root.after_cancel(self.drill_job)
+        self.drill_prompt.config(text="")
+        self.drill_description.config(text="")
+        self.update_drill_summary()
+        self.drill_job = self.root.after(self.drill.foreperiod_ms(), self.show_drill_prompt)
+    
+    def update_drill_summary(self):
+        tr = self.tr
+        lines = [tr("{count} timed so far").format(count=self.drill.hits)]
+        slowest = self.drill.slowest()
+        if slowest:
+            times = ', '.join(
+                f"{name} {self.drill_stats.get(name).recent:.0f} ms" for name in slowest
+            )
+            lines.append(tr("Slowest, so asked more often: {shortcuts}").format(shortcuts=times))
+        self.drill_summary.config(text='\n'.join(lines))
+    
+    def hide_drill_panel(self):
+        if self.drill_container is not None and self.drill_container.winfo_ismapped():
+            if self.drill_job is not None:
+                self.root.after_cancel(self.drill_job)
+                self.drill_job = None
+            self.loop_monitor.stop()
+            self.drill_container.pack_forget()
+            self.text_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
+            self.drill = None
     
     def show_welcome_message(self):
-        self.clear_text()
+        self.current_lesson = None
+        self.lesson_sidebar.select(None)
+        self.showing_search_results = False
         welcome_text = """🌟 Welcome to Computer Basics Tutorial! 🌟
 
 This modern application will guide you through the fundamental skills needed to use a computer effectively.
@@ -566,225 +1506,274 @@ This modern application will guide you through the fundamental skills needed to
 
 Click on any lesson button to begin your learning journey!
 """
-        self.insert_text(welcome_text)
+        self.render_lesson(self.tr(welcome_text))
     
-    def show_mouse_keyboard(self):
+    def show_lesson(self, key):
+        """Show a lesson from the lesson pack"""
         self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """🖱️ ⌨️ Using Mouse and Keyboard - Lesson 1
-
-The mouse and keyboard are your primary tools for interacting with the computer.
-
-=== MOUSE BASICS ===
-
-• Moving: Slide the mouse to move the pointer on screen
-• Left Click: Press once to select items
-• Double Click: Press quickly twice to open items
-• Right Click: Press to see context menus
-• Scrolling: Use the wheel to navigate pages
-
-=== KEYBOARD BASICS ===
-
-• Typing: Letters and numbers for text input
-• Enter: Confirm actions or create new lines
-• Spacebar: Add spaces between words
-• Backspace/Delete: Remove text
-• Arrow Keys: Navigate without mouse
-• Function Keys: Special actions (F1-F12)
-
-🔹 Practice Exercises:
-1. Open Notepad and type a short sentence
-2. Use the mouse to select part of your text
-3. Try copying (Ctrl+C) and pasting (Ctrl+V) the text
-4. Save your file (Ctrl+S) to your desktop
-
-💡 Try these in the Practice Session!
-"""
-        self.insert_text(lesson_text)
+        self.hide_quiz_panel()
+        self.hide_drill_panel()
+        self.display_lesson(key)
+        self.progress_store.mark_lesson(self.learner, key)
+        self.log_event(LESSON, key)
+        if self.classroom is not None:
+            self.classroom.lesson_viewed(key)
+        if self.diagnostics is not None:
+            self.diagnostics.after('lesson_switch')
     
-    def show_create_folder(self):
+    def display_lesson(self, key):
+        view = self.lesson_views.view(key, lambda: compile_lesson(self.lesson_pack.read(key)))
+        self.show_lesson_view(view)
+        self.current_lesson = key
+        self.lesson_sidebar.select(key)
+        self.showing_search_results = False
+        self.highlight_search_matches(key)
+    
+    def on_search_changed(self, *args):
+        """Re-run the search shortly after the learner stops typing"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.run_search)
+    
+    def run_search(self):
+        self.search_job = None
+        query = self.search_var.get().strip()
+        if query:
+            self.show_search_results(query)
+        elif self.showing_search_results:
+            self.show_welcome_message()
+        else:
+            self.visible_display.tag_remove('search_match', 1.0, tk.END)
+    
+    def show_search_results(self, query):
+        """List the lessons matching a query, one clickable line per lesson"""
+        hits = self.search_index.search(query)
+        tr = self.tr
+        lines = [tr('🔍 Search results for "{query}"').format(query=query), '']
+        self.search_result_lines = {}
+        
+        if not hits:
+            lines.append(tr("No lessons match your search. Try a shorter word."))
+        for hit in hits:
+            entry = self.lesson_pack.entry(hit.key)
+            lesson_lines = self.lesson_pack.read(hit.key).split('\n')
+            count = len(hit.positions)
+            self.search_result_lines[len(lines) + 1] = hit.key
+            label = tr("{count} match") if count == 1 else tr("{count} matches")
+            lines.append(f"{entry.title}  ({label.format(count=count)})")
+            lines.append(f"      {lesson_lines[hit.first_line() - 1].strip()}")
+            lines.append('')
+        
         self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """📁 Creating Folders - Lesson 2
-
-Folders help you organize files logically on your computer.
-
-=== METHOD 1: DESKTOP ===
-1. Right-click on an empty desktop area
-2. Hover over "New" in the menu
-3. Click "Folder"
-4. Type a descriptive name
-5. Press Enter to confirm
-
-=== METHOD 2: FILE EXPLORER ===
-1. Open File Explorer (Win+E)
-2. Navigate to the desired location
-3. Click "New Folder" in the toolbar
-4. Name your folder and press Enter
-
-💡 Pro Tips:
-• Use clear, specific names (e.g., "Tax Documents 2023")
-• Create subfolders for better organization
-• Color-code folders for visual sorting (right-click > Properties)
-
-🔹 Practice Exercise:
-1. Create a folder called "Learning" on your desktop
-2. Inside it, create subfolders: "Documents", "Images", "Projects"
-3. Try renaming a folder (right-click > Rename)
-"""
-        self.insert_text(lesson_text)
+        self.hide_quiz_panel()
+        self.hide_drill_panel()
+        self.render_lesson('\n'.join(lines))
+        self.current_lesson = None
+        self.lesson_sidebar.select(None)
+        self.showing_search_results = True
+        
+        result_ranges = []
+        for line_no in self.search_result_lines:
+            result_ranges.extend((f'{line_no}.0', f'{line_no}.end'))
+        if result_ranges:
+            self.text_display.tag_add('search_result', *result_ranges)
+    
+    def open_search_result(self, event):
+        index = self.text_display.index(f'@{event.x},{event.y}')
+        key = self.search_result_lines.get(int(index.split('.')[0]))
+        if key is not None:
+            self.show_lesson(key)
+    
+    def highlight_search_matches(self, key):
+        """Highlight the current query's matches using ranges from the index"""
+        display = self.visible_display
+        display.tag_remove('search_match', 1.0, tk.END)
+        query = self.search_var.get().strip()
+        if not query:
+            return
+        for hit in self.search_index.search(query):
+            if hit.key == key:
+                text = self.lesson_pack.read(key)
+                ranges = text_ranges(text, hit.positions, self.tcl_wide_chars)
+                display.tag_add('search_match', *ranges)
+                display.see(ranges[0])
+                break
+    
+    def show_mouse_keyboard(self):
+        self.show_lesson('mouse_keyboard')
+    
+    def show_create_folder(self):
+        self.show_lesson('create_folder')
     
     def show_create_text_file(self):
-        self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """📝 Creating Text Files - Lesson 3
-
-Text files are simple documents for notes, lists, and information.
-
-=== METHOD 1: NOTEPAD ===
-1. Press Win key and type "Notepad"
-2. Open the Notepad application
-3. Type your content
-4. Click File > Save (or Ctrl+S)
-5. Choose location and filename
-6. Click Save
-
-=== METHOD 2: RIGHT-CLICK ===
-1. Right-click in a folder or desktop
-2. Select New > Text Document
-3. Name the file (e.g., "Shopping List.txt")
-4. Double-click to open and edit
-
-🛠️ Advanced Tips:
-• Change file extension if needed (.txt, .csv, etc.)
-• Use WordPad for formatted text
-• Try Markdown for structured notes
-
-🔹 Practice Exercise:
-1. Try creating a text file in the Practice Session
-2. List 3 computer skills you want to learn
-3. Save it in your "Learning" folder
-4. Try opening it again to edit
-"""
-        self.insert_text(lesson_text)
+        self.show_lesson('create_text_file')
     
     def show_shortcut_keys(self):
-        self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """⌨️ Essential Shortcut Keys - Lesson 4
-
-Keyboard shortcuts save time and make you more efficient.
-
-=== UNIVERSAL SHORTCUTS ===
-• Ctrl+C: Copy
-• Ctrl+X: Cut
-• Ctrl+V: Paste
-• Ctrl+Z: Undo
-• Ctrl+Y: Redo
-• Ctrl+A: Select all
-• Ctrl+S: Save
-• Ctrl+P: Print
-
-=== WINDOWS SPECIFIC ===
-• Win+E: Open File Explorer
-• Win+D: Show desktop
-• Alt+Tab: Switch apps
-• Win+L: Lock computer
-• Win+V: Clipboard history
-
-=== TEXT EDITING ===
-• Ctrl+B: Bold
-• Ctrl+I: Italic
-• Ctrl+U: Underline
-• Ctrl+F: Find
-• Ctrl+H: Replace
-
-📊 Productivity Boost:
-Practice these shortcuts in the Practice Session:
-1. Ctrl+C to copy text
-2. Ctrl+V to paste text
-3. Ctrl+Z to undo changes
-4. Ctrl+S to save your work
-"""
-        self.insert_text(lesson_text)
+        self.show_lesson('shortcut_keys')
     
     def show_terminology(self):
-        self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """📖 Computer Terminology - Lesson 5
-
-Understanding these terms will help you learn faster.
-
-=== HARDWARE ===
-• CPU: The "brain" of your computer
-• RAM: Temporary memory for running programs
-• SSD/HDD: Permanent storage devices
-• GPU: Handles graphics processing
-
-=== SOFTWARE ===
-• OS: Operating System (Windows, macOS)
-• App/Program: Software tools
-• Browser: For accessing the internet
-• Driver: Lets hardware and software communicate
-
-=== INTERFACE ===
-• Desktop: Main workspace
-• Taskbar: Bottom app launcher
-• Window: App container
-• Icon: Visual representation
-
-🌐 Internet Terms:
-• URL: Website address
-• Browser: Chrome, Edge, Firefox
-• Download/Upload: Transferring files
-• Cloud: Online storage
-
-🔹 Knowledge Check:
-1. What do you call the bar at the bottom of the screen?
-2. What's the difference between RAM and storage?
-3. Name three web browsers
-"""
-        self.insert_text(lesson_text)
+        self.show_lesson('terminology')
     
     def show_getting_help(self):
-        self.hide_practice_panel()
-        self.clear_text()
-        lesson_text = """❓ Getting Help - Lesson 6
-
-Never feel stuck - help is always available!
-
-=== BUILT-IN HELP ===
-1. F1 key in most applications
-2. Windows: Start > "Get Help"
-3. App-specific help menus
-
-=== ONLINE RESOURCES ===
-• Microsoft Support: support.microsoft.com
-• YouTube tutorials (search specific tasks)
-• Reddit communities (r/techsupport)
-• Stack Overflow for technical questions
-
-🆘 Asking Effective Questions:
-1. Describe what you're trying to do
-2. Include exact error messages
-3. Note what you've already tried
-4. Provide system details if relevant
-
-🔹 Practice Exercise:
-1. Press F1 in File Explorer
-2. Search online for "how to change desktop background"
-3. Bookmark helpful tech support sites
-"""
-        self.insert_text(lesson_text)
+        self.show_lesson('getting_help')
     
     def hide_practice_panel(self):
         """Hide the practice panel and show normal content"""
-        if self.practice_container.winfo_ismapped():
+        if self.practice_container is not None and self.practice_container.winfo_ismapped():
             self.practice_container.pack_forget()
             self.text_container.pack(fill=tk.BOTH, expand=True, padx=(0, 5), pady=(0, 5))
-            self.practice_active = False
+            self.close_practice_file()
+            self.practice.stop()
+            self.practice_journal.finish()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Computer Basics Tutorial")
+    parser.add_argument(
+        '--record-practice',
+        metavar='FILE',
+        help="append practice session actions to FILE for practice_replay.py"
+    )
+    parser.add_argument(
+        '--startup-report',
+        metavar='FILE',
+        help="time each startup phase up to the first drawn frame and write "
+             "the numbers as JSON to FILE ('-' for stdout)"
+    )
+    parser.add_argument(
+        '--exit-after-startup',
+        action='store_true',
+        help="quit as soon as the first frame is drawn (for benchmarks)"
+    )
+    parser.add_argument(
+        '--classroom',
+        metavar='HOST:PORT',
+        help="report lesson views and practice progress to a classroom server"
+    )
+    parser.add_argument(
+        '--learner',
+        default=getpass.getuser(),
+        help="whose progress to record, also shown in the classroom view (default: login name)"
+    )
+    parser.add_argument(
+        '--class-name',
+        metavar='NAME',
+        default='',
+        help="class to file this learner's events under in progress exports"
+    )
+    parser.add_argument(
+        '--telemetry',
+        action='store_true',
+        help="record practice editor keystrokes to measure typing speed and shortcut use"
+    )
+    parser.add_argument(
+        '--lesson-view-budget',
+        type=int,
+        metavar='KB',
+        default=VIEW_BUDGET_BYTES // 1024,
+        help="memory to spend keeping rendered lessons for instant switching (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--undo-budget',
+        type=int,
+        metavar='KB',
+        default=UNDO_BUDGET_BYTES // 1024,
+        help="memory the practice editor's undo history may use (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--locale',
+        metavar='CODE',
+        help="interface and lesson language, for example es (default: the last one chosen)"
+    )
+    parser.add_argument(
+        '--stall-report',
+        metavar='FILE',
+        help="where to write the event loop responsiveness report ('-' for stdout on exit; "
+             "default: a new file per session in responsiveness/ in the state directory)"
+    )
+    parser.add_argument(
+        '--leak-report',
+        metavar='FILE',
+        help="count widgets, Tcl commands, bindings and Python memory after every lesson "
+             "switch and theme toggle, and write the growth report to FILE on exit ('-' for stdout)"
+    )
+    args = parser.parse_args()
+    
+    locale = args.locale
+    if locale is None:
+        try:
+            with open(state_path('locale'), encoding='utf-8') as f:
+                locale = f.read().strip() or DEFAULT_LOCALE
+        except OSError:
+            locale = DEFAULT_LOCALE
+    
+    profile = None
+    if args.startup_report or args.exit_after_startup:
+        profile = StartupProfile(_IMPORTS_STARTED)
+        profile.mark('imports', _IMPORTS_DONE)
+    
+    engine = None
+    if args.record_practice:
+        from practice_replay import RecordingEngine
+        engine = RecordingEngine(args.record_practice)
+    
+    classroom = None
+    if args.classroom:
+        from classroom_client import ClassroomReporter, parse_address
+        host, port = parse_address(args.classroom)
+        classroom = ClassroomReporter(host, port, args.learner)
+    
     root = tk.Tk()
-    app = ComputerBasicsApp(root)
-    root.mainloop()
\ No newline at end of file
+    
+    diagnostics = None
+    if args.leak_report:
+        from leak_monitor import LeakMonitor
+        diagnostics = LeakMonitor(root)
+    
+    telemetry = None
+    if args.telemetry:
+        from keystroke_telemetry import KeystrokeTelemetry
+        telemetry = KeystrokeTelemetry(root, state_path('telemetry', 'keystrokes.ktl'))
+    
+    app = ComputerBasicsApp(
+        root,
+        practice_engine=engine,
+        startup_profile=profile,
+        classroom=classroom,
+        learner=args.learner,
+        telemetry=telemetry,
+        lesson_view_budget=args.lesson_view_budget * 1024,
+        locale=locale,
+        class_name=args.class_name,
+        undo_budget=args.undo_budget * 1024,
+        diagnostics=diagnostics
+    )
+    
+    if profile is not None:
+        def startup_finished(profile):
+            if args.startup_report:
+                profile.write(args.startup_report)
+            if args.exit_after_startup:
+                root.quit()
+        profile.watch_first_frame(app.text_display, startup_finished)
+    
+    # Always on: measures event loop lag and blames stalls on the handler running.
+    # The report is kept up to date while running, so a killed or frozen app leaves one
+    stall_report = args.stall_report
+    if stall_report is None:
+        try:
+            stall_report = session_report_path(os.path.join(state_dir(), 'responsiveness'))
+        except OSError:
+            pass
+    stalls = StallMonitor(root, report_path=None if stall_report == '-' else stall_report)
+    stalls.start()
+    
+    root.mainloop()
+    app.shutdown()
+    stalls.stop()
+    if stall_report is not None:
+        try:
+            stalls.write(stall_report)
+        except OSError:
+            pass
+    if diagnostics is not None:
+        diagnostics.write(args.leak_report)
\ No newline at end of file
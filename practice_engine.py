@@ -0,0 +1,159 @@
+"""UI-independent practice session logic.
+
+The PracticeEngine runs a practice scenario (see practice_scenarios.py): it
+knows the current step, which action completes it and what to tell the
+learner. It never touches Tk: the app gathers the facts about an action (was
+there a selection? did undo succeed? where was the file saved?) and passes
+them in, and gets back a StepResult describing the status message and
+whether the session advanced or finished.
+
+That keeps the whole flow testable without a display; see practice_replay.py.
+
+Every message the engine returns goes through translate() before any
+{file}/{detail} formatting, so the app can plug in the active locale's
+catalog and the scenario files stay in English.
+"""
+import os
+
+from practice_scenarios import ANY_ACTION, DEFAULT_SCENARIO, load_scenarios
+
+# Status levels map onto theme colours in the app
+SUCCESS = 'success'
+WARNING = 'warning'
+INFO = 'info'
+
+
+class StepResult:
+    """What the UI should show after an action"""
+
+    __slots__ = ('status', 'level', 'advanced', 'finished')
+
+    def __init__(self, status=None, level=INFO, advanced=False, finished=False):
+        self.status = status
+        self.level = level
+        self.advanced = advanced
+        self.finished = finished
+
+    def __repr__(self):
+        return (f"StepResult({self.status!r}, {self.level!r}, "
+                f"advanced={self.advanced}, finished={self.finished})")
+
+
+IGNORED = StepResult()
+
+
+def untranslated(message):
+    return message
+
+
+class PracticeEngine:
+    """State machine that runs one practice scenario at a time"""
+
+    def __init__(self, scenarios=None, scenario_id=DEFAULT_SCENARIO, translate=untranslated):
+        self.scenarios = scenarios if scenarios is not None else load_scenarios()
+        self.translate = translate
+        self.scenario = self.scenarios[scenario_id]
+        self.active = False
+        self.step = 0
+        self.completed = set()
+        self.file_path = ""
+
+    @property
+    def total_steps(self):
+        return self.scenario.total_steps
+
+    def start(self, scenario_id=None):
+        if scenario_id is not None:
+            self.scenario = self.scenarios[scenario_id]
+        self.active = True
+        self.step = 1
+        self.completed = set()
+        self.file_path = ""
+        return StepResult(self.translate("Practice session started!"), INFO)
+
+    def restore(self, step, completed, file_path="", scenario_id=None):
+        if scenario_id is not None:
+            self.scenario = self.scenarios[scenario_id]
+        self.active = True
+        self.step = step
+        self.completed = set(completed)
+        self.file_path = file_path
+        return StepResult(self.translate("Practice session restored!"), INFO)
+
+    def stop(self):
+        self.active = False
+
+    def accepts(self, action):
+        """True when the current step expects exactly this action
+
+        The app uses this to avoid opening a save dialog when the action
+        cannot count yet.
+        """
+        return self.active and (self.step, action) in self.scenario.accepted
+
+    def handle(self, action, ok=True, has_text=False, detail=''):
+        """Check an action against the current step
+
+        ok means the action itself worked: there was a selection to copy, an
+        edit to undo, a location chosen or a file written. has_text tells
+        whether the editor holds any text. detail carries a file path or an
+        error message.
+        """
+        if not self.active:
+            return IGNORED
+        table = self.scenario.table
+        transition = table.get((self.step, action)) or table.get((self.step, ANY_ACTION))
+        if transition is None:
+            return IGNORED
+
+        check = transition.check
+        passed = ok if check == 'ok' else has_text if check == 'has_text' else True
+        if not passed:
+            if transition.failure is None:
+                return IGNORED
+            return StepResult(self._format(transition.failure, detail), WARNING)
+
+        if action == 'saved':
+            self.file_path = detail
+        message = self._format(transition.success, detail)
+        if transition.advances:
+            return self.advance(message)
+        return StepResult(message, INFO)
+
+    def _format(self, message, detail):
+        message = self.translate(message)
+        if '{' not in message:
+            return message
+        return message.format(file=os.path.basename(detail), detail=detail)
+
+    def advance(self, status):
+        """Mark the current step as completed and move to the next"""
+        self.completed.add(self.step)
+        self.step += 1
+        if self.step > self.total_steps:
+            self.active = False
+            return StepResult(self.translate(self.scenario.completed), SUCCESS,
+                              advanced=True, finished=True)
+        return StepResult(status, SUCCESS, advanced=True)
+
+    def instructions(self):
+        """Instruction text with each step marked done, current or pending"""
+        scenario = self.scenario
+        tr = self.translate
+        lines = [
+            tr("💻 PRACTICE SESSION: {title}").format(title=tr(scenario.title)) + "\n\n",
+            f"{tr(scenario.intro)}\n\n"
+        ]
+        for i, instruction in enumerate(scenario.instructions, 1):
+            step = f"{i}. {tr(instruction)}"
+            if i in self.completed:
+                lines.append(f"✓ {step}\n")
+            elif i == self.step:
+                lines.append(tr("→ {step} (Current step)").format(step=step) + "\n")
+            else:
+                lines.append(f"○ {step}\n")
+        return ''.join(lines)
+
+    def progress(self):
+        """Percentage of steps completed"""
+        return (len(self.completed) / self.total_steps) * 100
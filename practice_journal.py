@@ -0,0 +1,291 @@
+"""Crash-safe autosave journal for practice sessions.
+
+Editor edits and step transitions are appended to a journal file as JSON
+lines. Records are buffered in memory and written in one batch from an idle
+callback a couple of seconds after the first unsaved change, never per
+keystroke, and runs of typed characters are merged into a single insert.
+
+Every SNAPSHOT_EVERY records the journal is compacted: the full editor text
+and session state are written atomically to a snapshot file and the journal
+restarts empty. Snapshot and journal share a generation number, so a crash
+between the two steps can never replay old edits on top of a newer snapshot.
+Recovery loads the snapshot and replays at most one journal's worth of
+edits into an in-memory line buffer, which takes milliseconds however long
+the session ran.
+
+If the journal cannot be written (a full or read-only disk), journaling
+stops for the rest of the session instead of interrupting the practice.
+"""
+import json
+import os
+
+from save_pipeline import atomic_write
+
+FLUSH_DELAY_MS = 2000
+SNAPSHOT_EVERY = 2000
+
+JOURNAL_NAME = 'practice.journal'
+SNAPSHOT_NAME = 'practice.snapshot'
+
+
+def _split_index(index):
+    line, col = index.split('.')
+    return int(line), int(col)
+
+
+class TextModel:
+    """Line buffer that applies Text widget edits without a widget
+
+    Tk's Text always ends with a newline that cannot be deleted; the model
+    mirrors that with a trailing empty line. When Tcl stores characters
+    outside the BMP as surrogate pairs (wide_chars), column numbers count
+    those characters twice and are mapped back here.
+    """
+
+    def __init__(self, text='', wide_chars=False):
+        self.lines = (text + '\n').split('\n')
+        self.wide_chars = wide_chars
+
+    def _col(self, line, col):
+        if not self.wide_chars or line.isascii():
+            return min(col, len(line))
+        units = 0
+        for i, ch in enumerate(line):
+            if units >= col:
+                return i
+            units += 2 if ord(ch) > 0xFFFF else 1
+        return len(line)
+
+    def _offset(self, index):
+        line_no, col = _split_index(index)
+        line_no = min(max(line_no, 1), len(self.lines) - 1)
+        return line_no - 1, self._col(self.lines[line_no - 1], col)
+
+    def insert(self, index, text):
+        row, col = self._offset(index)
+        line = self.lines[row]
+        new_lines = (line[:col] + text + line[col:]).split('\n')
+        self.lines[row:row + 1] = new_lines
+
+    def delete(self, start, end):
+        row1, col1 = self._offset(start)
+        line_no, col = _split_index(end)
+        if line_no >= len(self.lines):
+            row2, col2 = len(self.lines) - 2, len(self.lines[-2])
+        else:
+            row2, col2 = self._offset(end)
+        if (row2, col2) <= (row1, col1):
+            return
+        self.lines[row1:row2 + 1] = [self.lines[row1][:col1] + self.lines[row2][col2:]]
+
+    def text(self):
+        return '\n'.join(self.lines[:-1])
+
+
+class RecoveredSession:
+    """Practice session state rebuilt from the snapshot and journal"""
+
+    def __init__(self, text, scenario, step, completed, file_path):
+        self.text = text
+        self.scenario = scenario
+        self.step = step
+        self.completed = completed
+        self.file_path = file_path
+
+
+class PracticeJournal:
+    """Buffers practice edits and steps, flushing them in idle-time batches"""
+
+    def __init__(self, root, directory, get_text, wide_chars=False,
+                 flush_delay_ms=FLUSH_DELAY_MS, snapshot_every=SNAPSHOT_EVERY):
+        self.root = root
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.get_text = get_text
+        self.wide_chars = wide_chars
+        self.flush_delay_ms = flush_delay_ms
+        self.snapshot_every = snapshot_every
+
+        self.active = False
+        self.generation = 0
+        self.scenario = None
+        self.step = 0
+        self.completed = []
+        self.file_path = ''
+        self._buffer = []
+        self._records_in_journal = 0
+        self._flush_job = None
+
+    # Recording
+
+    def start(self, scenario=None):
+        """Begin journaling a fresh session, dropping any previous one"""
+        self.discard()
+        self.active = True
+        self.scenario = scenario
+        self.step = 1
+        self.completed = []
+        self.file_path = ''
+        self._write_snapshot('')
+
+    def record_edit(self, op, a, b):
+        if not self.active:
+            return
+        if op == 'insert':
+            last = self._buffer[-1] if self._buffer else None
+            # Merge typing runs: an insert right after the previous one on the same line
+            if last and last['op'] == 'i' and '\n' not in last['t'] \
+                    and self._advance(last['p'], last['t']) == a:
+                last['t'] += b
+                return
+            self._append({'op': 'i', 'p': a, 't': b})
+        else:
+            self._append({'op': 'd', 's': a, 'e': b})
+
+    def record_step(self, step, completed, file_path='', scenario=None):
+        if not self.active:
+            return
+        self.scenario = scenario
+        self.step = step
+        self.completed = sorted(completed)
+        self.file_path = file_path
+        self._append({'op': 's', 'scenario': scenario, 'step': step,
+                      'done': self.completed, 'path': file_path})
+
+    def finish(self):
+        """The session ended normally; nothing needs recovering"""
+        if self.active:
+            self.active = False
+            self.discard()
+
+    def _advance(self, index, text):
+        line, col = _split_index(index)
+        if self.wide_chars:
+            width = sum(2 if ord(ch) > 0xFFFF else 1 for ch in text)
+        else:
+            width = len(text)
+        return f'{line}.{col + width}'
+
+    def _append(self, record):
+        self._buffer.append(record)
+        if self._flush_job is None:
+            self._flush_job = self.root.after(
+                self.flush_delay_ms,
+                lambda: self.root.after_idle(self.flush)
+            )
+
+    # Persistence
+
+    def flush(self):
+        """Append buffered records to the journal, compacting when it gets long"""
+        self._flush_job = None
+        if not self._buffer or not self.active:
+            self._buffer.clear()
+            return
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self._buffer)
+        self._records_in_journal += len(self._buffer)
+        self._buffer.clear()
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        except OSError:
+            self._disable()
+            return
+        if self._records_in_journal >= self.snapshot_every:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and start an empty journal"""
+        self._buffer.clear()
+        self._write_snapshot(self.get_text())
+
+    def _write_snapshot(self, text):
+        self.generation += 1
+        snapshot = {
+            'generation': self.generation,
+            'text': text,
+            'scenario': self.scenario,
+            'step': self.step,
+            'done': self.completed,
+            'path': self.file_path
+        }
+        try:
+            atomic_write(self.snapshot_path, json.dumps(snapshot, ensure_ascii=False))
+            atomic_write(self.journal_path, json.dumps({'generation': self.generation}) + '\n')
+        except OSError:
+            self._disable()
+            return
+        self._records_in_journal = 0
+
+    def _disable(self):
+        """The journal cannot be written; stop journaling this session"""
+        self.active = False
+        self._buffer.clear()
+
+    def close(self):
+        """Flush pending records; call on clean shutdown"""
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = None
+        self.flush()
+
+    def discard(self):
+        self._buffer.clear()
+        self._records_in_journal = 0
+        for path in (self.journal_path, self.snapshot_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # Recovery
+
+    def recover(self):
+        """Rebuild an unfinished session, or return None if there is none
+
+        A snapshot that cannot be used (an older format, or edited by hand)
+        is discarded along with its journal.
+        """
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            model = TextModel(snapshot['text'], self.wide_chars)
+            scenario = snapshot.get('scenario')
+            step = snapshot['step']
+            completed = set(snapshot['done'])
+            file_path = snapshot['path']
+            generation = snapshot['generation']
+        except (KeyError, TypeError, ValueError, AttributeError):
+            self.discard()
+            return None
+
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+                if header.get('generation') == generation:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # A torn final line from the crash; everything before it is good
+                            break
+                        op = record['op']
+                        if op == 'i':
+                            model.insert(record['p'], record['t'])
+                        elif op == 'd':
+                            model.delete(record['s'], record['e'])
+                        elif op == 's':
+                            scenario = record.get('scenario')
+                            step = record['step']
+                            completed = set(record['done'])
+                            file_path = record['path']
+        except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+            # Replay stops at a record it cannot apply; the edits before it are kept
+            pass
+
+        self.generation = generation
+        return RecoveredSession(model.text(), scenario, step, completed, file_path)
@@ -0,0 +1,191 @@
+"""Record and replay practice sessions without a display.
+
+A session stream is a JSON-lines file, one action per line:
+
+    {"a": "start", "scenario": "file_handling"}
+    {"a": "copy", "ok": true, "text": true, "d": "", "step": 3, "status": "Text copied! ..."}
+
+"step" and "status" are what the engine answered when the stream was
+recorded; replaying checks the engine still answers the same, which makes a
+recorded session a regression test for scenario changes. Statuses are
+recorded untranslated, so a session recorded in any language replays
+against a plain PracticeEngine. Streams are parsed
+up front so the replay loop measures only the engine.
+
+    python practice_replay.py session.jsonl ...     replay and verify streams
+    python practice_replay.py --generate 500000     load test on a synthetic stream
+    python modern_computer_basics.modren.py --record-practice session.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from practice_engine import PracticeEngine
+from practice_scenarios import load_scenarios
+
+
+class RecordingEngine(PracticeEngine):
+    """PracticeEngine that appends every action and its outcome to a stream file
+
+    The app translates the engine's messages. An untranslated engine is fed
+    the same actions alongside, and its answers are the ones recorded.
+    """
+
+    def __init__(self, path, scenarios=None):
+        super().__init__(scenarios)
+        self.reference = PracticeEngine(self.scenarios)
+        self.stream = open(path, 'a', encoding='utf-8')
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def start(self, scenario_id=None):
+        result = super().start(scenario_id)
+        status = self.reference.start(scenario_id).status
+        self._write({'a': 'start', 'scenario': self.scenario.id,
+                     'step': self.step, 'status': status})
+        return result
+
+    def restore(self, step, completed, file_path="", scenario_id=None):
+        result = super().restore(step, completed, file_path, scenario_id)
+        status = self.reference.restore(step, completed, file_path, scenario_id).status
+        self._write({'a': 'restore', 'scenario': self.scenario.id, 'step': step,
+                     'done': sorted(completed), 'd': file_path, 'status': status})
+        return result
+
+    def handle(self, action, ok=True, has_text=False, detail=''):
+        result = super().handle(action, ok, has_text, detail)
+        status = self.reference.handle(action, ok, has_text, detail).status
+        self._write({'a': action, 'ok': ok, 'text': has_text, 'd': detail,
+                     'step': self.step, 'status': status})
+        return result
+
+    def stop(self):
+        super().stop()
+        self.reference.stop()
+
+    def close(self):
+        self.stream.close()
+
+
+def load_stream(path):
+    """Parse a stream file into (action, ok, has_text, detail, step, status) tuples
+
+    For start and restore events detail is the scenario id, and for restore
+    ok carries the completed steps.
+    """
+    events = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            action = record['a']
+            if action in ('start', 'restore'):
+                detail = record.get('scenario')
+                ok = record.get('done', ())
+            else:
+                detail = record.get('d', '')
+                ok = record.get('ok', True)
+            events.append((
+                action,
+                ok,
+                record.get('text', False),
+                detail,
+                record.get('step'),
+                record.get('status')
+            ))
+    return events
+
+
+def generate_stream(count, scenario_ids=(None,), seed=0):
+    """Random but plausible learner actions, for load testing"""
+    rng = random.Random(seed)
+    actions = ['type', 'copy', 'cut', 'paste', 'undo', 'redo', 'select_all', 'save', 'saved']
+    events = [('start', (), False, scenario_ids[0], None, None)]
+    for _ in range(count - 1):
+        if rng.random() < 0.01:
+            events.append(('start', (), False, rng.choice(scenario_ids), None, None))
+            continue
+        action = rng.choice(actions)
+        detail = '/tmp/practice.txt' if action in ('save', 'saved') else ''
+        events.append((action, rng.random() < 0.8, rng.random() < 0.9, detail, None, None))
+    return events
+
+
+class ReplayReport:
+    def __init__(self, events, seconds, advanced, finished, mismatches):
+        self.events = events
+        self.seconds = seconds
+        self.advanced = advanced
+        self.finished = finished
+        self.mismatches = mismatches
+
+    @property
+    def rate(self):
+        return self.events / self.seconds if self.seconds else float('inf')
+
+
+def replay(events, engine=None, check=True):
+    """Drive events through an engine, comparing against recorded outcomes"""
+    engine = engine or PracticeEngine()
+    advanced = finished = 0
+    mismatches = []
+
+    start = time.perf_counter()
+    for i, (action, ok, has_text, detail, step, status) in enumerate(events):
+        if action == 'start':
+            result = engine.start(detail)
+        elif action == 'restore':
+            result = engine.restore(step, ok, scenario_id=detail)
+        else:
+            result = engine.handle(action, ok, has_text, detail)
+            if result.advanced:
+                advanced += 1
+                if result.finished:
+                    finished += 1
+        if check and step is not None and (engine.step != step or result.status != status):
+            mismatches.append((i, action, step, engine.step, status, result.status))
+    seconds = time.perf_counter() - start
+
+    return ReplayReport(len(events), seconds, advanced, finished, mismatches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay practice session streams headlessly")
+    parser.add_argument('streams', nargs='*', help="recorded JSON-lines session streams")
+    parser.add_argument('--generate', type=int, metavar='N',
+                        help="replay a synthetic stream of N events instead")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="replay each stream this many times")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        scenario_ids = tuple(load_scenarios())
+        named = [(f"synthetic[{args.generate}]", generate_stream(args.generate, scenario_ids))]
+    elif args.streams:
+        named = [(path, load_stream(path)) for path in args.streams]
+    else:
+        parser.error("give stream files or --generate N")
+
+    failed = False
+    for name, events in named:
+        events = events * args.repeat
+        report = replay(events)
+        print(f"{name}: {report.events} events in {report.seconds * 1000:.1f} ms "
+              f"({report.rate:,.0f}/s), {report.advanced} steps advanced, "
+              f"{report.finished} sessions finished")
+        for i, action, want_step, got_step, want, got in report.mismatches[:10]:
+            print(f"  event {i} ({action}): expected step {want_step} {want!r}, "
+                  f"got step {got_step} {got!r}")
+        if report.mismatches:
+            failed = True
+            print(f"  {len(report.mismatches)} mismatches")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
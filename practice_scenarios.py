@@ -0,0 +1,150 @@
+"""Practice scenario definitions.
+
+A scenario is a JSON file in scenarios/ describing a practice session:
+
+    {
+      "id": "file_handling",
+      "title": "File Handling",
+      "intro": "Complete these steps to practice file handling:",
+      "steps": [
+        {"instruction": "Use Ctrl+C to copy some text",
+         "action": "copy", "check": "ok",
+         "success": "Text copied! Now try pasting it with Ctrl+V",
+         "failure": "First select some text to copy"},
+        ...
+      ],
+      "completed": "🎉 Congratulations! You completed all practice steps!",
+      "summary": "Text for the completion dialog"
+    }
+
+"action" is the editor action that completes the step (copy, cut, paste,
+undo, redo, select_all, save) or "*" for any action. "check" names what must
+be true: "ok" (the action worked, e.g. there was a selection to copy),
+"has_text" (the editor is not empty) or "always". Messages may use {file}
+(the saved file's name) and {detail}.
+
+Save steps take two actions: "save" (a location was chosen, the write is
+queued) and "saved" (the write finished). Both are generated from one step.
+
+Each scenario compiles into a transition table keyed by (step, action), so
+dispatching an action is a dictionary lookup however many steps or
+scenarios are loaded.
+"""
+import json
+import os
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios')
+DEFAULT_SCENARIO = 'file_handling'
+
+ANY_ACTION = '*'
+ACTIONS = ('copy', 'cut', 'paste', 'undo', 'redo', 'select_all', 'save', ANY_ACTION)
+CHECKS = ('ok', 'has_text', 'always')
+
+SAVE_PENDING = "Saving {file}..."
+SAVE_CANCELLED = "Please select a location to save your file"
+SAVE_FAILED = "Error saving file: {detail}"
+DEFAULT_COMPLETED = "🎉 Congratulations! You completed all practice steps!"
+
+
+class ScenarioError(Exception):
+    """Raised for a scenario file that cannot be compiled"""
+
+
+class Transition:
+    """What happens when an action arrives at a step"""
+
+    __slots__ = ('check', 'success', 'failure', 'advances')
+
+    def __init__(self, check, success, failure, advances=True):
+        self.check = check
+        self.success = success
+        self.failure = failure
+        self.advances = advances
+
+
+class Scenario:
+    """A compiled scenario: instructions plus its (step, action) transition table"""
+
+    def __init__(self, scenario_id, title, intro, instructions, table, completed, summary):
+        self.id = scenario_id
+        self.title = title
+        self.intro = intro
+        self.instructions = instructions
+        self.table = table
+        self.completed = completed
+        self.summary = summary
+        self.accepted = frozenset(key for key in table if key[1] != ANY_ACTION)
+
+    @property
+    def total_steps(self):
+        return len(self.instructions)
+
+    def __repr__(self):
+        return f"Scenario({self.id!r}, {self.total_steps} steps)"
+
+
+def compile_scenario(data, source='<scenario>'):
+    """Validate a scenario definition and build its transition table"""
+    try:
+        scenario_id = data['id']
+        steps = data['steps']
+    except (KeyError, TypeError) as e:
+        raise ScenarioError(f"{source}: missing {e}") from None
+    if not steps:
+        raise ScenarioError(f"{source}: scenario has no steps")
+
+    table = {}
+    instructions = []
+    for number, step in enumerate(steps, 1):
+        action = step.get('action', ANY_ACTION)
+        check = step.get('check', 'ok')
+        if action not in ACTIONS:
+            raise ScenarioError(f"{source}: step {number} has unknown action {action!r}")
+        if check not in CHECKS:
+            raise ScenarioError(f"{source}: step {number} has unknown check {check!r}")
+        if 'instruction' not in step or 'success' not in step:
+            raise ScenarioError(f"{source}: step {number} needs an instruction and a success message")
+
+        instructions.append(step['instruction'])
+        failure = step.get('failure')
+        if action == 'save':
+            table[number, 'save'] = Transition(
+                'ok', step.get('pending', SAVE_PENDING),
+                failure or SAVE_CANCELLED, advances=False
+            )
+            table[number, 'saved'] = Transition(
+                'ok', step['success'], step.get('error', SAVE_FAILED)
+            )
+        else:
+            table[number, action] = Transition(check, step['success'], failure)
+
+    return Scenario(
+        scenario_id,
+        data.get('title', scenario_id),
+        data.get('intro', "Complete these steps:"),
+        instructions,
+        table,
+        data.get('completed', DEFAULT_COMPLETED),
+        data.get('summary', "Great job! You can start a new practice session anytime.")
+    )
+
+
+def load_scenario(path):
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ScenarioError(f"{path}: {e}") from None
+    return compile_scenario(data, path)
+
+
+def load_scenarios(directory=SCENARIO_DIR):
+    """Compile every *.json scenario in a directory, keyed by id, in file name order"""
+    scenarios = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            scenario = load_scenario(os.path.join(directory, name))
+            if scenario.id in scenarios:
+                raise ScenarioError(f"{name}: duplicate scenario id {scenario.id!r}")
+            scenarios[scenario.id] = scenario
+    return scenarios
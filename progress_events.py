@@ -0,0 +1,255 @@
+"""Learner event log.
+
+The progress store (progress_store.py) keeps one bit per learner and flag:
+whether a lesson was ever opened or a step ever completed. Reports for
+instructors need more: when each lesson was opened, how long each practice
+step took and when sessions were completed. Those events are appended to a
+log kept next to the store.
+
+Every event is a fixed 32-byte record, so a log can be cut into record
+ranges and read by several processes at once without an index:
+
+    header   magic 'LPE1', version, record size
+    records  at (float64 Unix time), learner, class, subject (uint32 name
+             ids), step, count (uint16), duration in ms (uint32), kind
+             (uint8), padding
+
+The subject is a lesson key for lesson views and a scenario otherwise.
+Names are stored once, in LOG.names, one JSON string per line; an id is a
+line number and id 0 is the empty name. A name is written before the first
+record that uses it. A torn record at the end of the log, left when the app
+was killed mid-write, is ignored by readers and cut off by the next writer.
+
+Classroom server databases can be folded into a log. Step durations are
+then taken from the time since the learner's previous step.
+
+    python progress_events.py import-classroom classroom.sqlite3 cohort.lpe --class 7B
+    python progress_events.py info cohort.lpe
+"""
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import time
+
+MAGIC = b'LPE1'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+# at, learner, class, subject, step, count, ms, kind
+RECORD = struct.Struct('<dIIIHHIB3x')
+
+LESSON = 1
+STARTED = 2
+STEP = 3
+COMPLETED = 4
+KIND_NAMES = {LESSON: 'lesson', STARTED: 'started', STEP: 'step', COMPLETED: 'completed'}
+
+READ_CHUNK = 65536
+# A gap longer than this between two steps means a new session
+SESSION_GAP = 3600
+
+
+class EventLogError(Exception):
+    pass
+
+
+def names_path(path):
+    return path + '.names'
+
+
+def read_names(path):
+    """The name table of a log, as a list indexed by id"""
+    try:
+        with open(names_path(path), encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.endswith('\n')]
+    except FileNotFoundError:
+        return []
+    except ValueError as e:
+        raise EventLogError(f"corrupt name table for {path}: {e}") from None
+
+
+class EventLog:
+    """Appends events to a log, creating it if needed
+
+    With flush_each set every event reaches the file at once, which is
+    what the app wants; bulk imports leave it off and call close().
+    """
+
+    def __init__(self, path, flush_each=False):
+        self.path = path
+        self.flush_each = flush_each
+        self.names = read_names(path)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        self._names_file = open(names_path(path), 'a', encoding='utf-8')
+        self._file = open(path, 'a+b')
+        try:
+            size = self._file.seek(0, os.SEEK_END)
+            if size == 0:
+                self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            else:
+                self._file.seek(0)
+                check_header(self._file.read(HEADER.size), path)
+                torn = (size - HEADER.size) % RECORD.size
+                if torn:
+                    self._file.truncate(size - torn)
+        except Exception:
+            self.close()
+            raise
+        if not self.names:
+            self.name_id('')
+
+    def name_id(self, name):
+        index = self._ids.get(name)
+        if index is None:
+            index = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._names_file.write(json.dumps(name, ensure_ascii=False) + '\n')
+            # The name must be on disk before any record that refers to it
+            self._names_file.flush()
+        return index
+
+    def add(self, kind, learner, subject='', step=0, count=1, ms=0, class_name='', at=None):
+        self._file.write(RECORD.pack(
+            time.time() if at is None else at,
+            self.name_id(learner), self.name_id(class_name), self.name_id(subject),
+            step, count, min(int(ms), 0xffffffff), kind
+        ))
+        if self.flush_each:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+        self._names_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check_header(data, path):
+    if len(data) < HEADER.size:
+        raise EventLogError(f"Truncated event log: {path}")
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise EventLogError(f"Not an event log: {path}")
+    if version != VERSION or record_size != RECORD.size:
+        raise EventLogError(f"Unsupported event log version {version}: {path}")
+
+
+class EventReader:
+    """Reads records from a log a chunk at a time"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            check_header(f.read(HEADER.size), path)
+            size = f.seek(0, os.SEEK_END)
+        self.count = (size - HEADER.size) // RECORD.size
+        self.names = read_names(path)
+
+    def __len__(self):
+        return self.count
+
+    def records(self, start=0, stop=None):
+        """Raw (at, learner, class, subject, step, count, ms, kind) tuples in [start, stop)"""
+        stop = self.count if stop is None else min(stop, self.count)
+        with open(self.path, 'rb') as f:
+            f.seek(HEADER.size + start * RECORD.size)
+            while start < stop:
+                n = min(READ_CHUNK, stop - start)
+                yield from RECORD.iter_unpack(f.read(n * RECORD.size))
+                start += n
+
+    def name_ids(self, names):
+        """Ids of the given names that occur in the log"""
+        wanted = set(names)
+        return {i for i, name in enumerate(self.names) if name in wanted}
+
+
+def import_classroom(db_path, log, class_name=''):
+    """Append a classroom server's events to log; returns how many were added"""
+    conn = sqlite3.connect(db_path)
+    added = 0
+    previous = {}
+    try:
+        rows = conn.execute(
+            "SELECT learner, type, lesson, scenario, step, count, at FROM events "
+            "ORDER BY learner, at"
+        )
+        for learner, kind, lesson, scenario, step, count, at in rows:
+            if kind == 'lesson':
+                log.add(LESSON, learner, lesson, count=count, class_name=class_name, at=at)
+            elif kind in ('step', 'completed'):
+                # (learner, scenario) -> (last step, its time, time of step 1)
+                key = (learner, scenario)
+                last_step, last_at, first_at = previous.get(key, (0, None, None))
+                if last_at is not None and at - last_at > SESSION_GAP:
+                    last_step, last_at, first_at = 0, None, None
+                if kind == 'step':
+                    ms = (at - last_at) * 1000 if last_at is not None and step == last_step + 1 else 0
+                    if step == 1:
+                        first_at = at
+                    previous[key] = (step, at, first_at)
+                    log.add(STEP, learner, scenario, step=step, ms=ms,
+                            class_name=class_name, at=at)
+                else:
+                    ms = (at - first_at) * 1000 if first_at is not None else 0
+                    previous.pop(key, None)
+                    log.add(COMPLETED, learner, scenario, ms=ms, class_name=class_name, at=at)
+            else:
+                continue
+            added += 1
+    finally:
+        conn.close()
+    return added
+
+
+def format_info(reader):
+    counts = {}
+    first = last = None
+    for record in reader.records():
+        counts[record[7]] = counts.get(record[7], 0) + 1
+        at = record[0]
+        first = at if first is None else min(first, at)
+        last = at if last is None else max(last, at)
+    lines = [f"{reader.count} events, {len(reader.names)} names"]
+    if first is not None:
+        fmt = '%Y-%m-%d %H:%M UTC'
+        lines.append(f"  from {time.strftime(fmt, time.gmtime(first))} "
+                     f"to {time.strftime(fmt, time.gmtime(last))}")
+    for kind, name in KIND_NAMES.items():
+        lines.append(f"  {name:10} {counts.get(kind, 0):10}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect learner event logs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    imported = commands.add_parser('import-classroom', help="append a classroom database's events")
+    imported.add_argument('db')
+    imported.add_argument('log')
+    imported.add_argument('--class', dest='class_name', default='',
+                          help="class to file the learners under")
+    info = commands.add_parser('info', help="count the events in a log")
+    info.add_argument('log')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'import-classroom':
+            with EventLog(args.log) as log:
+                added = import_classroom(args.db, log, args.class_name)
+            print(f"{args.log}: added {added} events")
+        else:
+            print(format_info(EventReader(args.log)))
+    except (OSError, EventLogError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Streaming export of learner events to CSV or JSON lines.
+
+Events (see progress_events.py) flow through a pipeline of generators, a
+chunk of the log at a time:
+
+    EventReader.records -> select -> csv_lines / jsonl_lines -> write_lines
+
+so memory use stays the same whatever the size of the log. The filters
+compare raw record fields: class names are turned into ids and dates into
+Unix times once, before the scan. Names are escaped for the output format
+once per name rather than once per event.
+
+Large logs are cut into contiguous record ranges, one per worker process.
+Each worker exports its range into a part file, and the parts are then
+copied in order into the output. The result is byte for byte what a single
+process would write.
+
+Dates are UTC unless they carry an offset. A date without a time means the
+whole day, so --until 2026-09-30 includes the 30th.
+
+    python progress_export.py ~/.learn_computer/events.lpe events.csv
+    python progress_export.py cohort.lpe 7b.jsonl --class 7B --since 2026-09-01 --jobs 8
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from progress_events import KIND_NAMES, LESSON, EventLogError, EventReader
+from save_pipeline import atomic_output
+
+FORMATS = ('csv', 'jsonl')
+CSV_HEADER = 'at,learner,class,event,lesson,scenario,step,count,ms\r\n'
+
+PARALLEL_MIN = 200000
+WRITE_BATCH = 8192
+SECONDS = [f'{second:02d}Z' for second in range(60)]
+
+
+def parse_date(text, end=False):
+    """Unix time for an ISO date or date and time; the end of the day if end is set"""
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if end and len(text) == 10:
+        moment += timedelta(days=1)
+    return moment.timestamp()
+
+
+def select(records, classes=None, since=None, until=None, kinds=None):
+    """Records whose class id, time and kind pass the filters; None lets everything through"""
+    for record in records:
+        if since is not None and record[0] < since:
+            continue
+        if until is not None and record[0] >= until:
+            continue
+        if classes is not None and record[2] not in classes:
+            continue
+        if kinds is not None and record[7] not in kinds:
+            continue
+        yield record
+
+
+def stamped(records):
+    """(ISO 8601 UTC time, record) pairs
+
+    Logs are written in time order, so the date, hour and minute are
+    formatted once per minute and only the seconds per event.
+    """
+    minute = prefix = None
+    for record in records:
+        this_minute, second = divmod(int(record[0]), 60)
+        if this_minute != minute:
+            minute = this_minute
+            prefix = datetime.fromtimestamp(minute * 60, timezone.utc).strftime('%Y-%m-%dT%H:%M:')
+        yield prefix + SECONDS[second], record
+
+
+def csv_field(text):
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def csv_lines(records, names):
+    fields = [csv_field(name) for name in names]
+    for at, (_, learner, class_id, subject, step, count, ms, kind) in stamped(records):
+        if kind == LESSON:
+            place = f'{fields[subject]},,'
+        else:
+            place = f',{fields[subject]},{step or ""}'
+        yield (f'{at},{fields[learner]},{fields[class_id]},{KIND_NAMES[kind]},'
+               f'{place},{count if kind == LESSON else ""},{ms or ""}\r\n')
+
+
+def jsonl_lines(records, names):
+    strings = [json.dumps(name, ensure_ascii=False) for name in names]
+    for at, (_, learner, class_id, subject, step, count, ms, kind) in stamped(records):
+        head = (f'{{"at": "{at}", "learner": {strings[learner]}, '
+                f'"class": {strings[class_id]}, "event": "{KIND_NAMES[kind]}", ')
+        if kind == LESSON:
+            body = f'"lesson": {strings[subject]}, "count": {count}'
+        else:
+            body = f'"scenario": {strings[subject]}'
+            if step:
+                body += f', "step": {step}'
+        if ms:
+            body += f', "ms": {ms}'
+        yield head + body + '}\n'
+
+
+FORMATTERS = {'csv': csv_lines, 'jsonl': jsonl_lines}
+
+
+def write_lines(lines, f):
+    """Write lines in batches; returns how many were written"""
+    written = 0
+    while True:
+        batch = list(islice(lines, WRITE_BATCH))
+        if not batch:
+            return written
+        f.write(''.join(batch))
+        written += len(batch)
+
+
+def export_range(log_path, out_path, fmt, start, stop, filters):
+    """Export records [start, stop) of a log to out_path; runs in a worker process"""
+    reader = EventReader(log_path)
+    lines = FORMATTERS[fmt](select(reader.records(start, stop), **filters), reader.names)
+    with open(out_path, 'w', encoding='utf-8', newline='') as f:
+        return write_lines(lines, f)
+
+
+def resolve_filters(reader, classes=None, since=None, until=None, kinds=None):
+    """Turn class names and event names into the ids records hold"""
+    return {
+        'classes': reader.name_ids(classes) if classes else None,
+        'since': since,
+        'until': until,
+        'kinds': {k for k, name in KIND_NAMES.items() if name in kinds} if kinds else None
+    }
+
+
+def export(log_path, out, fmt='csv', classes=None, since=None, until=None, kinds=None,
+           jobs=None):
+    """Export a log to the open text file out; returns (rows, processes used)"""
+    reader = EventReader(log_path)
+    filters = resolve_filters(reader, classes, since, until, kinds)
+    jobs = jobs or os.cpu_count() or 1
+    if fmt == 'csv':
+        out.write(CSV_HEADER)
+    if jobs == 1 or len(reader) < PARALLEL_MIN:
+        lines = FORMATTERS[fmt](select(reader.records(), **filters), reader.names)
+        return write_lines(lines, out), 1
+
+    bounds = [len(reader) * i // jobs for i in range(jobs + 1)]
+    with tempfile.TemporaryDirectory(prefix='export-') as parts_dir:
+        parts = [os.path.join(parts_dir, f'part{i:03d}') for i in range(jobs)]
+        with ProcessPoolExecutor(jobs) as pool:
+            counts = list(pool.map(export_range, [log_path] * jobs, parts, [fmt] * jobs,
+                                   bounds[:-1], bounds[1:], [filters] * jobs))
+        for part in parts:
+            with open(part, encoding='utf-8', newline='') as f:
+                shutil.copyfileobj(f, out)
+    return sum(counts), jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export learner events as CSV or JSON lines")
+    parser.add_argument('log', help="event log, e.g. ~/.learn_computer/events.lpe")
+    parser.add_argument('output', help="file to write, or - for stdout")
+    parser.add_argument('--format', choices=FORMATS,
+                        help="default: from the output's extension, else csv")
+    parser.add_argument('--class', dest='classes', action='append', metavar='NAME',
+                        help="only this class (repeat for several)")
+    parser.add_argument('--since', metavar='DATE', help="only events from this date or time")
+    parser.add_argument('--until', metavar='DATE', help="only events up to this date or time")
+    parser.add_argument('--event', dest='kinds', action='append', choices=list(KIND_NAMES.values()),
+                        help="only this kind of event (repeat for several)")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = 'jsonl' if args.output.endswith(('.jsonl', '.ndjson')) else 'csv'
+    try:
+        since = parse_date(args.since) if args.since else None
+        until = parse_date(args.until, end=True) if args.until else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = dict(fmt=fmt, classes=args.classes, since=since, until=until,
+                   kinds=args.kinds, jobs=args.jobs)
+    try:
+        if args.output == '-':
+            export(args.log, sys.stdout, **options)
+            return 0
+        with atomic_output(args.output, newline='') as out:
+            rows, jobs = export(args.log, out, **options)
+    except (OSError, EventLogError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {rows} events to {args.output} ({jobs} process(es))")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Compact learner progress store.
+
+Every learner gets one bit per progress flag:
+
+    lesson:<key>               the lesson was opened
+    practice:<scenario>        a practice session was started
+    step:<scenario>:<n>        step n of the scenario was completed
+
+The bits are stored column by column: each flag owns a fixed-width bitmap
+with one bit per learner, in learner order. Marking progress sets a single
+bit, and cohort questions ("who finished step 2 but not step 3?") become a
+handful of whole-column AND/NOT operations on Python ints plus a popcount,
+all running in C however many learners there are. Three hundred thousand
+learners with thirty flags take about a megabyte of bitmaps.
+
+File layout (little-endian), written atomically:
+
+    magic 'LPS1', version, capacity, count, metadata length
+    metadata    JSON {"flags": [...], "learners": [...]}
+    bitmaps     len(flags) columns of capacity / 8 bytes
+
+    python progress_store.py report progress.lps
+    python progress_store.py import-classroom classroom.sqlite3 district.lps
+"""
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+
+from save_pipeline import atomic_write
+
+MAGIC = b'LPS1'
+VERSION = 1
+HEADER = struct.Struct('<4sHIII')
+
+MIN_CAPACITY = 64
+
+
+class ProgressStoreError(Exception):
+    pass
+
+
+def lesson_flag(key):
+    return f'lesson:{key}'
+
+
+def practice_flag(scenario):
+    return f'practice:{scenario}'
+
+
+def step_flag(scenario, step):
+    return f'step:{scenario}:{step}'
+
+
+def iter_bits(mask):
+    """Positions of the set bits in mask, lowest first"""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield byte_index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+class ProgressStore:
+    """Per-learner progress flags packed into one bitmap per flag"""
+
+    def __init__(self, flags=(), capacity=MIN_CAPACITY):
+        self.flags = []
+        self._flag_index = {}
+        self.names = []
+        self._name_index = None
+        self.capacity = max(MIN_CAPACITY, (capacity + 7) // 8 * 8)
+        self._bits = bytearray()
+        for flag in flags:
+            self.flag_column(flag)
+
+    @property
+    def stride(self):
+        return self.capacity // 8
+
+    def __len__(self):
+        return len(self.names)
+
+    # Learners and flags
+
+    def learner(self, name, create=True):
+        """Index of a learner, adding them if create is set; None if unknown"""
+        if self._name_index is None:
+            # Built on first lookup; bulk reports never need it
+            self._name_index = {n: i for i, n in enumerate(self.names)}
+        index = self._name_index.get(name)
+        if index is None and create:
+            if len(self.names) == self.capacity:
+                self._grow(self.capacity * 2)
+            index = len(self.names)
+            self.names.append(name)
+            self._name_index[name] = index
+        return index
+
+    def flag_column(self, flag, create=True):
+        index = self._flag_index.get(flag)
+        if index is None and create:
+            index = len(self.flags)
+            self.flags.append(flag)
+            self._flag_index[flag] = index
+            self._bits.extend(bytes(self.stride))
+        return index
+
+    def _grow(self, capacity):
+        old, new = self.stride, capacity // 8
+        bits = bytearray(len(self.flags) * new)
+        for column in range(len(self.flags)):
+            bits[column * new:column * new + old] = self._bits[column * old:(column + 1) * old]
+        self._bits = bits
+        self.capacity = capacity
+
+    # Recording
+
+    def mark(self, name, flag):
+        learner = self.learner(name)
+        offset = self.flag_column(flag) * self.stride + learner // 8
+        self._bits[offset] |= 1 << (learner % 8)
+
+    def mark_lesson(self, name, key):
+        self.mark(name, lesson_flag(key))
+
+    def mark_practice(self, name, scenario):
+        self.mark(name, practice_flag(scenario))
+
+    def mark_step(self, name, scenario, step):
+        self.mark(name, step_flag(scenario, step))
+
+    def has(self, name, flag):
+        learner = self.learner(name, create=False)
+        column = self.flag_column(flag, create=False)
+        if learner is None or column is None:
+            return False
+        return bool(self._bits[column * self.stride + learner // 8] & (1 << (learner % 8)))
+
+    def flags_for(self, name):
+        return [flag for flag in self.flags if self.has(name, flag)]
+
+    # Cohort queries
+
+    def everyone(self):
+        return (1 << len(self.names)) - 1
+
+    def column(self, flag):
+        """The learners with flag set, as an int bitmask (bit i = learner i)"""
+        index = self.flag_column(flag, create=False)
+        if index is None:
+            return 0
+        start = index * self.stride
+        return int.from_bytes(self._bits[start:start + self.stride], 'little')
+
+    def count(self, flag):
+        return self.column(flag).bit_count()
+
+    def learners(self, mask):
+        names = self.names
+        return [names[i] for i in iter_bits(mask)]
+
+    def lesson_keys(self):
+        return [flag[7:] for flag in self.flags if flag.startswith('lesson:')]
+
+    def scenarios(self):
+        seen = {}
+        for flag in self.flags:
+            kind, _, rest = flag.partition(':')
+            if kind == 'practice':
+                seen.setdefault(rest, None)
+            elif kind == 'step':
+                seen.setdefault(rest.rpartition(':')[0], None)
+        return list(seen)
+
+    def steps(self, scenario):
+        prefix = f'step:{scenario}:'
+        return sorted(int(flag[len(prefix):]) for flag in self.flags if flag.startswith(prefix))
+
+    def lesson_reach(self, keys=None):
+        """How many learners opened each lesson"""
+        return {key: self.count(lesson_flag(key)) for key in (keys or self.lesson_keys())}
+
+    def never_opened(self, keys):
+        """Lessons nobody has opened, out of keys (every lesson the store knows was opened)"""
+        return [key for key, count in self.lesson_reach(keys).items() if count == 0]
+
+    def reached(self, scenario, step):
+        """Learners who could be on step: started the scenario, or finished step - 1"""
+        if step == 1:
+            return self.column(practice_flag(scenario)) | self.column(step_flag(scenario, 1))
+        return self.column(step_flag(scenario, step - 1))
+
+    def stuck_on(self, scenario, step):
+        """Learners who reached step but never completed it"""
+        return self.reached(scenario, step) & ~self.column(step_flag(scenario, step))
+
+    def funnel(self, scenario, total_steps=None):
+        """(step, reached, completed, stuck) for every step of a scenario"""
+        steps = range(1, (total_steps or max(self.steps(scenario), default=0)) + 1)
+        rows = []
+        for step in steps:
+            reached = self.reached(scenario, step)
+            done = self.column(step_flag(scenario, step))
+            rows.append((step, reached.bit_count(), done.bit_count(),
+                         (reached & ~done).bit_count()))
+        return rows
+
+    # Persistence
+
+    def to_bytes(self):
+        meta = json.dumps({'flags': self.flags, 'learners': self.names},
+                          ensure_ascii=False).encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, self.capacity, len(self.names), len(meta))
+        return header + meta + self._bits
+
+    def save(self, path):
+        atomic_write(path, self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ProgressStoreError("truncated progress store")
+        magic, version, capacity, count, meta_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ProgressStoreError("not a progress store, or an unsupported version")
+        start = HEADER.size + meta_len
+        try:
+            meta = json.loads(bytes(data[HEADER.size:start]))
+        except ValueError as e:
+            raise ProgressStoreError(f"corrupt progress store metadata: {e}") from None
+        store = cls(capacity=capacity)
+        store.flags = meta['flags']
+        store._flag_index = {flag: i for i, flag in enumerate(store.flags)}
+        store.names = meta['learners']
+        store._bits = bytearray(data[start:])
+        if len(store.names) != count or len(store._bits) != len(store.flags) * store.stride:
+            raise ProgressStoreError("progress store is truncated or inconsistent")
+        return store
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def open(cls, path):
+        """Load path, or start an empty store if it does not exist yet"""
+        if not os.path.exists(path):
+            return cls()
+        return cls.load(path)
+
+
+def import_classroom(db_path, store=None):
+    """Fold a classroom server database into a progress store"""
+    store = store or ProgressStore()
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT learner, type, lesson, scenario, step FROM events")
+        for learner, kind, lesson, scenario, step in rows:
+            if kind == 'lesson':
+                store.mark_lesson(learner, lesson)
+            elif kind == 'step':
+                store.mark_step(learner, scenario, step)
+    finally:
+        conn.close()
+    return store
+
+
+def format_report(store, lesson_keys=None):
+    lines = [f"{len(store)} learners, {len(store.flags)} flags"]
+    total = len(store) or 1
+    lines.append("Lessons opened:")
+    for key, count in store.lesson_reach(lesson_keys).items():
+        lines.append(f"  {key:<24} {count:8} ({count * 100 / total:5.1f}%)")
+    never = store.never_opened(lesson_keys)
+    if never:
+        lines.append("Never opened: " + ", ".join(never))
+    for scenario in store.scenarios():
+        lines.append(f"Practice '{scenario}':")
+        for step, reached, done, stuck in store.funnel(scenario):
+            share = stuck * 100 / reached if reached else 0.0
+            lines.append(f"  step {step}: reached {reached:8}, completed {done:8}, "
+                         f"stuck {stuck:8} ({share:5.1f}%)")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and build learner progress stores")
+    commands = parser.add_subparsers(dest='command', required=True)
+    report = commands.add_parser('report', help="print cohort progress")
+    report.add_argument('store')
+    report.add_argument('--all-lessons', action='store_true',
+                        help="check against every built-in lesson, not just the ones seen")
+    imported = commands.add_parser('import-classroom', help="build a store from a classroom database")
+    imported.add_argument('db')
+    imported.add_argument('store')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'report':
+            store = ProgressStore.load(args.store)
+            keys = None
+            if args.all_lessons:
+                from lesson_pack import open_builtin_pack
+                with open_builtin_pack() as pack:
+                    keys = [entry.key for entry in pack.entries]
+            print(format_report(store, keys))
+        else:
+            store = import_classroom(args.db, ProgressStore.open(args.store))
+            store.save(args.store)
+            print(f"{args.store}: {len(store)} learners, {len(store.flags)} flags")
+    except (OSError, ProgressStoreError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Quiz question banks.
+
+Questions for the Knowledge Check and exercise sections are written as JSON
+files in quizzes/<locale>/, one per lesson:
+
+    {
+      "lesson": "terminology",
+      "topic": "Reference",
+      "questions": [
+        {"id": "taskbar",
+         "prompt": "What do you call the bar at the bottom of the screen?",
+         "choices": ["Taskbar", "Title bar", "Menu bar"], "answer": 0},
+        {"id": "browsers", "prompt": "Name three web browsers",
+         "accept": ["chrome", "firefox", "edge", "safari"], "need": 3,
+         "explain": "Chrome, Firefox, Edge and Safari are all web browsers."}
+      ]
+    }
+
+A question either has "choices" and the index of the right "answer", or a
+list of "accept"ed typed answers of which "need" (default 1) must appear
+in what the learner types. Typed answers are compared ignoring case and
+punctuation.
+
+Sources are compiled into one bank file per locale. Questions are stored
+ordered by topic and then lesson, so every lesson and every topic is a
+contiguous range of question numbers and the index is just a name -> range
+table. The bank is memory-mapped: opening it reads the header and that
+table, and a question is decoded only when it is asked, so a bank of
+hundreds of thousands of questions costs almost nothing until used.
+
+Bank layout (little-endian):
+
+    header     magic 'QBK1', version, question count, group count,
+               offset of the group table
+    records    per question: 64-bit id hash, blob offset, blob length
+    blobs      one UTF-8 JSON object per question
+    groups     per lesson and topic: kind, first question, count, name
+
+    python quiz_bank.py build quizzes/builtin quizzes/builtin.qbk
+    python quiz_bank.py list quizzes/builtin.qbk
+"""
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+
+from app_paths import state_path
+
+MAGIC = b'QBK1'
+VERSION = 2
+
+# magic, version, question count, group count, group table offset
+HEADER = struct.Struct('<4sHIIQ')
+# id hash, blob offset, blob length
+RECORD = struct.Struct('<QQI')
+# kind, first question, count, name length
+GROUP = struct.Struct('<BIIH')
+
+LESSON_GROUP = 1
+TOPIC_GROUP = 2
+
+QUIZ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quizzes')
+BUILTIN_SOURCE = os.path.join(QUIZ_DIR, 'builtin')
+BUILTIN_BANK = os.path.join(QUIZ_DIR, 'builtin.qbk')
+
+_PUNCTUATION = re.compile(r'[^\w\s+]+')
+
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+BANK_MODE = 0o666 & ~_UMASK
+
+
+class QuizBankError(Exception):
+    """Raised for a quiz source that cannot be compiled or a corrupt bank"""
+
+
+def question_id(lesson, qid):
+    """Stable 64-bit hash of a question, shared by every locale's copy of it"""
+    digest = hashlib.blake2b(f"{lesson}/{qid}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def normalize(answer):
+    return ' '.join(_PUNCTUATION.sub(' ', answer.casefold()).split())
+
+
+class Question:
+    """One decoded question"""
+
+    __slots__ = ('index', 'id', 'lesson', 'prompt', 'choices', 'answer',
+                 'accept', 'need', 'explain')
+
+    def __init__(self, index, qid, lesson, data):
+        self.index = index
+        self.id = qid
+        self.lesson = lesson
+        self.prompt = data['prompt']
+        self.choices = data.get('choices')
+        self.answer = data.get('answer')
+        self.accept = data.get('accept')
+        self.need = data.get('need', 1)
+        self.explain = data.get('explain', '')
+
+    @property
+    def multiple_choice(self):
+        return self.choices is not None
+
+    def grade(self, response):
+        """Whether response (a choice index, or typed text) is right"""
+        if self.multiple_choice:
+            return response == self.answer
+        # Accepted answers may appear anywhere, in any order and with any separators;
+        # "edge" inside a matched "microsoft edge" does not count twice
+        given = f" {normalize(response)} "
+        found = [answer for answer in self.accept if f" {answer} " in given]
+        distinct = [a for a in found if not any(a != b and f" {a} " in f" {b} " for b in found)]
+        return len(distinct) >= self.need
+
+    def expected(self):
+        """The right answer, for showing after a wrong one"""
+        if self.multiple_choice:
+            return self.choices[self.answer]
+        return ', '.join(self.accept[:max(self.need, 1)])
+
+    def __repr__(self):
+        return f"Question({self.lesson!r}, {self.prompt!r})"
+
+
+def compile_question(data, lesson, source):
+    """Validate one question, returning its id hash and JSON blob"""
+    if not isinstance(data, dict) or 'id' not in data or 'prompt' not in data:
+        raise QuizBankError(f"{source}: every question needs an id and a prompt")
+    name = f"{source}: question {data['id']!r}"
+    if 'choices' in data:
+        answer = data.get('answer')
+        if not isinstance(answer, int) or not 0 <= answer < len(data['choices']):
+            raise QuizBankError(f"{name} has no valid answer index")
+        body = {'prompt': data['prompt'], 'choices': data['choices'], 'answer': answer}
+    elif data.get('accept'):
+        accept = [normalize(a) for a in data['accept']]
+        need = data.get('need', 1)
+        if not 1 <= need <= len(accept):
+            raise QuizBankError(f"{name} needs more answers than it accepts")
+        body = {'prompt': data['prompt'], 'accept': accept, 'need': need}
+    else:
+        raise QuizBankError(f"{name} needs choices or accepted answers")
+    if data.get('explain'):
+        body['explain'] = data['explain']
+    blob = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return question_id(lesson, data['id']), blob
+
+
+def write_bank(path, lessons):
+    """Write (lesson, topic, questions) tuples to a bank file at path
+
+    questions are the question dicts of the source format.
+    """
+    topics = {}
+    for lesson, topic, questions in lessons:
+        topics.setdefault(topic, []).append((lesson, questions))
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix='.' + os.path.basename(path) + '.',
+        suffix='.tmp'
+    )
+    try:
+        groups = []
+        records = []
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+            blobs = []
+            # Ids must be unique across the whole bank: stats are keyed by them
+            seen = {}
+            for topic, members in topics.items():
+                topic_start = len(records)
+                for lesson, questions in members:
+                    start = len(records)
+                    for data in questions:
+                        qid, blob = compile_question(data, lesson, lesson)
+                        name = f"{lesson}/{data['id']}"
+                        if qid in seen:
+                            if seen[qid] == name:
+                                raise QuizBankError(f"{lesson}: duplicate question id {data['id']!r}")
+                            raise QuizBankError(f"{name}: id hash collides with {seen[qid]}")
+                        seen[qid] = name
+                        records.append((qid, len(blob)))
+                        blobs.append(blob)
+                    groups.append((LESSON_GROUP, start, len(records) - start, lesson))
+                groups.append((TOPIC_GROUP, topic_start, len(records) - topic_start, topic))
+
+            offset = HEADER.size + RECORD.size * len(records)
+            for qid, size in records:
+                f.write(RECORD.pack(qid, offset, size))
+                offset += size
+            for blob in blobs:
+                f.write(blob)
+
+            group_offset = f.tell()
+            for kind, start, count, name in groups:
+                name_b = name.encode('utf-8')
+                f.write(GROUP.pack(kind, start, count, len(name_b)) + name_b)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, len(records), len(groups), group_offset))
+        os.chmod(tmp_path, BANK_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(records)
+
+
+def parse_source(path):
+    """Read a quiz source file and return (lesson, topic, questions)"""
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise QuizBankError(f"{path}: {e}") from None
+    try:
+        return data['lesson'], data.get('topic', ''), data['questions']
+    except (KeyError, TypeError) as e:
+        raise QuizBankError(f"{path}: missing {e}") from None
+
+
+def source_files(source_dir):
+    return sorted(
+        os.path.join(source_dir, name)
+        for name in os.listdir(source_dir)
+        if name.endswith('.json')
+    )
+
+
+def build_bank(source_dir, path):
+    """Compile every quiz source in source_dir into a bank at path"""
+    return write_bank(path, [parse_source(p) for p in source_files(source_dir)])
+
+
+def bank_is_stale(source_dir, path):
+    try:
+        built = os.path.getmtime(path)
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return True
+    if len(header) < HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION):
+        # Written by an older version of this module
+        return True
+    newest = max([os.path.getmtime(source_dir)] +
+                 [os.path.getmtime(p) for p in source_files(source_dir)])
+    return newest > built
+
+
+class QuizBank:
+    """Read-only, memory-mapped view of a question bank"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise QuizBankError(f"Empty question bank: {path}")
+        try:
+            self._read_groups()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_groups(self):
+        if len(self._map) < HEADER.size:
+            raise QuizBankError(f"Truncated question bank: {self.path}")
+        magic, version, self.count, group_count, offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise QuizBankError(f"Not a question bank: {self.path}")
+        if version != VERSION:
+            raise QuizBankError(f"Unsupported question bank version {version}: {self.path}")
+
+        self.lessons = {}
+        self.topics = {}
+        starts = []
+        names = []
+        for _ in range(group_count):
+            kind, start, count, name_len = GROUP.unpack_from(self._map, offset)
+            offset += GROUP.size
+            name = self._map[offset:offset + name_len].decode('utf-8')
+            offset += name_len
+            if kind == LESSON_GROUP:
+                self.lessons[name] = (start, count)
+                if count:
+                    starts.append(start)
+                    names.append(name)
+            else:
+                self.topics[name] = (start, count)
+        self._lesson_starts = starts
+        self._lesson_names = names
+
+    def __len__(self):
+        return self.count
+
+    def ranges(self, lessons=None, topics=None):
+        """(first, count) question ranges for some lessons and topics, or the whole bank"""
+        if lessons is None and topics is None:
+            return [(0, self.count)] if self.count else []
+        ranges = [self.lessons[key] for key in lessons or () if key in self.lessons]
+        ranges += [self.topics[name] for name in topics or () if name in self.topics]
+        return [r for r in ranges if r[1]]
+
+    def question_id(self, index):
+        return RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)[0]
+
+    def question(self, index):
+        """Decode question number index"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        qid, offset, size = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        data = json.loads(self._map[offset:offset + size].decode('utf-8'))
+        lesson = self._lesson_names[bisect_right(self._lesson_starts, index) - 1]
+        return Question(index, qid, lesson, data)
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_locale_bank(locale):
+    """Open the questions for a locale, or the built-in ones if there are none
+
+    A read-only install cannot be rebuilt in place, so a stale bank is
+    rebuilt into the per-user cache in the state directory instead.
+    """
+    source = os.path.join(QUIZ_DIR, locale)
+    if locale == 'builtin' or not os.path.isdir(source):
+        source, path = BUILTIN_SOURCE, BUILTIN_BANK
+    else:
+        path = os.path.join(QUIZ_DIR, locale + '.qbk')
+    if os.path.isdir(source) and bank_is_stale(source, path):
+        try:
+            build_bank(source, path)
+        except OSError:
+            path = state_path('quizzes', os.path.basename(path))
+            if bank_is_stale(source, path):
+                build_bank(source, path)
+    return QuizBank(path)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[0] == 'build':
+        count = build_bank(argv[1], argv[2])
+        print(f"Wrote {count} questions to {argv[2]}")
+    elif len(argv) == 2 and argv[0] == 'list':
+        with QuizBank(argv[1]) as bank:
+            for topic, (start, count) in bank.topics.items():
+                print(f"{topic or '-':16} {count:8} questions")
+            for lesson, (start, count) in bank.lessons.items():
+                print(f"  {lesson:24} {count:6} from #{start}")
+    else:
+        print("usage: quiz_bank.py build SOURCE_DIR BANK | list BANK")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
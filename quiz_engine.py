@@ -0,0 +1,214 @@
+"""UI-independent quiz logic.
+
+A QuizSession asks questions from a QuizBank (see quiz_bank.py), drawn at
+random from some lessons or topics without repeating one, grades the
+answers and keeps score. Like the PracticeEngine it never touches Tk.
+
+Drawing is a lazy Fisher-Yates shuffle: instead of shuffling a list of every
+candidate question up front, each draw picks a random remaining position and
+remembers only the swaps made so far. A draw is constant time and memory
+grows with the questions asked, not with the size of the bank.
+
+QuizStats counts how often each question was asked and answered correctly,
+keyed by the question's id hash so the numbers survive rebuilding the bank
+and are shared between translations. The file holds only questions that
+were ever asked:
+
+    magic 'QST1', version, count
+    ids      count x uint64
+    asked    count x uint32
+    correct  count x uint32
+"""
+import os
+import random
+import struct
+from array import array
+from bisect import bisect_right
+
+from save_pipeline import atomic_write
+
+MAGIC = b'QST1'
+VERSION = 2
+HEADER = struct.Struct('<4sHI')
+
+DEFAULT_LENGTH = 10
+
+
+class QuizStatsError(Exception):
+    pass
+
+
+class QuestionSampler:
+    """Random draws without repetition from (first, count) question ranges"""
+
+    def __init__(self, ranges, rng=None):
+        self.rng = rng or random.Random()
+        self._firsts = []
+        self._offsets = []
+        total = 0
+        for first, count in ranges:
+            self._firsts.append(first)
+            self._offsets.append(total)
+            total += count
+        self.total = total
+        self.remaining = total
+        self._swaps = {}
+
+    def __len__(self):
+        return self.remaining
+
+    def _index(self, position):
+        # Candidate positions are numbered across the ranges in order
+        i = bisect_right(self._offsets, position) - 1
+        return self._firsts[i] + position - self._offsets[i]
+
+    def draw(self):
+        """The next question index, or None once every candidate was drawn"""
+        if not self.remaining:
+            return None
+        last = self.remaining - 1
+        pick = self.rng.randrange(self.remaining)
+        swaps = self._swaps
+        position = swaps.get(pick, pick)
+        swaps[pick] = swaps.pop(last, last)
+        self.remaining = last
+        return self._index(position)
+
+
+class QuizStats:
+    """Per-question asked and answered-correctly counts"""
+
+    def __init__(self):
+        self._slots = {}
+        self._ids = array('Q')
+        self._asked = array('I')
+        self._correct = array('I')
+
+    def __len__(self):
+        return len(self._ids)
+
+    def record(self, qid, correct):
+        slot = self._slots.get(qid)
+        if slot is None:
+            slot = self._slots[qid] = len(self._ids)
+            self._ids.append(qid)
+            self._asked.append(0)
+            self._correct.append(0)
+        self._asked[slot] += 1
+        if correct:
+            self._correct[slot] += 1
+
+    def counts(self, qid):
+        """(asked, correct) for a question"""
+        slot = self._slots.get(qid)
+        if slot is None:
+            return 0, 0
+        return self._asked[slot], self._correct[slot]
+
+    def accuracy(self, qid):
+        asked, correct = self.counts(qid)
+        return correct / asked if asked else None
+
+    def hardest(self, n=10, min_asked=5):
+        """Ids of the n questions answered correctly least often"""
+        rows = [
+            (self._correct[slot] / self._asked[slot], qid)
+            for qid, slot in self._slots.items()
+            if self._asked[slot] >= min_asked
+        ]
+        rows.sort()
+        return [qid for _, qid in rows[:n]]
+
+    # Persistence
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, len(self._ids))
+        return header + self._ids.tobytes() + self._asked.tobytes() + self._correct.tobytes()
+
+    def save(self, path):
+        atomic_write(path, self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise QuizStatsError("truncated quiz statistics")
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise QuizStatsError("not quiz statistics, or an unsupported version")
+        if len(data) != HEADER.size + 16 * count:
+            raise QuizStatsError("quiz statistics are truncated")
+        stats = cls()
+        offset = HEADER.size
+        for column in (stats._ids, stats._asked, stats._correct):
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            offset += size
+        stats._slots = {qid: slot for slot, qid in enumerate(stats._ids)}
+        return stats
+
+    @classmethod
+    def open(cls, path):
+        """Load path, or start empty if it does not exist yet"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class Grade:
+    """The verdict on one answer"""
+
+    __slots__ = ('question', 'correct', 'expected')
+
+    def __init__(self, question, correct):
+        self.question = question
+        self.correct = correct
+        self.expected = question.expected()
+
+    def __repr__(self):
+        return f"Grade({self.question!r}, correct={self.correct})"
+
+
+class QuizSession:
+    """Asks up to length questions from some lessons or topics of a bank
+
+    With no lessons or topics the whole bank is used.
+    """
+
+    def __init__(self, bank, lessons=None, topics=None, length=DEFAULT_LENGTH,
+                 stats=None, rng=None):
+        self.bank = bank
+        self.stats = stats
+        self.sampler = QuestionSampler(bank.ranges(lessons, topics), rng)
+        self.length = min(length, self.sampler.total)
+        self.asked = 0
+        self.score = 0
+        self.question = None
+
+    @property
+    def finished(self):
+        return self.asked >= self.length and self.question is None
+
+    def next_question(self):
+        """Draw the next question, or None when the quiz is over"""
+        if self.asked >= self.length:
+            self.question = None
+            return None
+        index = self.sampler.draw()
+        self.question = None if index is None else self.bank.question(index)
+        if self.question is not None:
+            self.asked += 1
+        return self.question
+
+    def answer(self, response):
+        """Grade the current question; returns a Grade, or None if none is open"""
+        question = self.question
+        if question is None:
+            return None
+        grade = Grade(question, question.grade(response))
+        if grade.correct:
+            self.score += 1
+        if self.stats is not None:
+            self.stats.record(question.id, grade.correct)
+        self.question = None
+        return grade
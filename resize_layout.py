@@ -0,0 +1,182 @@
+"""Coalesced relayout while the window is resized.
+
+Dragging a window edge makes Tk deliver a <Configure> event for every
+mouse move. Each width change makes a wrapping Text widget lay out its
+display lines again and a wrapping Label re-measure its text, so with long
+lessons dragging stutters.
+
+ResizeCoalescer sits between the <Configure> events of a container and
+the code that sizes its content:
+
+- Height-only changes are passed on at once. They do not change how
+  anything wraps.
+- Width changes of at least `step` pixels (one average character) are
+  passed on at most once per REFLOW_MS while the drag goes on.
+- Smaller width changes wait until the drag has been still for SETTLE_MS.
+- The exact final size is always applied in the end.
+
+ViewStack shows one of several lesson views in a container. Only the
+visible view is placed, at an explicit size. Hidden views stay unmapped,
+so a resize never reflows them. A hidden view is laid out again once,
+when it is next shown at a new width. Within the visible Text, Tk lays out
+the lines on screen right away and measures the rest of a long lesson
+in the background.
+
+WrapFollower keeps the wraplength of labels in step with their panel's
+width, rounded down to whole characters of each label's font. Labels are
+only reconfigured when that rounded length changes.
+
+Font metrics (average character width, line spacing) are measured once per
+font and cached.
+"""
+import time
+
+REFLOW_MS = 50
+SETTLE_MS = 150
+DEFAULT_WRAP = 600
+
+# Text that averages out to a typical character width
+AVERAGE_SAMPLE = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 '
+
+_metrics = {}
+
+
+class FontMetrics:
+    __slots__ = ('char_width', 'linespace')
+
+    def __init__(self, char_width, linespace):
+        self.char_width = char_width
+        self.linespace = linespace
+
+
+def font_metrics(font):
+    """Average character width and line spacing of a tkinter Font, measured once"""
+    metrics = _metrics.get(font.name)
+    if metrics is None:
+        char_width = max(1, round(font.measure(AVERAGE_SAMPLE) / len(AVERAGE_SAMPLE)))
+        metrics = _metrics[font.name] = FontMetrics(char_width, font.metrics('linespace'))
+    return metrics
+
+
+class ResizeCoalescer:
+    """Calls apply(width, height) for a widget's size, coalescing <Configure> bursts"""
+
+    def __init__(self, widget, apply, step=1, interval_ms=REFLOW_MS, settle_ms=SETTLE_MS):
+        self.widget = widget
+        self.apply = apply
+        self.step = step
+        self.interval_ms = interval_ms
+        self.settle_ms = settle_ms
+        self.size = None
+        self.pending = None
+        self.events = 0
+        self.applied = 0
+        self._job = None
+        self._settling = False
+        self._last_apply = 0.0
+        widget.bind('<Configure>', self._on_configure, add='+')
+
+    def _on_configure(self, event):
+        if event.widget is not self.widget:
+            return
+        self.events += 1
+        self.pending = (event.width, event.height)
+        if self.size is None:
+            self.flush()
+            return
+        width, height = self.size
+        if event.width == width:
+            if event.height != height:
+                self.flush()
+            return
+        if abs(event.width - width) >= self.step:
+            # Throttled: at most one reflow per interval while the edge moves
+            if self._job is None or self._settling:
+                wait = self.interval_ms - (time.perf_counter() - self._last_apply) * 1000
+                self._schedule(max(0, int(wait)), settling=False)
+        elif self._job is None or self._settling:
+            # Too small to matter mid-drag; applied once the drag stops
+            self._schedule(self.settle_ms, settling=True)
+
+    def _schedule(self, delay_ms, settling):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+        self._settling = settling
+        self._job = self.widget.after(delay_ms, self.flush)
+
+    def flush(self):
+        """Apply the latest size now"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        if self.pending is None or self.pending == self.size:
+            return
+        self.size = self.pending
+        self._last_apply = time.perf_counter()
+        self.applied += 1
+        self.apply(*self.size)
+
+
+class ViewStack:
+    """Shows one frame at a time in a container, placed at an explicit size"""
+
+    def __init__(self, container, padx=0, pady=0):
+        self.container = container
+        self.padx = padx
+        self.pady = pady
+        self.current = None
+        self.size = None
+
+    def show(self, frame):
+        if frame is self.current:
+            return
+        if self.current is not None and self.current.winfo_exists():
+            self.current.place_forget()
+        self.current = frame
+        self._place()
+
+    def resize(self, width, height):
+        self.size = (width, height)
+        self._place()
+
+    def _place(self):
+        if self.current is None:
+            return
+        if self.size is None:
+            # Not laid out yet: follow the container until the first resize
+            self.current.place(x=self.padx, y=self.pady, relwidth=1, relheight=1,
+                               width=-self.padx, height=-self.pady)
+            return
+        width, height = self.size
+        self.current.place(x=self.padx, y=self.pady, relwidth=0, relheight=0,
+                           width=max(1, width - self.padx), height=max(1, height - self.pady))
+
+
+class WrapFollower:
+    """Keeps labels' wraplength matched to a panel width, in whole characters"""
+
+    def __init__(self, default=DEFAULT_WRAP):
+        self.width = None
+        self.default = default
+        self._labels = []
+
+    def register(self, label, font, margin=0):
+        """Wrap label (set in font) at the panel width less margin pixels"""
+        entry = [label, font_metrics(font).char_width, margin, None]
+        self._labels.append(entry)
+        self._update(entry)
+
+    def resize(self, width, height=None):
+        self.width = width
+        for entry in self._labels:
+            self._update(entry)
+
+    def _update(self, entry):
+        label, char_width, margin, current = entry
+        if self.width is None:
+            wrap = self.default
+        else:
+            wrap = max(char_width, (self.width - margin) // char_width * char_width)
+        if wrap != current:
+            label.configure(wraplength=wrap)
+            entry[3] = wrap
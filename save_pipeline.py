@@ -0,0 +1,175 @@
+"""Background, atomic file saving.
+
+Saving on the Tk thread freezes the window while a slow disk or network home
+directory catches up, and a crash mid-write leaves a truncated file. The
+SaveWriter takes a snapshot of the text, hands it to a worker thread that
+writes a temp file next to the target, fsyncs it according to the chosen
+policy and renames it over the target. Results are delivered back on the Tk
+thread by polling from root.after, since Tk widgets must not be touched from
+the worker.
+
+A save whose content hash matches the last successful save of the same file
+is skipped.
+"""
+import contextlib
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+
+# 'always': fsync the file and its directory, so the rename survives power loss
+# 'file':   fsync the file before renaming it
+# 'never':  leave flushing to the operating system
+FSYNC_POLICIES = ('always', 'file', 'never')
+
+POLL_INTERVAL_MS = 30
+
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class SaveResult:
+    """Outcome of one save job, passed to its callback on the Tk thread"""
+
+    __slots__ = ('path', 'written', 'error')
+
+    def __init__(self, path, written, error=None):
+        self.path = path
+        self.written = written
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _temp_file(path):
+    """(fd, temp path, mode for the result) for a unique temp file next to path"""
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix='.' + os.path.basename(path) + '.',
+        suffix='.tmp'
+    )
+    return fd, tmp_path, mode
+
+
+def atomic_write(path, text, fsync='file'):
+    """Write text (or bytes) to path via a temp file and rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path, mode = _temp_file(path)
+    try:
+        if isinstance(text, bytes):
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding='utf-8')
+        with f:
+            f.write(text)
+            f.flush()
+            if fsync != 'never':
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == 'always' and hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+@contextlib.contextmanager
+def atomic_output(path, encoding='utf-8', newline=None):
+    """A text file to stream into; it replaces path only if the block succeeds"""
+    fd, tmp_path, mode = _temp_file(path)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline=newline) as f:
+            yield f
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SaveWriter:
+    """Writes files on a background thread and reports back via root.after"""
+
+    def __init__(self, root, fsync='file'):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.root = root
+        self.fsync = fsync
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._saved_hashes = {}
+        self._pending = 0
+        self._poll_job = None
+        self._thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def save(self, path, text, callback=None):
+        """Queue text to be written to path; callback(SaveResult) runs on the Tk thread"""
+        self._pending += 1
+        self._jobs.put((path, text, callback))
+        if self._poll_job is None:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def close(self, timeout=5.0):
+        """Finish queued writes and stop the worker thread"""
+        self._jobs.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            path, text, callback = job
+            digest = content_hash(text)
+            try:
+                if self._saved_hashes.get(path) == digest and os.path.exists(path):
+                    result = SaveResult(path, written=False)
+                else:
+                    atomic_write(path, text, self.fsync)
+                    self._saved_hashes[path] = digest
+                    result = SaveResult(path, written=True)
+            except Exception as e:
+                result = SaveResult(path, written=False, error=e)
+            self._results.put((result, callback))
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                result, callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if callback is not None:
+                callback(result)
+        if self._pending:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
@@ -0,0 +1,359 @@
+"""Shortcut reaction-time drill.
+
+The drill shows one shortcut at a time from the Shortcut Keys lesson and
+times how long the learner takes to press it, with perf_counter_ns. Only
+Ctrl shortcuts are drilled: Win and Alt+Tab combinations are handled by the
+operating system and never reach the window.
+
+Latencies go into one histogram per shortcut (10 ms buckets up to 4 s).
+The next prompt is chosen at random, weighted towards the shortcuts with
+the slowest recent times, so practice goes where it is needed.
+
+Timing trustworthiness. A key press is timestamped when its Tk binding
+runs, and the prompt when an idle callback runs right after Tk has drawn
+it. Either can be late if the event loop was busy, which would distort
+the latency. A LoopMonitor heartbeat runs every HEARTBEAT_MS while drilling
+and records how late each beat fired. A trial is recorded only if, both
+when the prompt was shown and when the key was handled, the last beat ran
+no more than JITTER_BOUND_MS ago and was itself no more than
+JITTER_BOUND_MS late. Otherwise it is discarded and counted. A late key
+stamp overstates the latency and a late prompt stamp understates it, each
+by at most the bound, so every recorded latency is within JITTER_BOUND_MS
+of the true one. That is below the histogram resolution and far below
+the differences between learners.
+benchmarks/bench_drill_jitter.py measures the heartbeat's lateness.
+
+    python shortcut_drill.py report ~/.learn_computer/drill.json
+"""
+import json
+import random
+import re
+import sys
+import time
+from array import array
+
+from save_pipeline import atomic_write
+
+BUCKET_MS = 10
+BUCKETS = 400
+TIMEOUT_MS = 10000
+HEARTBEAT_MS = 4
+JITTER_BOUND_MS = 8
+FOREPERIOD_MS = (600, 1400)
+EWMA_WEIGHT = 0.3
+
+CONTROL_MASK = 0x4
+
+# "• Ctrl+C: Copy" lines in the shortcut lesson, in any language
+SHORTCUT_LINE = re.compile(r'^\s*•\s*(Ctrl\+[A-Z0-9])\s*:\s*(.+?)\s*$', re.M)
+
+HIT = 'hit'
+WRONG = 'wrong'
+MISS = 'miss'
+DISCARDED = 'discarded'
+
+
+def drill_shortcuts(lesson_text):
+    """(shortcut, description) pairs that can be drilled, from a lesson's text"""
+    shortcuts = {}
+    for name, label in SHORTCUT_LINE.findall(lesson_text):
+        shortcuts.setdefault(name, label)
+    return list(shortcuts.items())
+
+
+def key_name(keysym, state):
+    """'Ctrl+C' for a key press with Control held, else None"""
+    if not int(state) & CONTROL_MASK or len(keysym) != 1:
+        return None
+    return 'Ctrl+' + keysym.upper()
+
+
+class LatencyHistogram:
+    """Counts of latencies in BUCKET_MS buckets; the last bucket holds everything slower"""
+
+    def __init__(self):
+        self.counts = array('I', bytes(4 * (BUCKETS + 1)))
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.counts[min(int(ms // BUCKET_MS), BUCKETS)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    @property
+    def mean(self):
+        return self.total_ms / self.count if self.count else None
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile, in ms"""
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return (bucket + 1) * BUCKET_MS
+        return (BUCKETS + 1) * BUCKET_MS
+
+    def to_dict(self):
+        return {
+            'total_ms': round(self.total_ms, 3),
+            'buckets': {str(b): n for b, n in enumerate(self.counts) if n}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for bucket, n in data.get('buckets', {}).items():
+            histogram.counts[min(int(bucket), BUCKETS)] = n
+            histogram.count += n
+        histogram.total_ms = data.get('total_ms', 0.0)
+        return histogram
+
+
+class ShortcutStats:
+    """Histogram, misses and wrong keys for one shortcut"""
+
+    __slots__ = ('histogram', 'misses', 'wrong', 'recent')
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.misses = 0
+        self.wrong = 0
+        self.recent = None
+
+    def update_recent(self, ms):
+        if self.recent is None:
+            self.recent = ms
+        else:
+            self.recent += EWMA_WEIGHT * (ms - self.recent)
+
+
+class DrillStats:
+    """Per-shortcut results across drills, saved between runs"""
+
+    def __init__(self):
+        self.shortcuts = {}
+        self.discarded = 0
+
+    def get(self, name):
+        stats = self.shortcuts.get(name)
+        if stats is None:
+            stats = self.shortcuts[name] = ShortcutStats()
+        return stats
+
+    def weights(self, names):
+        """Sampling weights: slower recent times and misses are drilled more"""
+        known = [self.shortcuts[n].recent for n in names
+                 if n in self.shortcuts and self.shortcuts[n].recent is not None]
+        # Never-tried shortcuts count as slightly slower than the average
+        default = 1.2 * sum(known) / len(known) if known else 1.0
+        weights = []
+        for name in names:
+            stats = self.shortcuts.get(name)
+            recent = stats.recent if stats is not None and stats.recent is not None else default
+            weights.append(recent * recent)
+        return weights
+
+    def to_dict(self):
+        return {
+            'bucket_ms': BUCKET_MS,
+            'discarded': self.discarded,
+            'shortcuts': {
+                name: {
+                    'misses': s.misses,
+                    'wrong': s.wrong,
+                    'recent_ms': s.recent,
+                    'histogram': s.histogram.to_dict()
+                }
+                for name, s in self.shortcuts.items()
+            }
+        }
+
+    def save(self, path):
+        atomic_write(path, json.dumps(self.to_dict(), indent=1))
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.discarded = data.get('discarded', 0)
+        for name, entry in data.get('shortcuts', {}).items():
+            s = stats.get(name)
+            s.misses = entry.get('misses', 0)
+            s.wrong = entry.get('wrong', 0)
+            s.recent = entry.get('recent_ms')
+            s.histogram = LatencyHistogram.from_dict(entry.get('histogram', {}))
+        return stats
+
+    @classmethod
+    def open(cls, path):
+        """Load path, or start empty if it does not exist or cannot be read"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, AttributeError, TypeError):
+            return cls()
+
+
+class LoopMonitor:
+    """Heartbeat that tells whether the Tk event loop is running on time"""
+
+    def __init__(self, root, interval_ms=HEARTBEAT_MS, bound_ms=JITTER_BOUND_MS):
+        self.root = root
+        self.interval_ns = interval_ms * 1_000_000
+        self.interval_ms = interval_ms
+        self.bound_ns = bound_ms * 1_000_000
+        self.last_beat = 0
+        self.last_lateness = 0
+        self.beats = 0
+        self.late_beats = 0
+        self.worst_ns = 0
+        self._job = None
+
+    def start(self):
+        if self._job is None:
+            self.last_beat = time.perf_counter_ns()
+            self.last_lateness = 0
+            self._job = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter_ns()
+        late = max(0, now - self.last_beat - self.interval_ns)
+        self.last_beat = now
+        self.last_lateness = late
+        self.beats += 1
+        if late > self.bound_ns:
+            self.late_beats += 1
+        self.worst_ns = max(self.worst_ns, late)
+        self._job = self.root.after(self.interval_ms, self._beat)
+
+    def on_time(self, now):
+        """Whether an event handled at perf_counter_ns() == now was dispatched promptly"""
+        return (self._job is not None and
+                now - self.last_beat <= self.bound_ns and
+                self.last_lateness <= self.bound_ns)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+
+class DrillResult:
+    __slots__ = ('kind', 'shortcut', 'pressed', 'latency_ms')
+
+    def __init__(self, kind, shortcut, pressed=None, latency_ms=None):
+        self.kind = kind
+        self.shortcut = shortcut
+        self.pressed = pressed
+        self.latency_ms = latency_ms
+
+    def __repr__(self):
+        return f"DrillResult({self.kind!r}, {self.shortcut!r}, {self.latency_ms})"
+
+
+class ShortcutDrill:
+    """Prompt, time and score shortcut presses; independent of Tk
+
+    on_time(now) says whether the event loop was responsive at a
+    perf_counter_ns() timestamp; trials that fail it are discarded.
+    """
+
+    def __init__(self, shortcuts, stats=None, rng=None, on_time=lambda now: True):
+        if not shortcuts:
+            raise ValueError("no shortcuts to drill")
+        self.shortcuts = dict(shortcuts)
+        self.names = list(self.shortcuts)
+        self.stats = stats if stats is not None else DrillStats()
+        self.rng = rng or random.Random()
+        self.on_time = on_time
+        self.target = None
+        self.shown_at = None
+        self.trusted = False
+        self.trials = 0
+        self.hits = 0
+
+    def next_prompt(self):
+        """Pick the next shortcut, never the same one twice in a row"""
+        names = [n for n in self.names if n != self.target] or self.names
+        self.target = self.rng.choices(names, self.stats.weights(names))[0]
+        self.shown_at = None
+        return self.target, self.shortcuts[self.target]
+
+    def foreperiod_ms(self):
+        """A random wait before the next prompt, so it cannot be anticipated"""
+        return self.rng.randint(*FOREPERIOD_MS)
+
+    def prompt_shown(self, now):
+        self.shown_at = now
+        self.trusted = self.on_time(now)
+
+    def key(self, name, now):
+        """Judge a key press handled at perf_counter_ns() == now"""
+        target = self.target
+        if target is None or self.shown_at is None:
+            return None
+        if name != target:
+            self.stats.get(target).wrong += 1
+            return DrillResult(WRONG, target, name)
+
+        latency = (now - self.shown_at) / 1e6
+        self.target = None
+        self.trials += 1
+        if not (self.trusted and self.on_time(now)):
+            self.stats.discarded += 1
+            return DrillResult(DISCARDED, target, name, latency)
+        stats = self.stats.get(target)
+        stats.histogram.add(latency)
+        stats.update_recent(latency)
+        self.hits += 1
+        return DrillResult(HIT, target, name, latency)
+
+    def timeout(self):
+        """The learner did not find the shortcut in time"""
+        target = self.target
+        if target is None:
+            return None
+        self.target = None
+        self.trials += 1
+        stats = self.stats.get(target)
+        stats.misses += 1
+        stats.update_recent(TIMEOUT_MS)
+        return DrillResult(MISS, target)
+
+    def slowest(self, n=3):
+        """The n shortcuts with the slowest recent times"""
+        timed = [(s.recent, name) for name, s in self.stats.shortcuts.items()
+                 if name in self.shortcuts and s.recent is not None]
+        timed.sort(reverse=True)
+        return [name for _, name in timed[:n]]
+
+
+def format_report(stats):
+    lines = [f"{'shortcut':10} {'n':>5} {'median':>7} {'p90':>7} {'mean':>7} {'miss':>5} {'wrong':>5}"]
+    rows = sorted(stats.shortcuts.items(),
+                  key=lambda item: -(item[1].histogram.percentile(50) or 0))
+    for name, s in rows:
+        h = s.histogram
+        cells = [h.percentile(50), h.percentile(90), h.mean]
+        cells = [f"{c:.0f}" if c is not None else '-' for c in cells]
+        lines.append(f"{name:10} {h.count:5} {cells[0]:>7} {cells[1]:>7} {cells[2]:>7} "
+                     f"{s.misses:5} {s.wrong:5}")
+    lines.append(f"latencies in ms; {stats.discarded} trials discarded for event loop jitter")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 2 and argv[0] == 'report':
+        print(format_report(DrillStats.open(argv[1])))
+    else:
+        print("usage: shortcut_drill.py report DRILL_JSON")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
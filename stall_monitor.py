@@ -0,0 +1,326 @@
+"""Event loop responsiveness monitor.
+
+A heartbeat re-arms itself with root.after every INTERVAL_MS and records how
+late each beat runs in a log-linear (HDR-style) histogram. Any lag means
+the event loop could not run: a handler was busy, or blocked in a dialog,
+a file write or update().
+
+A watchdog thread notices when a beat is more than STALL_MS overdue and
+samples the main thread's Python stack with sys._current_frames() while the
+stall lasts. When the loop comes back, the stall is charged to the handler
+seen most often in the samples. That is the first function of ours that
+Tk called back into, shown with the innermost frame it was blocked in,
+e.g. "check_practice_step -> filedialog.py:show". A stall with no Python frames
+of ours on the stack (Tcl itself was busy, or the machine slept) is
+charged to "<event loop>".
+
+The cost is one short callback per beat. The watchdog sleeps until a beat
+could first be overdue, so it wakes only a few times a second while the
+app is responsive. Stacks are only walked during a stall. It is meant to stay
+on. benchmarks/bench_stall_monitor.py measures the overhead.
+
+Given a report path, the watchdog also rewrites the report (atomically, off
+the Tk thread) every SAVE_EVERY_S seconds, and every STALL_SAVE_S seconds
+during and just after a stall, so an app that is killed or stays frozen
+still leaves one behind, with the stall in progress. Each session gets its
+own file in the state directory's responsiveness/ folder, and only the
+newest KEEP_REPORTS are kept.
+
+    python stall_monitor.py report ~/.learn_computer/responsiveness/20261018-093000-4242.json
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tkinter
+from array import array
+from collections import Counter
+
+from save_pipeline import atomic_write
+
+INTERVAL_MS = 50
+STALL_MS = 100
+SAMPLE_MS = 10
+WORST_STALLS = 20
+SAVE_EVERY_S = 30
+STALL_SAVE_S = 2
+KEEP_REPORTS = 20
+
+# HDR-style buckets: exact below 2**SUB_BITS microseconds, then 2**(SUB_BITS-1)
+# buckets per power of two, so every value is kept to within about 3%
+SUB_BITS = 6
+MAX_US = 1 << 27
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENT_LOOP = '<event loop>'
+TKINTER_FILE = tkinter.__file__
+
+
+class LagHistogram:
+    """Log-linear histogram of microsecond values with constant-time record"""
+
+    def __init__(self, sub_bits=SUB_BITS, max_value=MAX_US):
+        self.sub_bits = sub_bits
+        self.max_value = max_value
+        self._half = 1 << (sub_bits - 1)
+        self.counts = array('Q', bytes(8 * (self.index(max_value) + 1)))
+        self.count = 0
+        self.max = 0
+        self.total = 0
+
+    def index(self, value):
+        if value < (1 << self.sub_bits):
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return (1 << self.sub_bits) + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def bucket_range(self, index):
+        """Lowest and highest value counted in a bucket"""
+        if index < (1 << self.sub_bits):
+            return index, index
+        shift, mantissa = divmod(index - (1 << self.sub_bits), self._half)
+        shift += 1
+        mantissa += self._half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self.index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile"""
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(self.bucket_range(index)[1], self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_us': self.total / self.count if self.count else 0,
+            'p50_us': self.percentile(50),
+            'p90_us': self.percentile(90),
+            'p99_us': self.percentile(99),
+            'p999_us': self.percentile(99.9),
+            'max_us': self.max,
+            'buckets': {str(i): n for i, n in enumerate(self.counts) if n}
+        }
+
+
+def _is_ours(code):
+    return code.co_filename.startswith(APP_DIR) and code.co_name not in ('<lambda>', '<module>')
+
+
+def _is_dispatch(code):
+    # tkinter's CallWrapper.__call__, through which Tk runs every Python callback
+    return code.co_name == '__call__' and code.co_filename == TKINTER_FILE
+
+
+def blame(frame):
+    """'handler -> where it blocked' for a main thread stack, or None
+
+    The handler is the first function of ours inside the outermost Tk
+    callback, or the outermost function of ours outside any callback.
+    """
+    stack = []
+    while frame is not None:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+    dispatched = [i for i, code in enumerate(stack) if _is_dispatch(code)]
+    candidates = stack[:dispatched[-1]] if dispatched else stack
+    handler = None
+    for code in reversed(candidates):
+        if _is_ours(code):
+            handler = code.co_name
+            break
+    if handler is None:
+        return None
+    code = stack[0]
+    where = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+    return handler if where.endswith(':' + handler) else f"{handler} -> {where}"
+
+
+class StallMonitor:
+    """Heartbeat lag histogram plus stall attribution"""
+
+    def __init__(self, root, interval_ms=INTERVAL_MS, stall_ms=STALL_MS, sample_ms=SAMPLE_MS,
+                 report_path=None):
+        self.root = root
+        self.report_path = report_path
+        self.interval_ms = interval_ms
+        self.interval_ns = interval_ms * 1_000_000
+        self.stall_ns = stall_ms * 1_000_000
+        self.sample_seconds = sample_ms / 1000
+        self.lag = LagHistogram()
+        self.stalls = {}
+        self.worst = []
+        self.started = None
+        self._last_beat = 0
+        self._job = None
+        self._samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._main_id = threading.main_thread().ident
+        self._next_save = 0.0
+
+    def start(self):
+        if self._job is not None:
+            return
+        self.started = time.time()
+        self._last_beat = time.perf_counter_ns()
+        self._job = self.root.after(self.interval_ms, self._beat)
+        self._stop.clear()
+        self._next_save = time.monotonic() + SAVE_EVERY_S
+        self._thread = threading.Thread(target=self._watch, name='stall-monitor', daemon=True)
+        self._thread.start()
+
+    def _beat(self):
+        now = time.perf_counter_ns()
+        lag = now - self._last_beat - self.interval_ns
+        self._last_beat = now
+        self.lag.record(lag // 1000)
+        if self._samples:
+            # The watchdog may be writing a report from these at the same time
+            with self._lock:
+                samples, self._samples = self._samples, []
+                if lag >= self.stall_ns:
+                    self._record_stall(lag / 1e6, samples)
+        self._job = self.root.after(self.interval_ms, self._beat)
+
+    def _watch(self):
+        # Runs in its own thread. It sleeps until a beat could first count as
+        # stalled, and only samples every SAMPLE_MS while one is overdue.
+        wait = self.sample_seconds
+        while not self._stop.wait(wait):
+            overdue = time.perf_counter_ns() - self._last_beat - self.interval_ns
+            if overdue < self.stall_ns:
+                wait = max((self.stall_ns - overdue) / 1e9, self.sample_seconds)
+            else:
+                wait = self.sample_seconds
+                frame = sys._current_frames().get(self._main_id)
+                culprit = blame(frame) if frame is not None else None
+                with self._lock:
+                    self._samples.append(culprit or EVENT_LOOP)
+                self._next_save = min(self._next_save, time.monotonic() + STALL_SAVE_S)
+            if self.report_path is not None and time.monotonic() >= self._next_save:
+                self._save()
+
+    def _save(self):
+        self._next_save = time.monotonic() + SAVE_EVERY_S
+        try:
+            atomic_write(self.report_path, json.dumps(self.report(), indent=1) + '\n', fsync='never')
+        except OSError:
+            pass
+
+    def _record_stall(self, ms, samples):
+        culprit = Counter(samples).most_common(1)[0][0]
+        entry = self.stalls.get(culprit)
+        if entry is None:
+            entry = self.stalls[culprit] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+        self.worst.append((ms, culprit, time.time()))
+        self.worst.sort(reverse=True)
+        del self.worst[WORST_STALLS:]
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Reporting
+
+    def report(self):
+        with self._lock:
+            stalls = {culprit: dict(entry) for culprit, entry in self.stalls.items()}
+            worst = list(self.worst)
+            samples = list(self._samples)
+        report = {
+            'started': self.started,
+            'ended': time.time(),
+            'interval_ms': self.interval_ms,
+            'stall_ms': self.stall_ns / 1e6,
+            'lag': self.lag.summary(),
+            'stalls': dict(sorted(stalls.items(), key=lambda item: -item[1]['total_ms'])),
+            'worst': [{'ms': round(ms, 1), 'handler': culprit, 'at': at}
+                      for ms, culprit, at in worst]
+        }
+        if samples:
+            # Written by the watchdog while the event loop is still stalled
+            overdue = time.perf_counter_ns() - self._last_beat - self.interval_ns
+            report['current'] = {'ms': round(overdue / 1e6, 1),
+                                 'handler': Counter(samples).most_common(1)[0][0]}
+        return report
+
+    def write(self, path):
+        report = json.dumps(self.report(), indent=1)
+        if path == '-':
+            print(report)
+        else:
+            atomic_write(path, report + '\n')
+
+
+def session_report_path(directory, keep=KEEP_REPORTS):
+    """A new report file for this session in directory, removing all but the newest keep - 1"""
+    os.makedirs(directory, exist_ok=True)
+    reports = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    for name in reports[:max(len(reports) - keep + 1, 0)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json")
+
+
+def format_report(report):
+    lag = report['lag']
+    minutes = (report['ended'] - report['started']) / 60
+    lines = [
+        f"Event loop lag over {minutes:.1f} min ({lag['count']} beats every "
+        f"{report['interval_ms']} ms):",
+        f"  p50 {lag['p50_us'] / 1000:.1f} ms, p90 {lag['p90_us'] / 1000:.1f} ms, "
+        f"p99 {lag['p99_us'] / 1000:.1f} ms, max {lag['max_us'] / 1000:.0f} ms"
+    ]
+    if report['stalls']:
+        lines.append(f"Stalls over {report['stall_ms']:.0f} ms, by handler:")
+        for culprit, entry in report['stalls'].items():
+            lines.append(f"  {entry['count']:5} x  total {entry['total_ms']:8.0f} ms  "
+                         f"max {entry['max_ms']:6.0f} ms  {culprit}")
+    else:
+        lines.append("No stalls.")
+    if 'current' in report:
+        current = report['current']
+        lines.append(f"Stalled for {current['ms']:.0f} ms when the report was written, "
+                     f"in {current['handler']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 2 and argv[0] == 'report':
+        with open(argv[1], encoding='utf-8') as f:
+            print(format_report(json.load(f)))
+    else:
+        print("usage: stall_monitor.py report REPORT_JSON")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Startup instrumentation.
+
+Run the app with --startup-report to see where launch time goes:
+
+    imports       loading tkinter and the app modules
+    app_init      creating the Tk root, opening the lesson pack and themes
+    widgets       building and theming the main window
+    welcome       rendering the welcome lesson
+    first_frame   until Tk has actually drawn the welcome text
+
+benchmarks/bench_startup.py launches the app repeatedly in this mode and
+summarises the numbers.
+"""
+import json
+import sys
+import time
+
+
+class StartupProfile:
+    """Named timestamps from process start to the first drawn frame"""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name, at=None):
+        self.marks.append((name, at if at is not None else time.perf_counter()))
+
+    def phases(self):
+        """Milliseconds spent in each phase, in order"""
+        phases = {}
+        previous = self.started
+        for name, at in self.marks:
+            phases[name] = (at - previous) * 1000
+            previous = at
+        return phases
+
+    def total_ms(self):
+        if not self.marks:
+            return 0.0
+        return (self.marks[-1][1] - self.started) * 1000
+
+    def report(self):
+        return {'phases': self.phases(), 'total_ms': self.total_ms()}
+
+    def format(self):
+        lines = ["Startup profile:"]
+        for name, ms in self.phases().items():
+            lines.append(f"  {name:<12} {ms:8.1f} ms")
+        lines.append(f"  {'total':<12} {self.total_ms():8.1f} ms")
+        return '\n'.join(lines)
+
+    def watch_first_frame(self, widget, callback):
+        """Mark 'first_frame' once widget has been exposed and redrawn
+
+        Tk redraws from idle handlers queued when the Expose event arrives,
+        so an idle callback queued from our Expose binding runs after them.
+        """
+        def on_expose(event):
+            widget.unbind('<Expose>', binding)
+            widget.after_idle(done)
+
+        def done():
+            self.mark('first_frame')
+            callback(self)
+
+        binding = widget.bind('<Expose>', on_expose, add='+')
+
+    def write(self, path):
+        report = json.dumps(self.report(), indent=2)
+        if path == '-':
+            print(report)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        print(self.format(), file=sys.stderr)
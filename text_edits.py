@@ -0,0 +1,151 @@
+"""Observe edits made to a Tk Text widget.
+
+Tk has no event that says what changed in a Text widget, so EditRecorder
+renames the widget's Tcl command and installs a Python command in its place
+(the same trick as idlelib's WidgetRedirector). Every insert and delete,
+whether it comes from typing, pasting, Tk's own undo or application code,
+passes through it. Indices are resolved to "line.col" and clamped the way Tk
+clamps them before listeners see them, so the recorded edits replay exactly.
+
+Text listeners get the text a delete removes instead of its end index,
+which is what an undo history needs. The text is only fetched while one is
+registered.
+"""
+
+
+def _split(index):
+    line, col = index.split('.')
+    return int(line), int(col)
+
+
+class EditRecorder:
+    """Calls listeners with ('insert', pos, text) or ('delete', start, end)
+
+    Text listeners get ('delete', start, removed text) for deletes instead.
+    """
+
+    def __init__(self, text_widget):
+        self.widget = text_widget
+        self.listeners = []
+        self.text_listeners = []
+        self._tk = text_widget.tk
+        self._name = str(text_widget)
+        self._orig = self._name + '_orig'
+        self._tk.call('rename', self._name, self._orig)
+        self._tk.createcommand(self._name, self._dispatch)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def add_text_listener(self, listener):
+        self.text_listeners.append(listener)
+
+    def remove_text_listener(self, listener):
+        self.text_listeners.remove(listener)
+
+    def close(self):
+        """Put the widget's original command back"""
+        self._tk.deletecommand(self._name)
+        self._tk.call('rename', self._orig, self._name)
+
+    def _call(self, *args):
+        return self._tk.call(self._orig, *args)
+
+    def _compare(self, a, op, b):
+        return self._tk.getboolean(self._call('compare', a, op, b))
+
+    def _end(self):
+        return self._call('index', 'end-1c')
+
+    def _resolve_insert(self, index):
+        pos = self._call('index', index)
+        if self._compare(pos, '>', 'end-1c'):
+            pos = self._end()
+        return pos
+
+    def _resolve_delete(self, index1, index2=None):
+        start = self._call('index', index1)
+        end = self._call('index', index2 if index2 is not None else f'{start}+1c')
+        end_c = self._end()
+        if self._compare(end, '>', end_c):
+            end = end_c
+        if not self._compare(start, '<', end):
+            return None
+        return start, end
+
+    def _resolve_ranges(self, indices):
+        """Sorted, merged (start, end) spans for "delete i1 ?i2 i3 i4 ...?"
+
+        Like Tk, every index is resolved before anything is deleted, and an
+        odd index at the end deletes one character.
+        """
+        spans = []
+        for i in range(0, len(indices), 2):
+            span = self._resolve_delete(*indices[i:i + 2])
+            if span is not None:
+                spans.append(span)
+        if len(spans) < 2:
+            return spans
+        spans.sort(key=lambda span: _split(span[0]))
+        merged = [spans[0]]
+        for start, end in spans[1:]:
+            last_start, last_end = merged[-1]
+            if _split(start) <= _split(last_end):
+                if _split(end) > _split(last_end):
+                    merged[-1] = (last_start, end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _dispatch(self, *args):
+        if not (self.listeners or self.text_listeners) or not args:
+            return self._call(*args)
+
+        command = args[0]
+        if command == 'insert' and len(args) >= 3:
+            pos = self._resolve_insert(args[1])
+            result = self._call('insert', pos, *args[2:])
+            text = ''.join(args[2::2])
+            if text:
+                self._inserted(pos, text)
+            return result
+
+        if command == 'delete' and len(args) >= 2:
+            spans = self._resolve_ranges(args[1:])
+            # Last range first, so the indices of the earlier ones stay valid
+            for start, end in reversed(spans):
+                self._delete(start, end)
+            return ''
+
+        if command == 'replace' and len(args) >= 4:
+            span = self._resolve_delete(args[1], args[2])
+            if span is not None:
+                self._delete(*span)
+                start = span[0]
+            else:
+                start = self._resolve_insert(args[1])
+            result = self._call('insert', start, *args[3:])
+            text = ''.join(args[3::2])
+            if text:
+                self._inserted(start, text)
+            return result
+
+        return self._call(*args)
+
+    def _delete(self, start, end):
+        removed = self._call('get', start, end) if self.text_listeners else None
+        result = self._call('delete', start, end)
+        for listener in self.listeners:
+            listener('delete', start, end)
+        for listener in self.text_listeners:
+            listener('delete', start, removed)
+        return result
+
+    def _inserted(self, pos, text):
+        for listener in self.listeners:
+            listener('insert', pos, text)
+        for listener in self.text_listeners:
+            listener('insert', pos, text)
@@ -0,0 +1,187 @@
+"""Precompiled theme engine.
+
+Widgets are registered under a role ("nav_button", "text", "header_label", ...).
+Each role maps widget options to theme keys, so every theme compiles once into
+a table of {role: {option: value}}. For each pair of themes the engine also
+keeps the options that actually differ, and switching themes runs a single
+batched Tcl script that only touches those options.
+
+Hover colours are handled by one class-level binding on a shared bindtag
+instead of a pair of closures per button.
+"""
+
+# Role -> {widget option: theme key}. Values starting with '#' are literal colours.
+ROLE_STYLES = {
+    'window': {'bg': 'bg'},
+    'frame': {'bg': 'bg'},
+    'header': {'bg': 'header_bg'},
+    'header_label': {'bg': 'header_bg', 'fg': 'header_fg'},
+    'header_button': {
+        'bg': 'header_bg',
+        'fg': 'header_fg',
+        'activebackground': 'header_bg',
+        'activeforeground': 'header_fg'
+    },
+    'text_frame': {'bg': 'text_bg'},
+    'text': {'bg': 'text_bg', 'fg': 'text_fg', 'insertbackground': 'text_fg'},
+    'label': {'bg': 'bg', 'fg': 'text_fg'},
+    'nav_button': {
+        'bg': 'button_bg',
+        'fg': 'button_fg',
+        'activebackground': 'button_active',
+        'activeforeground': 'button_fg'
+    },
+    'nav_button_current': {
+        'bg': 'button_active',
+        'fg': 'button_fg',
+        'activebackground': 'button_active',
+        'activeforeground': 'button_fg'
+    },
+    'group_header': {
+        'bg': 'bg',
+        'fg': 'text_fg',
+        'activebackground': 'highlight',
+        'activeforeground': 'text_fg'
+    },
+    'exit_button': {
+        'bg': '#8c4a4a',
+        'fg': 'button_fg',
+        'activebackground': '#7c3a3a',
+        'activeforeground': 'button_fg'
+    },
+    'choice': {
+        'bg': 'bg',
+        'fg': 'text_fg',
+        'activebackground': 'bg',
+        'activeforeground': 'text_fg',
+        'selectcolor': 'text_bg'
+    },
+    'action_button': {
+        'bg': 'button_bg',
+        'fg': 'button_fg',
+        'activebackground': 'button_active'
+    }
+}
+
+THEMED_TAG = 'Themed'
+HOVER_TAG = 'ThemeHover'
+
+
+def compile_theme(theme, role_styles=ROLE_STYLES):
+    """Resolve every role's options against one theme's colour table"""
+    table = {}
+    for role, options in role_styles.items():
+        table[role] = {
+            option: key if key.startswith('#') else theme[key]
+            for option, key in options.items()
+        }
+    return table
+
+
+def diff_tables(old, new):
+    """Return {role: {option: value}} for options that differ between two tables"""
+    diff = {}
+    for role, options in new.items():
+        changed = {
+            option: value
+            for option, value in options.items()
+            if old.get(role, {}).get(option) != value
+        }
+        if changed:
+            diff[role] = changed
+    return diff
+
+
+def _tcl_options(options):
+    return ' '.join(f'-{option} {{{value}}}' for option, value in options.items())
+
+
+class ThemeEngine:
+    """Applies compiled theme tables to registered widgets"""
+
+    def __init__(self, root, themes, role_styles=ROLE_STYLES):
+        self.root = root
+        self.tables = {name: compile_theme(theme, role_styles) for name, theme in themes.items()}
+        self.diffs = {
+            (old, new): diff_tables(self.tables[old], self.tables[new])
+            for old in self.tables
+            for new in self.tables
+            if old != new
+        }
+        self.current = None
+        self._roles = {role: {} for role in role_styles}
+        self._widget_roles = {}
+        self._scripts = {}
+
+        root.bind_class(THEMED_TAG, '<Destroy>', self._on_destroy, add='+')
+        root.bind_class(HOVER_TAG, '<Enter>', self._on_enter)
+        root.bind_class(HOVER_TAG, '<Leave>', self._on_leave)
+
+    def register(self, widget, role, hover=False):
+        """Theme a widget by role, optionally giving it the shared hover effect"""
+        path = str(widget)
+        old_role = self._widget_roles.get(path)
+        if old_role is not None:
+            del self._roles[old_role][path]
+        else:
+            tags = (THEMED_TAG, HOVER_TAG) if hover else (THEMED_TAG,)
+            widget.bindtags(tags + widget.bindtags())
+
+        self._roles[role][path] = widget
+        self._widget_roles[path] = role
+        self._scripts.clear()
+
+        if self.current is not None:
+            widget.configure(**self.tables[self.current][role])
+
+    def unregister(self, widget):
+        path = str(widget)
+        role = self._widget_roles.pop(path, None)
+        if role is not None:
+            del self._roles[role][path]
+            self._scripts.clear()
+
+    def style(self, role):
+        """Current option table for a role"""
+        return self.tables[self.current][role]
+
+    def apply(self, name):
+        """Switch to the named theme, touching only options that change"""
+        if name == self.current:
+            return
+        key = (self.current, name)
+        script = self._scripts.get(key)
+        if script is None:
+            script = self._scripts[key] = self._compile_script(self.current, name)
+        if script:
+            self.root.tk.eval(script)
+        self.current = name
+
+    def _compile_script(self, old, new):
+        changes = self.tables[new] if old is None else self.diffs[(old, new)]
+        lines = []
+        for role, options in changes.items():
+            widgets = self._roles.get(role)
+            if not widgets:
+                continue
+            args = _tcl_options(options)
+            lines.extend(f'{path} configure {args}' for path in widgets)
+        return '\n'.join(lines)
+
+    def _on_destroy(self, event):
+        self.unregister(event.widget)
+
+    def _hover_role(self, event):
+        if self.current is None:
+            return None
+        return self._widget_roles.get(str(event.widget))
+
+    def _on_enter(self, event):
+        role = self._hover_role(event)
+        if role is not None:
+            event.widget.configure(bg=self.tables[self.current][role]['activebackground'])
+
+    def _on_leave(self, event):
+        role = self._hover_role(event)
+        if role is not None:
+            event.widget.configure(bg=self.tables[self.current][role]['bg'])
@@ -0,0 +1,220 @@
+"""Undo and redo for the practice editor, within a fixed memory budget.
+
+Tk's own undo stack keeps every edit since the last reset, so over a long
+lab session it only grows. UndoHistory replaces it. It is fed by
+EditRecorder (text_edits.py) and keeps each edit as a compact diff:
+
+    ('insert', index, text) or ('delete', index, text)
+
+A delete records the text it removed, so it can be put back. The end index
+is worked out from the text when an edit is applied.
+
+Edits are grouped the way an editor's undo steps are:
+
+- Everything one key press or mouse click does is one group. For example,
+  a paste that replaces a selection is a delete plus an insert.
+- A run of typed characters, or of Backspace or Delete presses, joins the
+  group before it until the run crosses a word boundary. So Ctrl+Z undoes
+  a word at a time.
+
+Texts of COMPRESS_MIN characters or more (pasted or deleted blocks) are
+kept zlib-compressed. The history counts the bytes it holds. Past the
+budget it drops the oldest groups first. A single group larger than the
+whole budget cannot be undone.
+"""
+import sys
+import zlib
+from collections import deque
+
+UNDO_BUDGET_BYTES = 1 << 20
+COMPRESS_MIN = 1024
+# Tuple, index string and list slot of one edit, beyond its text
+EDIT_OVERHEAD = 150
+GROUP_OVERHEAD = 140
+
+BINDTAG = 'UndoHistory'
+
+
+def advance_index(index, text, wide_chars=False):
+    """The "line.col" index just after text inserted at index"""
+    line, col = (int(part) for part in index.split('.'))
+    breaks = text.count('\n')
+    if breaks:
+        line += breaks
+        col = 0
+        text = text[text.rindex('\n') + 1:]
+    if wide_chars:
+        col += sum(2 if ord(ch) > 0xFFFF else 1 for ch in text)
+    else:
+        col += len(text)
+    return f'{line}.{col}'
+
+
+def _pack(text):
+    if len(text) >= COMPRESS_MIN:
+        packed = zlib.compress(text.encode('utf-8'))
+        if len(packed) < len(text):
+            return packed
+    return text
+
+
+def _unpack(payload):
+    return payload if isinstance(payload, str) else zlib.decompress(payload).decode('utf-8')
+
+
+def _cost(edits):
+    return GROUP_OVERHEAD + sum(EDIT_OVERHEAD + sys.getsizeof(edit[2]) for edit in edits)
+
+
+def _word_boundary(run, char):
+    """True when char starts a new word after the typed run"""
+    return run[-1:].isspace() and not char.isspace()
+
+
+class UndoHistory:
+    """Undo and redo stacks of edit groups, trimmed to budget bytes
+
+    apply(op, start, end, text) makes an edit in the editor; the history
+    calls it to undo and redo, and ignores the edits it causes.
+    """
+
+    def __init__(self, apply, budget=UNDO_BUDGET_BYTES, wide_chars=False):
+        self.apply = apply
+        self.budget = budget
+        self.wide_chars = wide_chars
+        # Each group is [cost, edits]
+        self.undo_stack = deque()
+        self.redo_stack = deque()
+        self.size = 0
+        self.evicted = 0
+        self._open = False
+        self._run = None
+        self._applying = False
+
+    def attach(self, widget):
+        """Start a new group on every key press and mouse click in widget"""
+        command = widget.register(self.separator)
+        widget.bind_class(BINDTAG, '<KeyPress>', command)
+        widget.bind_class(BINDTAG, '<ButtonPress>', command)
+        widget.bindtags((BINDTAG,) + widget.bindtags())
+
+    def separator(self):
+        """End the current group; the next edit starts a new one"""
+        self._open = False
+
+    def reset(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.size = 0
+        self._open = False
+        self._run = None
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    # Recording
+
+    def record(self, op, index, text):
+        """EditRecorder text listener"""
+        if self._applying or not text:
+            return
+        if self.redo_stack:
+            self.size -= sum(group[0] for group in self.redo_stack)
+            self.redo_stack.clear()
+        if not self._open and self._extend_run(op, index, text):
+            return
+        if self._open and self.undo_stack:
+            group = self.undo_stack[-1]
+        else:
+            group = [0, []]
+            self.undo_stack.append(group)
+            self._open = True
+        group[1].append((op, index, _pack(text)))
+        self._recount(group)
+        # Only a group holding a single short edit can grow into a run
+        self._run = group if len(group[1]) == 1 and len(text) == 1 else None
+        self._trim()
+
+    def _extend_run(self, op, index, text):
+        """Merge a typed character or Backspace/Delete into the run before it"""
+        group = self._run
+        if group is None or len(text) != 1 or text == '\n':
+            return False
+        last_op, last_index, last_text = group[1][0]
+        if op != last_op or '\n' in last_text:
+            return False
+        if op == 'insert':
+            if advance_index(last_index, last_text, self.wide_chars) != index \
+                    or _word_boundary(last_text, text):
+                return False
+            edit = (op, last_index, last_text + text)
+        elif index == last_index:
+            # Delete key: the next character shifts into place
+            edit = (op, last_index, last_text + text)
+        elif advance_index(index, text, self.wide_chars) == last_index:
+            # Backspace: deleting leftwards
+            if _word_boundary(text, last_text[0]):
+                return False
+            edit = (op, index, text + last_text)
+        else:
+            return False
+        group[1][0] = edit
+        self._recount(group)
+        self._open = True
+        self._trim()
+        return True
+
+    def _recount(self, group):
+        cost = _cost(group[1])
+        self.size += cost - group[0]
+        group[0] = cost
+
+    def _trim(self):
+        """Drop the oldest groups until the history fits its budget"""
+        while self.size > self.budget and (self.undo_stack or self.redo_stack):
+            group = (self.undo_stack or self.redo_stack).popleft()
+            self.size -= group[0]
+            self.evicted += 1
+            if group is self._run:
+                self._run = None
+            if not self.undo_stack:
+                self._open = False
+
+    # Undo and redo
+
+    def undo(self):
+        """Undo the last group; returns False when there is nothing to undo"""
+        if not self.undo_stack:
+            return False
+        group = self.undo_stack.pop()
+        self._apply(reversed(group[1]), undo=True)
+        self.redo_stack.append(group)
+        return True
+
+    def redo(self):
+        """Redo the last undone group; returns False when there is nothing to redo"""
+        if not self.redo_stack:
+            return False
+        group = self.redo_stack.pop()
+        self._apply(group[1], undo=False)
+        self.undo_stack.append(group)
+        return True
+
+    def _apply(self, edits, undo):
+        self._open = False
+        self._run = None
+        self._applying = True
+        try:
+            for op, index, payload in edits:
+                text = _unpack(payload)
+                if (op == 'insert') == undo:
+                    self.apply('delete', index, advance_index(index, text, self.wide_chars), text)
+                else:
+                    self.apply('insert', index, advance_index(index, text, self.wide_chars), text)
+        finally:
+            self._applying = False